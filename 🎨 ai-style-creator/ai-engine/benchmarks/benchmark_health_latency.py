@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Health Latency Benchmark
+============================================================
+
+Misst die Latenz von /health, während gleichzeitig Bildverarbeitungs-Jobs
+laufen. Solange Diffusion im Event-Loop blockiert, steigt die p99-Latenz
+auf die Dauer eines Denoising-Laufs; mit dem Inferenz-Pool bleibt sie
+im Millisekundenbereich.
+
+Benötigt eine laufende Engine und ein gültiges API-Token.
+
+Usage:
+    python benchmarks/benchmark_health_latency.py --url http://localhost:8001 \\
+        --token $AI_ENGINE_TOKEN --image sample.jpg --jobs 8 --duration 60
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+
+async def submit_jobs(client: httpx.AsyncClient, args: argparse.Namespace) -> Dict[int, int]:
+    """Jobs gleichzeitig einreichen und Statuscodes zählen"""
+    image_bytes = Path(args.image).read_bytes()
+
+    async def submit() -> int:
+        response = await client.post(
+            "/api/v1/process/image",
+            files={"file": (Path(args.image).name, image_bytes, "image/jpeg")},
+            headers={"Authorization": f"Bearer {args.token}"}
+        )
+        return response.status_code
+
+    codes = await asyncio.gather(*[submit() for _ in range(args.jobs)])
+    counts: Dict[int, int] = {}
+    for code in codes:
+        counts[code] = counts.get(code, 0) + 1
+    return counts
+
+
+async def probe_health(client: httpx.AsyncClient, duration: float, interval: float) -> List[float]:
+    """/health wiederholt abfragen und Latenzen in ms sammeln"""
+    latencies = []
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            await client.get("/health")
+            latencies.append((time.perf_counter() - start) * 1000)
+        except httpx.TimeoutException:
+            latencies.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Perzentil per nächstem Rang"""
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+async def run(args: argparse.Namespace):
+    timeout = httpx.Timeout(args.timeout)
+    async with httpx.AsyncClient(base_url=args.url, timeout=timeout) as client:
+        # Leerlauf-Referenz
+        idle = await probe_health(client, duration=5, interval=args.interval)
+
+        submit_task = asyncio.create_task(submit_jobs(client, args))
+        loaded = await probe_health(client, duration=args.duration, interval=args.interval)
+        status_codes = await submit_task
+
+    print(f"{'Phase':<10}{'Samples':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, values in (("idle", idle), ("loaded", loaded)):
+        print(
+            f"{name:<10}{len(values):>9}"
+            f"{statistics.median(values):>10.1f}"
+            f"{percentile(values, 95):>10.1f}"
+            f"{percentile(values, 99):>10.1f}"
+            f"{max(values):>10.1f}"
+        )
+    print(f"\nSubmission status codes: {status_codes}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="/health latency under inference load")
+    parser.add_argument("--url", default="http://localhost:8001")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--image", required=True)
+    parser.add_argument("--jobs", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=60.0)
+    parser.add_argument("--interval", type=float, default=0.05)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Image Decode Benchmark
+==========================================================
+
+Vergleicht den bisherigen Ladepfad (Image.open(...).convert("RGB") +
+LANCZOS auf MAX_IMAGE_SIZE) mit dem skalierten Decode aus
+utils.image_loading (JPEG-DCT-Skalierung, Box-Reduce für PNG/WebP).
+
+Gemessen werden Decode+Resize-Zeit und Spitzenspeicher, jeweils pro
+Megapixel des Quellbildes. Der Spitzenspeicher wird als Anstieg von
+VmHWM (Spitzen-RSS) in einem frischen Prozess je Messung ermittelt, da Pillow
+seine Pixelpuffer außerhalb von tracemalloc alloziert.
+
+Usage:
+    python benchmarks/benchmark_image_decode.py --images ./uploads --limit 20
+    python benchmarks/benchmark_image_decode.py      # synthetische 24-MP-Fotos
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import argparse
+import multiprocessing
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Tuple
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+import numpy as np
+from PIL import Image
+
+from utils.image_loading import load_image
+
+
+def baseline_load(path: str, max_size: int) -> Image.Image:
+    """Bisheriger Pfad: Voll-Decode, dann LANCZOS"""
+    image = Image.open(path).convert("RGB")
+    width, height = image.size
+    scale = max_size / max(width, height)
+    if scale >= 1:
+        return image
+    return image.resize((int(width * scale), int(height * scale)), Image.LANCZOS)
+
+
+def scaled_load(path: str, max_size: int) -> Image.Image:
+    """Neuer Pfad über utils.image_loading"""
+    return load_image(path, max_size)
+
+
+METHODS = {
+    "full decode + LANCZOS": baseline_load,
+    "scaled decode": scaled_load
+}
+
+
+def _peak_rss_kb() -> int:
+    """Spitzen-RSS des Prozesses in KB"""
+    # VmHWM gilt pro Adressraum; ru_maxrss übernimmt unter Linux den
+    # Höchstwert des Elternprozesses und wäre nach dem Erzeugen der
+    # Testbilder unbrauchbar
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def _peak_memory_child(method: str, path: str, max_size: int) -> int:
+    """Im frischen Prozess: Anstieg des Spitzen-RSS in KB"""
+    before = _peak_rss_kb()
+    METHODS[method](path, max_size)
+    return _peak_rss_kb() - before
+
+
+def _megapixels(path: str) -> float:
+    """Quellauflösung in Megapixeln (nur Header)"""
+    with Image.open(path) as image:
+        return image.width * image.height / 1e6
+
+
+def create_samples(directory: Path, count: int, width: int, height: int) -> List[str]:
+    """Synthetische Produktfotos als JPEG (mit EXIF-Drehung), PNG und WebP"""
+    rng = np.random.default_rng(0)
+    paths = []
+    for i in range(count):
+        # Glatte Verläufe mit Rauschen, damit die Kompression realistisch bleibt
+        y, x = np.mgrid[0:height, 0:width]
+        base = np.stack([x * 255 / width, y * 255 / height, np.full_like(x, 120 + 10 * i)], axis=-1)
+        pixels = np.clip(base + rng.normal(0, 6, base.shape), 0, 255).astype(np.uint8)
+        image = Image.fromarray(pixels)
+
+        exif = image.getexif()
+        exif[0x0112] = 6
+        jpeg_path = directory / f"sample_{i}.jpg"
+        image.save(jpeg_path, quality=90, exif=exif.tobytes())
+        paths.append(str(jpeg_path))
+
+        if i == 0:
+            for fmt in ("png", "webp"):
+                path = directory / f"sample_{i}.{fmt}"
+                image.save(path)
+                paths.append(str(path))
+    return paths
+
+
+def measure(paths: List[str], max_size: int, repeats: int) -> List[Tuple[str, str, float, float]]:
+    """(Format, Methode, ms/MP, MB/MP) je Format und Methode"""
+    context = multiprocessing.get_context("spawn")
+    rows = []
+    by_format = {}
+    for path in paths:
+        by_format.setdefault(Path(path).suffix.lower().lstrip("."), []).append(path)
+
+    for fmt, fmt_paths in sorted(by_format.items()):
+        megapixels = [_megapixels(p) for p in fmt_paths]
+        for method, fn in METHODS.items():
+            start = time.perf_counter()
+            for _ in range(repeats):
+                for path in fmt_paths:
+                    fn(path, max_size)
+            ms_per_mp = (time.perf_counter() - start) * 1000 / (repeats * sum(megapixels))
+
+            peaks = []
+            for path, mp in zip(fmt_paths, megapixels):
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    peak_kb = pool.submit(_peak_memory_child, method, path, max_size).result()
+                peaks.append(peak_kb / 1024 / mp)
+
+            rows.append((fmt, method, ms_per_mp, float(np.mean(peaks))))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Image decode benchmark")
+    parser.add_argument("--images", help="Verzeichnis mit Upload-Bildern")
+    parser.add_argument("--limit", type=int, default=5)
+    parser.add_argument("--max-size", type=int, default=1024, help="MAX_IMAGE_SIZE")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.images:
+            paths = sorted(
+                str(p) for p in Path(args.images).rglob("*")
+                if p.suffix.lower() in (".jpg", ".jpeg", ".png", ".webp")
+            )[:args.limit]
+        else:
+            paths = create_samples(Path(tmp), args.limit, 6000, 4000)
+
+        print(f"{len(paths)} images, target longest side {args.max_size}px\n")
+        print(f"{'Format':<8}{'Method':<26}{'ms/MP':>10}{'peak MB/MP':>14}")
+        rows = measure(paths, args.max_size, args.repeats)
+        for fmt, method, ms_per_mp, mb_per_mp in rows:
+            print(f"{fmt:<8}{method:<26}{ms_per_mp:>10.2f}{mb_per_mp:>14.2f}")
+
+        print()
+        for fmt in sorted({row[0] for row in rows}):
+            base, new = [row for row in rows if row[0] == fmt]
+            print(
+                f"⚡ {fmt}: {base[2] / new[2]:.1f}x faster, "
+                f"{base[3] / max(new[3], 1e-6):.1f}x less peak memory"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Img2Img Throughput Benchmark
+================================================================
+
+Misst den Durchsatz (Bilder/Minute) des Img2Img-Micro-Batchings:
+gleichzeitig eingereichte Anfragen mit identischem Style-Preset werden
+einmal mit Batch-Größe 1 und einmal mit Batch-Größe N verarbeitet.
+
+Usage:
+    python benchmarks/benchmark_img2img_throughput.py --images 8 --batch-size 4
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+from PIL import Image
+
+DEFAULT_SD_MODEL = "hf-internal-testing/tiny-stable-diffusion-pipe"
+
+
+async def measure(args: argparse.Namespace, batch_size: int) -> float:
+    """Bilder pro Minute für eine Batch-Größe"""
+    from config.settings import Settings
+    from models.ai_processor import AIStyleProcessor, FashionStylePresets
+
+    settings = Settings(
+        SECRET_KEY="benchmark",
+        ENVIRONMENT="testing",
+        MODEL_DEVICE=args.device,
+        USE_HALF_PRECISION=args.device != "cpu",
+        LAZY_MODEL_LOADING=True,
+        SD_MODEL_NAME=args.sd_model,
+        INFERENCE_MAX_BATCH_SIZE=batch_size,
+        INFERENCE_MAX_WAIT_MS=args.max_wait_ms
+    )
+    processor = AIStyleProcessor(settings)
+    await processor.device_manager.setup_device()
+    await processor._ensure_model_loaded("stable_diffusion")
+
+    preset = FashionStylePresets.get_style_preset("studio")
+    prompt = processor._create_fashion_prompt(preset, {})
+    images = [
+        Image.new("RGB", (args.size, args.size), color=(40 * i % 255, 120, 200))
+        for i in range(args.images)
+    ]
+
+    # Aufwärmlauf, damit Kernel-Initialisierung nicht mitgemessen wird
+    await processor._enhance_with_img2img(images[0], prompt, preset)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        processor._enhance_with_img2img(image, prompt, preset) for image in images
+    ])
+    elapsed = time.perf_counter() - start
+
+    await processor.cleanup()
+    return args.images / elapsed * 60
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Img2Img micro-batching throughput benchmark")
+    parser.add_argument("--sd-model", default=DEFAULT_SD_MODEL)
+    parser.add_argument("--device", default="cpu", choices=["cpu", "cuda", "mps"])
+    parser.add_argument("--images", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--max-wait-ms", type=int, default=50)
+    parser.add_argument("--size", type=int, default=512)
+    args = parser.parse_args()
+
+    baseline = asyncio.run(measure(args, batch_size=1))
+    batched = asyncio.run(measure(args, batch_size=args.batch_size))
+
+    print(f"{'Batch-Größe':<14}{'Bilder/Minute':>16}")
+    print(f"{1:<14}{baseline:>16.1f}")
+    print(f"{args.batch_size:<14}{batched:>16.1f}")
+    print(f"\n⚡ Speedup: {batched / baseline:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
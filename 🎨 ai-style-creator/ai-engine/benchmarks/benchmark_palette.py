@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Palette Extraction Benchmark
+================================================================
+
+Vergleicht die Histogramm-Palette (utils.palette) mit dem bisherigen
+sklearn-KMeans-Pfad (n_clusters=5, n_init=10) auf 150x150 Pixeln und
+misst den Durchsatz eines Farb-Audits über einen Katalog (Bilder/Minute
+auf einem Kern, inkl. Laden und Verkleinern).
+
+Usage:
+    python benchmarks/benchmark_palette.py --images ./catalog --limit 500
+    python benchmarks/benchmark_palette.py            # synthetische Bilder
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# Ein Kern, damit die Zahlen dem Audit-Szenario entsprechen
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import numpy as np
+from PIL import Image
+
+from utils.palette import extract_palette
+
+
+def load_images(args: argparse.Namespace) -> List[Image.Image]:
+    """Katalogbilder laden oder synthetische Produktfotos erzeugen"""
+    if args.images:
+        paths = sorted(
+            p for p in Path(args.images).rglob("*")
+            if p.suffix.lower() in (".jpg", ".jpeg", ".png", ".webp")
+        )[:args.limit]
+        return [Image.open(p).convert("RGB") for p in paths]
+
+    rng = np.random.default_rng(0)
+    images = []
+    for _ in range(args.limit):
+        # Heller Hintergrund mit farbigem "Produkt" und Rauschen
+        canvas = np.full((args.size, args.size, 3), 235, dtype=np.float32)
+        color = rng.integers(0, 255, 3)
+        y0, x0 = rng.integers(0, args.size // 3, 2)
+        canvas[y0:y0 + args.size // 2, x0:x0 + args.size // 2] = color
+        canvas += rng.normal(0, 8, canvas.shape)
+        images.append(Image.fromarray(np.clip(canvas, 0, 255).astype(np.uint8)))
+    return images
+
+
+def time_per_image(fn, pixel_sets: List[np.ndarray]) -> float:
+    """Mittlere Zeit pro Bild in ms"""
+    start = time.perf_counter()
+    for pixels in pixel_sets:
+        fn(pixels)
+    return (time.perf_counter() - start) / len(pixel_sets) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Palette extraction benchmark")
+    parser.add_argument("--images", help="Verzeichnis mit Katalogbildern")
+    parser.add_argument("--limit", type=int, default=200)
+    parser.add_argument("--size", type=int, default=1024, help="Größe synthetischer Bilder")
+    parser.add_argument("--colors", type=int, default=5)
+    args = parser.parse_args()
+
+    images = load_images(args)
+    pixel_sets = [np.asarray(img.resize((150, 150))).reshape(-1, 3) for img in images]
+    print(f"{len(images)} images, {args.colors} colors, 150x150 samples\n")
+
+    histogram_ms = time_per_image(lambda px: extract_palette(px, args.colors), pixel_sets)
+    print(f"{'Method':<22}{'ms/image':>12}")
+    print(f"{'histogram palette':<22}{histogram_ms:>12.2f}")
+
+    try:
+        from sklearn.cluster import KMeans
+    except ImportError:
+        print(f"{'sklearn KMeans':<22}{'n/a':>12}  (scikit-learn not installed)")
+    else:
+        def kmeans(px):
+            return KMeans(n_clusters=args.colors, random_state=42, n_init=10).fit(px)
+
+        subset = pixel_sets[:min(len(pixel_sets), 30)]
+        kmeans_ms = time_per_image(kmeans, subset)
+        print(f"{'sklearn KMeans':<22}{kmeans_ms:>12.2f}")
+        print(f"\n⚡ Speedup: {kmeans_ms / histogram_ms:.1f}x")
+
+        # Abweichung: mittlere Distanz der Histogramm-Farben zum nächsten KMeans-Zentrum
+        deviations = []
+        for px in subset:
+            centers, _ = extract_palette(px, args.colors)
+            reference = kmeans(px).cluster_centers_
+            dist = np.sqrt(((centers[:, None, :] - reference[None, :, :]) ** 2).sum(-1)).min(1)
+            deviations.append(dist.mean())
+        print(f"Mean distance to KMeans centers: {np.mean(deviations):.1f} (RGB units)")
+
+    # Audit-Durchsatz inkl. Verkleinern und Farbaufbereitung
+    from utils.image_utils import ImageProcessor
+    processor = ImageProcessor()
+    start = time.perf_counter()
+    for img in images:
+        processor.extract_dominant_colors(img, num_colors=args.colors)
+    elapsed = time.perf_counter() - start
+    print(f"\nCatalog audit (extract_dominant_colors): {len(images) / elapsed * 60:,.0f} images/minute")
+
+
+if __name__ == "__main__":
+    main()
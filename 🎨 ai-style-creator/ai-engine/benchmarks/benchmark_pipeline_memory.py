@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Pipeline Memory Benchmark
+=============================================================
+
+Vergleicht den residenten Speicher des AIStyleProcessor mit separat
+geladener ControlNet-Pipeline (vorher) und mit geteilten
+UNet/VAE/Text-Encoder-Komponenten (nachher) auf der CPU.
+
+Jede Variante läuft in einem eigenen Prozess, damit die RSS-Werte
+nicht durch bereits geladene Gewichte verfälscht werden.
+
+Usage:
+    python benchmarks/benchmark_pipeline_memory.py
+    python benchmarks/benchmark_pipeline_memory.py --sd-model <repo> --controlnet-model <repo>
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import argparse
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# Winzige Test-Checkpoints aus den Hugging Face Test-Repos
+DEFAULT_SD_MODEL = "hf-internal-testing/tiny-stable-diffusion-pipe"
+DEFAULT_CONTROLNET_MODEL = "hf-internal-testing/tiny-controlnet"
+
+
+async def measure(sd_model: str, controlnet_model: str, share: bool) -> dict:
+    """Lade beide Pipelines und miss den Speicherbedarf"""
+    import psutil
+    from config.settings import Settings
+    from models.ai_processor import AIStyleProcessor
+    from utils.model_registry import estimate_memory_bytes
+
+    process = psutil.Process()
+    rss_before = process.memory_info().rss
+
+    settings = Settings(
+        SECRET_KEY="benchmark",
+        ENVIRONMENT="testing",
+        MODEL_DEVICE="cpu",
+        USE_HALF_PRECISION=False,
+        LAZY_MODEL_LOADING=True,
+        SD_MODEL_NAME=sd_model,
+        SD_CONTROLNET_MODEL=controlnet_model,
+        SHARE_PIPELINE_COMPONENTS=share
+    )
+    processor = AIStyleProcessor(settings)
+    await processor.device_manager.setup_device()
+    await processor._ensure_model_loaded("stable_diffusion")
+    await processor._ensure_model_loaded("controlnet")
+
+    rss_after = process.memory_info().rss
+    components = list(processor.sd_pipeline.components.values())
+    components += list(processor.controlnet_pipeline.components.values())
+
+    return {
+        "share_components": share,
+        "tensor_mb": estimate_memory_bytes(components) / 1024 ** 2,
+        "rss_delta_mb": (rss_after - rss_before) / 1024 ** 2
+    }
+
+
+def run_variant(args: argparse.Namespace, share: bool) -> dict:
+    """Variante in einem frischen Python-Prozess ausführen"""
+    command = [
+        sys.executable, __file__, "--worker",
+        "--sd-model", args.sd_model,
+        "--controlnet-model", args.controlnet_model
+    ]
+    if share:
+        command.append("--share")
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pipeline memory benchmark")
+    parser.add_argument("--sd-model", default=DEFAULT_SD_MODEL)
+    parser.add_argument("--controlnet-model", default=DEFAULT_CONTROLNET_MODEL)
+    parser.add_argument("--share", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(asyncio.run(measure(args.sd_model, args.controlnet_model, args.share))))
+        return
+
+    before = run_variant(args, share=False)
+    after = run_variant(args, share=True)
+
+    print(f"{'Variante':<28}{'Tensoren (MB)':>16}{'RSS-Delta (MB)':>18}")
+    for label, result in (("separate Pipelines", before), ("geteilte Komponenten", after)):
+        print(f"{label:<28}{result['tensor_mb']:>16.1f}{result['rss_delta_mb']:>18.1f}")
+
+    saved = before["tensor_mb"] - after["tensor_mb"]
+    print(f"\n💾 Eingespart: {saved:.1f} MB Tensorspeicher "
+          f"({saved / max(before['tensor_mb'], 1e-9) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Post-Processing Benchmark
+============================================================
+
+Vergleicht die bisherige PIL-Kette aus post_process_image (Kopie,
+ImageEnhance, UnsharpMask, PIL<->numpy-Wechsel je Schritt) mit der
+fusionierten Engine aus utils.post_processing für jede Kombination der
+Optionen enhance_colors, sharpen, denoise und auto_exposure.
+
+Ausgegeben werden Zeit pro Bild, Speedup und die Abweichung zur
+bisherigen Ausgabe (max., Mittelwert, 99. Perzentil in uint8-Stufen).
+Rauschreduzierung läuft fest in der Stufe "standard" (bisherige Parameter).
+
+Die Engine muss bitgleich zur bisherigen Kette sein: überschreitet eine
+Kombination --max-diff (Standard 0), endet der Benchmark mit Exit-Code 1.
+
+Usage:
+    python benchmarks/benchmark_post_processing.py --size 1024 --repeats 5
+    python benchmarks/benchmark_post_processing.py --skip-denoise
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Sequence
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import cv2
+import numpy as np
+from PIL import Image, ImageEnhance, ImageFilter
+
+from utils.denoise import TIER_STANDARD
+from utils.post_processing import OPERATIONS, OP_DENOISE, post_process
+
+
+# Bisherige Implementierung (Referenz)
+def legacy_post_process(image: Image.Image, operations: Sequence[str]) -> Image.Image:
+    """PIL-Kette wie vor der fusionierten Engine"""
+    processed = image.copy()
+    if "enhance_colors" in operations:
+        processed = ImageEnhance.Color(processed).enhance(1.15)
+        processed = ImageEnhance.Brightness(processed).enhance(1.05)
+    if "sharpen" in operations:
+        processed = processed.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
+    if "denoise" in operations:
+        denoised = cv2.fastNlMeansDenoisingColored(np.array(processed), None, 10, 10, 7, 21)
+        processed = Image.fromarray(denoised)
+    if "auto_exposure" in operations:
+        lab = cv2.cvtColor(np.array(processed), cv2.COLOR_RGB2LAB)
+        l, a, b = cv2.split(lab)
+        l = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(l)
+        processed = Image.fromarray(cv2.cvtColor(cv2.merge([l, a, b]), cv2.COLOR_LAB2RGB))
+    return processed
+
+
+def create_image(size: int) -> Image.Image:
+    """Synthetisches Diffusionsergebnis: Verläufe, Kanten und leichtes Rauschen"""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:size, 0:size]
+    pixels = np.stack([x * 200 / size + 30, y * 180 / size + 40, np.full_like(x, 110)], axis=-1)
+    pixels[size // 4:size // 2, size // 4:3 * size // 4] = (190, 60, 70)
+    pixels = pixels + rng.normal(0, 6, pixels.shape)
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+
+def time_ms(fn: Callable[[], Image.Image], repeats: int) -> float:
+    """Mittlere Laufzeit in ms"""
+    fn()  # Warmup
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Post-processing benchmark")
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--skip-denoise", action="store_true", help="NLM-Kombinationen auslassen")
+    parser.add_argument("--max-diff", type=int, default=0, help="Erlaubte max. Abweichung in uint8-Stufen")
+    args = parser.parse_args()
+
+    image = create_image(args.size)
+    operations = [op for op in OPERATIONS if not (args.skip_denoise and op == OP_DENOISE)]
+    print(f"{args.size}x{args.size} RGB, {args.repeats} repeats\n")
+    print(f"{'Operations':<46}{'legacy ms':>11}{'fused ms':>10}{'speedup':>9}{'max':>5}{'mean':>7}{'p99':>5}")
+
+    failed = []
+    for count in range(1, len(operations) + 1):
+        for combo in itertools.combinations(operations, count):
+            legacy_ms = time_ms(lambda: legacy_post_process(image, combo), args.repeats)
+            fused_ms = time_ms(lambda: post_process(image, combo, TIER_STANDARD), args.repeats)
+
+            reference = np.asarray(legacy_post_process(image, combo), dtype=np.int16)
+            result = np.asarray(post_process(image, combo, TIER_STANDARD), dtype=np.int16)
+            diff = np.abs(reference - result)
+
+            print(
+                f"{'+'.join(combo):<46}{legacy_ms:>11.1f}{fused_ms:>10.1f}"
+                f"{legacy_ms / fused_ms:>8.1f}x{int(diff.max()):>5}{diff.mean():>7.2f}"
+                f"{int(np.percentile(diff, 99)):>5}"
+            )
+            if diff.max() > args.max_diff:
+                failed.append("+".join(combo))
+
+    if failed:
+        print(f"\nFAILED: max. Abweichung > {args.max_diff} bei {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
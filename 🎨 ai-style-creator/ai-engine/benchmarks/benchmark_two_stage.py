@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Two-Stage Generation Benchmark
+==================================================================
+
+Vergleicht die einstufige Generierung (Diffusion in MAX_IMAGE_SIZE) mit der
+zweistufigen (Diffusion in TWO_STAGE_RESOLUTION plus Upscaler):
+- Ende-zu-Ende-Latenz von enhance_image (Result Cache aus, keine Varianten)
+- Schärfe des Ergebnisses als Laplacian-Varianz aus
+  ImageProcessor.analyze_image_properties
+
+Mit --upscaler-only wird nur die zweite Stufe gemessen: das Foto wird auf
+die Diffusionsauflösung verkleinert und wiederhergestellt (Lanczos,
+detail_transfer, onnx); verglichen werden Zeit und Schärfe mit dem Original.
+
+Usage:
+    python benchmarks/benchmark_two_stage.py --image ./samples/dress.jpg --runs 3
+    python benchmarks/benchmark_two_stage.py --upscaler-only --image ./samples/dress.jpg
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+import numpy as np
+from PIL import Image
+
+DEFAULT_SD_MODEL = "hf-internal-testing/tiny-stable-diffusion-pipe"
+
+# (Bezeichnung, two_stage, upscaler)
+MODES: List[Tuple[str, bool, Optional[str]]] = [
+    ("single-stage", False, None),
+    ("two-stage detail_transfer", True, "detail_transfer"),
+    ("two-stage onnx", True, "onnx")
+]
+
+
+def create_image(size: int) -> Image.Image:
+    """Synthetisches Produktfoto: Stoffstruktur auf hellem Hintergrund"""
+    rng = np.random.default_rng(0)
+    y, x = np.mgrid[0:size, 0:size]
+    pixels = np.full((size, size, 3), 235.0)
+    garment = (np.abs(x - size / 2) < size / 4) & (np.abs(y - size / 2) < size / 3)
+    weave = 20 * np.sin(x / 2.5) * np.sin(y / 3.0)
+    pixels[garment] = np.stack([150 + weave, 40 + weave, 60 + weave], axis=-1)[garment]
+    pixels += rng.normal(0, 3, pixels.shape)
+    return Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+
+
+def sharpness(image: Image.Image) -> float:
+    """Laplacian-Varianz wie in analyze_image_properties"""
+    from utils.image_features import get_image_features
+    return get_image_features(image).sharpness
+
+
+def run_upscaler_only(args: argparse.Namespace, image: Image.Image):
+    """Nur die zweite Stufe: verkleinern und wiederherstellen"""
+    from config.settings import Settings
+    from utils.image_loading import decode_image
+    from utils.upscaling import Upscaler
+
+    settings = Settings(SECRET_KEY="benchmark", ENVIRONMENT="testing")
+    upscaler = Upscaler(settings)
+    reference = decode_image(image, settings.MAX_IMAGE_SIZE)
+    small = decode_image(reference, settings.TWO_STAGE_RESOLUTION)
+
+    methods = {
+        "lanczos": lambda: small.resize(reference.size, Image.LANCZOS),
+        "detail_transfer": lambda: upscaler.upscale(small, reference, "detail_transfer")
+    }
+    if upscaler.super_resolution.is_available():
+        methods["onnx"] = lambda: upscaler.upscale(small, reference, "onnx")
+
+    print(f"{small.size} -> {reference.size}, original sharpness {sharpness(reference):.1f}\n")
+    print(f"{'Upscaler':<18}{'ms':>9}{'sharpness':>12}{'vs original':>13}")
+    for name, fn in methods.items():
+        fn()  # Warmup (Session-Aufbau)
+        start = time.perf_counter()
+        for _ in range(args.runs):
+            result = fn()
+        elapsed_ms = (time.perf_counter() - start) / args.runs * 1000
+        value = sharpness(result)
+        print(f"{name:<18}{elapsed_ms:>9.1f}{value:>12.1f}{value / sharpness(reference):>12.0%}")
+
+
+async def run_end_to_end(args: argparse.Namespace, image_path: str) -> Dict[str, Any]:
+    """Ende-zu-Ende-Latenz und Schärfe pro Modus"""
+    from config.settings import Settings
+    from models.ai_processor import AIStyleProcessor
+
+    settings = Settings(
+        SECRET_KEY="benchmark",
+        ENVIRONMENT="testing",
+        MODEL_DEVICE=args.device,
+        USE_HALF_PRECISION=args.device != "cpu",
+        LAZY_MODEL_LOADING=True,
+        SD_MODEL_NAME=args.sd_model,
+        ENABLE_RESULT_CACHE=False
+    )
+    processor = AIStyleProcessor(settings)
+    await processor.device_manager.setup_device()
+
+    rows = {}
+    try:
+        for name, two_stage, upscaler in MODES:
+            if upscaler == "onnx" and not processor.upscaler.super_resolution.is_available():
+                continue
+            options = {
+                "quality": args.quality,
+                "generate_variants": False,
+                "two_stage": two_stage,
+                "upscaler": upscaler
+            }
+            # Aufwärmlauf: Modelle laden, Kernel initialisieren
+            await processor.enhance_image(image_path, args.style, options)
+
+            latencies = []
+            for _ in range(args.runs):
+                start = time.perf_counter()
+                results = await processor.enhance_image(image_path, args.style, options)
+                latencies.append(time.perf_counter() - start)
+
+            properties = processor.image_processor.analyze_image_properties(results["enhanced"])
+            rows[name] = {
+                "latency": sum(latencies) / len(latencies),
+                "sharpness": properties.get("sharpness", 0.0)
+            }
+    finally:
+        await processor.cleanup()
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Two-stage generation benchmark")
+    parser.add_argument("--image", help="Produktfoto (Standard: synthetisch)")
+    parser.add_argument("--size", type=int, default=2048, help="Größe des synthetischen Fotos")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--upscaler-only", action="store_true", help="Nur die zweite Stufe messen")
+    parser.add_argument("--sd-model", default=DEFAULT_SD_MODEL)
+    parser.add_argument("--device", default="cpu", choices=["cpu", "cuda", "mps"])
+    parser.add_argument("--style", default="studio")
+    parser.add_argument("--quality", default="high")
+    args = parser.parse_args()
+
+    if args.image:
+        image_path = args.image
+        image = Image.open(image_path).convert("RGB")
+    else:
+        image = create_image(args.size)
+        image_path = str(Path(tempfile.gettempdir()) / "two_stage_input.png")
+        image.save(image_path)
+
+    if args.upscaler_only:
+        run_upscaler_only(args, image)
+        return
+
+    rows = asyncio.run(run_end_to_end(args, image_path))
+    baseline = rows["single-stage"]
+    print(f"{'Mode':<28}{'latency s':>11}{'speedup':>9}{'sharpness':>12}{'vs single':>11}")
+    for name, row in rows.items():
+        print(
+            f"{name:<28}{row['latency']:>11.2f}{baseline['latency'] / row['latency']:>8.2f}x"
+            f"{row['sharpness']:>12.1f}{row['sharpness'] / (baseline['sharpness'] or 1):>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -122,8 +122,32 @@ class Settings(BaseSettings):
     
     # Modell-Einstellungen
     MAX_IMAGE_SIZE: int = Field(default=1024, description="Maximale Bildgröße für Processing")
+    ANALYSIS_IMAGE_SIZE: int = Field(default=1024, description="Längste Seite des Analysebilds (BLIP, Merkmale)")
+    THUMBNAIL_SIZE: int = Field(default=256, description="Längste Seite der Thumbnail-Stufe (Farbanalyse)")
+    OVERLAP_ANALYSIS_AND_ENHANCEMENT: bool = Field(
+        default=True,
+        description="Bildanalyse und Enhancement eines Jobs parallel ausführen"
+    )
     MODEL_DEVICE: str = Field(default="auto", description="Device für Modelle (auto, cpu, cuda)")
     USE_HALF_PRECISION: bool = Field(default=True, description="Half Precision für GPU-Optimierung")
+    SHARE_PIPELINE_COMPONENTS: bool = Field(
+        default=True,
+        description="ControlNet-Pipeline nutzt UNet/VAE/Text-Encoder der Img2Img-Pipeline mit"
+    )
+    
+    # Lazy Loading & Eviction
+    LAZY_MODEL_LOADING: bool = Field(
+        default=False,
+        description="Modelle erst bei erster Nutzung laden statt beim Start"
+    )
+    MODEL_IDLE_TTL_SECONDS: int = Field(
+        default=900,
+        description="Ungenutzte Modelle nach X Sekunden entladen (nur Lazy Loading, 0 = nie)"
+    )
+    MODEL_EVICTION_INTERVAL_SECONDS: int = Field(
+        default=60,
+        description="Prüfintervall für das Entladen ungenutzter Modelle"
+    )
     
     # ================================================
     # Processing Einstellungen
@@ -133,6 +157,32 @@ class Settings(BaseSettings):
     MAX_CONCURRENT_JOBS: int = Field(default=4, description="Maximale parallele Jobs")
     JOB_TIMEOUT_SECONDS: int = Field(default=600, description="Job Timeout in Sekunden")
     MAX_BATCH_SIZE: int = Field(default=10, description="Maximale Batch-Größe")
+    JOB_QUEUE_DB_PATH: str = Field(default="./data/jobs.db", description="SQLite-Datei der persistenten Job-Queue")
+    JOB_QUEUE_MAX_PENDING: int = Field(default=32, description="Wartende Jobs bevor HTTP 429 zurückgegeben wird (0 = unbegrenzt)")
+    JOB_RETRY_AFTER_SECONDS: int = Field(default=5, description="Minimaler Retry-After-Wert bei voller Job-Queue")
+    JOB_VISIBILITY_TIMEOUT_SECONDS: int = Field(default=120, description="Lease-Dauer bis ein Job ohne Heartbeat erneut ausgeliefert wird")
+    JOB_MAX_ATTEMPTS: int = Field(default=3, description="Maximale Zustellversuche pro Job")
+    JOB_POLL_INTERVAL_MS: int = Field(default=500, description="Polling-Intervall der Worker bei leerer Queue in ms")
+    JOB_BATCH_PRIORITY_OFFSET: int = Field(default=-1, description="Prioritätsabschlag für Batch-Jobs gegenüber Einzel-Uploads")
+    EMBEDDED_WORKER: bool = Field(default=True, description="Worker im API-Prozess starten (false bei separaten worker.py-Prozessen)")
+    JOB_CANCEL_POLL_INTERVAL_MS: int = Field(default=1000, description="Intervall, in dem Worker abgebrochene Jobs in der Queue abfragen")
+    JOB_CANCEL_GRACE_SECONDS: int = Field(default=30, description="Wartezeit nach Abbruch oder Deadline, bevor nicht kooperative Stufen hart beendet werden")
+    WORKER_DRAIN_TIMEOUT_SECONDS: int = Field(default=30, description="Beim Herunterfahren: so lange laufende Jobs fertigstellen, danach abbrechen und neu einreihen")
+    
+    # Micro-Batching der Diffusion-Aufrufe
+    INFERENCE_MAX_BATCH_SIZE: int = Field(default=4, description="Maximale Bilder pro Img2Img-Denoising-Lauf")
+    INFERENCE_MAX_WAIT_MS: int = Field(default=50, description="Maximale Wartezeit auf weitere Img2Img-Anfragen in ms")
+    
+    # Schrittfortschritt und Zwischenbilder laufender Jobs (SSE)
+    ENABLE_STEP_PREVIEWS: bool = Field(default=True, description="Vorschauen aus den Latents während der Diffusion erzeugen")
+    PREVIEW_EVERY_N_STEPS: int = Field(default=5, description="Vorschau alle N Denoising-Schritte")
+    PREVIEW_SIZE: int = Field(default=256, description="Längste Seite der Vorschaubilder")
+    PREVIEW_DIR: str = Field(default="./data/previews", description="Ablage der Vorschauen (geteilt zwischen API und Workern)")
+    PREVIEW_STREAM_INTERVAL_MS: int = Field(default=500, description="Prüfintervall des Event-Streams für Status und Vorschauen")
+    
+    # Zeitschätzung aus dem Ausführungsplan der Qualitätsstufe (estimated_time)
+    ESTIMATE_SECONDS_PER_MEGAPIXEL_STEP: float = Field(default=1.0, description="Geschätzte Sekunden pro Denoising-Schritt und Megapixel")
+    ESTIMATE_OVERHEAD_SECONDS: float = Field(default=15.0, description="Geschätzter fester Anteil pro Job (Decode, Analyse, Speichern)")
     
     # Bildverarbeitung
     SUPPORTED_FORMATS: List[str] = Field(
@@ -140,6 +190,52 @@ class Settings(BaseSettings):
         description="Unterstützte Bildformate"
     )
     MAX_FILE_SIZE_MB: int = Field(default=10, description="Maximale Dateigröße in MB")
+    MAX_IMAGE_PIXELS: int = Field(default=40_000_000, description="Maximale Pixelanzahl eines Uploads (Schutz vor Decompression Bombs)")
+    UPLOAD_CHUNK_SIZE_KB: int = Field(default=256, description="Chunk-Größe beim Streamen von Uploads auf Disk")
+
+    # Background Removal (ONNX Runtime, CPU)
+    BACKGROUND_MODEL_PATH: str = Field(
+        default="./models/onnx/u2netp.onnx",
+        description="ONNX-Segmentierungsmodell (U2-Net-kompatibel, 1 Eingang NCHW)"
+    )
+    BACKGROUND_MODEL_INPUT_SIZE: int = Field(default=320, description="Eingabegröße des Segmentierungsmodells")
+    BACKGROUND_SESSION_POOL_SIZE: int = Field(default=2, description="Anzahl gepoolter ONNX-Sessions pro Worker")
+    BACKGROUND_INTRA_OP_THREADS: int = Field(default=2, description="CPU-Threads pro ONNX-Session")
+    BACKGROUND_BATCH_SIZE: int = Field(default=8, description="Bilder pro Segmentierungs-Batch (Katalogläufe)")
+
+    # Ausgabe-Renditions pro Ergebnisbild (siehe utils.renditions)
+    OUTPUT_RENDITIONS: List[str] = Field(
+        default=["full", "webp", "web", "thumbnail"],
+        description="Erzeugte Renditions: full (JPEG), webp, web (1200px), thumbnail (256px)"
+    )
+    RENDITION_WORKERS: int = Field(default=2, description="Prozesse für das Encodieren (0 = im Thread-Pool)")
+
+    # Produkt-Zuschnitt vor der Diffusion (Option "smart_crop" überschreibt pro Job)
+    ENABLE_PRODUCT_CROP: bool = Field(default=False, description="Nur den Produktausschnitt diffundieren")
+    DIFFUSION_NATIVE_SIZE: int = Field(default=512, description="Native Auflösung des Diffusionsmodells (längste Seite)")
+    PRODUCT_CROP_PADDING: float = Field(default=0.1, description="Rand um die Produkt-Bounding-Box (relativ)")
+    PRODUCT_CROP_MIN_AREA_RATIO: float = Field(default=0.05, description="Kleinere Ausschnitte gelten als Fehlerkennung")
+    PRODUCT_CROP_MAX_AREA_RATIO: float = Field(default=0.75, description="Größere Ausschnitte werden nicht zugeschnitten")
+    PRODUCT_CROP_BACKGROUND: str = Field(default="whitened", description="Hintergrund beim Zusammensetzen (white, whitened)")
+
+    # Aspect-Buckets für Diffusionseingaben (feste Formen für Batching)
+    ENABLE_ASPECT_BUCKETS: bool = Field(default=True, description="Diffusionseingaben in feste Auflösungs-Buckets einpassen")
+    ASPECT_BUCKET_STEP: int = Field(default=64, description="Raster der Bucket-Seitenlängen")
+    ASPECT_BUCKET_MAX_RATIO: float = Field(default=2.0, description="Größtes Seitenverhältnis der Buckets")
+    ASPECT_BUCKET_FIT: str = Field(default="pad", description="Einpassung in den Bucket (pad, crop)")
+    
+    # Zweistufige Generierung: Diffusion in reduzierter Auflösung, dann Upscaler
+    # (Option "two_stage" bzw. "upscaler" überschreibt pro Job)
+    TWO_STAGE_DIFFUSION: bool = Field(default=False, description="Diffusion in reduzierter Auflösung mit anschließendem Upscaling")
+    TWO_STAGE_RESOLUTION: int = Field(default=512, description="Längste Seite der Diffusion im zweistufigen Modus")
+    UPSCALER: str = Field(default="detail_transfer", description="Upscaler der zweiten Stufe (detail_transfer, onnx)")
+    DETAIL_TRANSFER_STRENGTH: float = Field(default=1.0, description="Anteil der aus dem Original übertragenen Details")
+    SUPERRES_MODEL_PATH: str = Field(
+        default="./models/onnx/realesr-general-x4v3.onnx",
+        description="ONNX-Super-Resolution-Modell für den Upscaler 'onnx'"
+    )
+    SUPERRES_TILE_SIZE: int = Field(default=192, description="Kachelgröße der Super-Resolution (Eingabepixel)")
+    SUPERRES_INTRA_OP_THREADS: int = Field(default=4, description="CPU-Threads der Super-Resolution-Session")
     
     # Content-Generierung
     MAX_DESCRIPTION_LENGTH: int = Field(default=500, description="Maximale Beschreibungslänge")
@@ -191,6 +287,17 @@ class Settings(BaseSettings):
     # Caching
     CACHE_TTL_SECONDS: int = Field(default=3600, description="Cache TTL in Sekunden")
     CACHE_MAX_SIZE: int = Field(default=1000, description="Maximale Cache-Einträge")
+    PROMPT_CACHE_MAX_ENTRIES: int = Field(default=128, description="Maximale gecachte Prompt-Embeddings")
+    
+    # VAE-Latents vorbereiteter Eingabebilder (Encoder läuft pro Bild und Bucket einmal)
+    LATENT_CACHE_MAX_MB: int = Field(default=256, description="Maximale Größe des Latent Caches im Speicher in MB")
+    LATENT_CACHE_SPILL_DIR: str = Field(default="", description="Verzeichnis für verdrängte Latents als .npy (leer = kein Spill)")
+    LATENT_CACHE_SPILL_MAX_MB: int = Field(default=1024, description="Maximale Größe des Spill-Verzeichnisses in MB")
+    
+    # Result Cache für enhance_image (TTL/Einträge über CACHE_TTL_SECONDS/CACHE_MAX_SIZE)
+    ENABLE_RESULT_CACHE: bool = Field(default=True, description="Ergebnisse identischer Uploads wiederverwenden")
+    RESULT_CACHE_DIR: str = Field(default="./cache/results", description="Verzeichnis des Result Caches")
+    RESULT_CACHE_MAX_MB: int = Field(default=2048, description="Maximale Größe des Result Caches in MB")
     
     # Processing Limits
     CPU_CORES: Optional[int] = Field(default=None, description="CPU Cores für Processing")
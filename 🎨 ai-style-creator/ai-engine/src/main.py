@@ -19,28 +19,36 @@ Version: 1.0.0
 """
 
 import os
+import json
+import time
 import logging
 import asyncio
 from contextlib import asynccontextmanager
 from typing import List, Optional
 
 import uvicorn
-from fastapi import FastAPI, HTTPException, UploadFile, File, BackgroundTasks, Depends
+from fastapi import FastAPI, HTTPException, UploadFile, File, Form, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field
 import structlog
 
 # Lokale Imports
 from config.settings import get_settings
-from models.ai_processor import AIStyleProcessor
+from models.ai_processor import AIStyleProcessor, FashionStylePresets
+from models.quality_tiers import resolve_execution_plan
 from models.content_generator import ContentGenerator
+from utils.aspect_buckets import BUCKET_STATS_NAME, merge_bucket_stats
 from utils.auth import verify_api_token
 from utils.file_handler import FileHandler
-from utils.job_queue import JobQueue
+from utils.inference_executor import get_inference_executor, shutdown_inference_executor
+from utils.job_queue import JobQueue, JobQueueFullError
+from utils.job_progress import PreviewStore
 from utils.monitoring import PrometheusMetrics
+from utils.upload_ingest import RequestBodyLimitMiddleware, UploadIngestor, UploadRejectedError
+from worker import JobWorker
 
 # Logging Setup
 structlog.configure(
@@ -67,7 +75,10 @@ settings = get_settings()
 ai_processor: Optional[AIStyleProcessor] = None
 content_generator: Optional[ContentGenerator] = None
 file_handler: Optional[FileHandler] = None
+upload_ingestor: Optional[UploadIngestor] = None
 job_queue: Optional[JobQueue] = None
+job_worker: Optional[JobWorker] = None
+preview_store: Optional[PreviewStore] = None
 metrics: Optional[PrometheusMetrics] = None
 
 
@@ -75,10 +86,37 @@ metrics: Optional[PrometheusMetrics] = None
 class ImageProcessingRequest(BaseModel):
     """Request-Model für Bildverarbeitung"""
     style: str = Field(..., description="Gewünschter Verarbeitungsstil")
-    quality: str = Field(default="high", description="Qualitätsstufe")
+    quality: str = Field(default="high", description="Qualitätsstufe (standard, high, ultra)")
     background: Optional[str] = Field(None, description="Background-Typ")
     enhance_colors: bool = Field(default=True, description="Farbverbesserung aktivieren")
     generate_variants: bool = Field(default=True, description="Multiple Varianten erstellen")
+    smart_crop: Optional[bool] = Field(None, description="Nur den Produktausschnitt diffundieren (Standard: ENABLE_PRODUCT_CROP)")
+    two_stage: Optional[bool] = Field(None, description="Diffusion in reduzierter Auflösung plus Upscaler (Standard: TWO_STAGE_DIFFUSION)")
+    upscaler: Optional[str] = Field(None, description="Upscaler im zweistufigen Modus (detail_transfer, onnx)")
+
+    @classmethod
+    def as_form(
+        cls,
+        style: str = Form("studio"),
+        quality: str = Form("high"),
+        background: Optional[str] = Form(None),
+        enhance_colors: bool = Form(True),
+        generate_variants: bool = Form(True),
+        smart_crop: Optional[bool] = Form(None),
+        two_stage: Optional[bool] = Form(None),
+        upscaler: Optional[str] = Form(None)
+    ) -> "ImageProcessingRequest":
+        """Optionen aus den Formularfeldern eines Multipart-Uploads (FastAPI füllt Body-Modelle dort nicht)"""
+        return cls(
+            style=style,
+            quality=quality,
+            background=background,
+            enhance_colors=enhance_colors,
+            generate_variants=generate_variants,
+            smart_crop=smart_crop,
+            two_stage=two_stage,
+            upscaler=upscaler
+        )
 
 
 class ContentGenerationRequest(BaseModel):
@@ -113,7 +151,8 @@ class JobStatusResponse(BaseModel):
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application Lifecycle Manager - Initialisierung und Cleanup"""
-    global ai_processor, content_generator, file_handler, job_queue, metrics
+    global ai_processor, content_generator, file_handler, upload_ingestor, job_queue, job_worker, preview_store, metrics
+    worker_task: Optional[asyncio.Task] = None
     
     logger.info("🚀 Starting DressForPleasure AI Style Creator Engine...")
     
@@ -128,18 +167,34 @@ async def lifespan(app: FastAPI):
         # File Handler initialisieren
         file_handler = FileHandler(settings)
         await file_handler.initialize()
+        upload_ingestor = UploadIngestor(settings)
         
         # Job Queue initialisieren
         job_queue = JobQueue(settings)
         await job_queue.initialize()
         
-        # AI Modelle laden (kann etwas dauern)
-        logger.info("Loading AI models... This may take a few minutes on first run.")
-        ai_processor = AIStyleProcessor(settings)
-        await ai_processor.initialize()
-        
-        content_generator = ContentGenerator(settings)
-        await content_generator.initialize()
+        # Zwischenbilder laufender Jobs (von den Workern geschrieben)
+        if settings.ENABLE_STEP_PREVIEWS:
+            preview_store = PreviewStore(settings.PREVIEW_DIR)
+        
+        # Modelle nur mit eingebettetem Worker laden; bei separaten
+        # worker.py-Prozessen bleiben Web-Nodes ohne GPU-Speicher
+        if settings.EMBEDDED_WORKER:
+            # AI Modelle laden (kann etwas dauern, außer bei LAZY_MODEL_LOADING)
+            logger.info("Loading AI models... This may take a few minutes on first run.")
+            ai_processor = AIStyleProcessor(settings)
+            ai_processor.job_queue = job_queue
+            await ai_processor.initialize()
+            
+            content_generator = ContentGenerator(settings)
+            content_generator.job_queue = job_queue
+            await content_generator.initialize()
+            
+            # Jobs im API-Prozess abarbeiten
+            job_worker = JobWorker(settings, job_queue, ai_processor, content_generator)
+            worker_task = asyncio.create_task(job_worker.run())
+        else:
+            logger.info("EMBEDDED_WORKER disabled - models are loaded by worker.py processes")
         
         logger.info("✅ All components initialized successfully!")
         
@@ -153,6 +208,12 @@ async def lifespan(app: FastAPI):
         # Cleanup
         logger.info("🔄 Shutting down AI Style Creator Engine...")
         
+        # Laufende Jobs beenden, bevor die Modelle entladen werden
+        if job_worker:
+            job_worker.stop()
+        if worker_task:
+            await worker_task
+        
         if ai_processor:
             await ai_processor.cleanup()
         if content_generator:
@@ -163,6 +224,9 @@ async def lifespan(app: FastAPI):
             await file_handler.cleanup()
         if metrics:
             await metrics.cleanup()
+        
+        # Inferenz-Pool erst nach den Modellen beenden
+        shutdown_inference_executor()
             
         logger.info("👋 AI Style Creator Engine shut down complete.")
 
@@ -191,6 +255,13 @@ app.add_middleware(
     allowed_hosts=settings.ALLOWED_HOSTS
 )
 
+# Bodies über der größten erlaubten Batch-Anfrage (plus Multipart-Overhead)
+# schon beim Empfang abweisen; UploadFiles sind sonst vollständig gespoolt
+app.add_middleware(
+    RequestBodyLimitMiddleware,
+    max_bytes=(settings.MAX_FILE_SIZE_MB * settings.MAX_BATCH_SIZE + 1) * 1024 * 1024
+)
+
 # Security
 security = HTTPBearer()
 
@@ -206,6 +277,16 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         raise HTTPException(status_code=401, detail="Invalid authentication credentials")
 
 
+def _queue_full_response(error: JobQueueFullError) -> HTTPException:
+    """HTTP 429 mit Retry-After bei voller Job-Queue"""
+    metrics.increment_counter("jobs_rejected")
+    return HTTPException(
+        status_code=429,
+        detail="Inference queue is full. Please retry later.",
+        headers={"Retry-After": str(error.retry_after)}
+    )
+
+
 # Health Check Endpoint
 @app.get("/health")
 async def health_check():
@@ -215,13 +296,21 @@ async def health_check():
             "status": "healthy",
             "timestamp": asyncio.get_event_loop().time(),
             "components": {
-                "ai_processor": ai_processor.is_ready() if ai_processor else False,
-                "content_generator": content_generator.is_ready() if content_generator else False,
                 "file_handler": file_handler.is_ready() if file_handler else False,
                 "job_queue": job_queue.is_ready() if job_queue else False,
-            }
+            },
+            "models": ai_processor.get_model_status() if ai_processor else None,
+            "inference": get_inference_executor(settings).get_stats(),
+            "worker": job_worker.get_stats() if job_worker else None
         }
         
+        # Modelle gehören nur mit eingebettetem Worker zu diesem Prozess
+        if settings.EMBEDDED_WORKER:
+            health_status["components"]["ai_processor"] = ai_processor.is_ready() if ai_processor else False
+            health_status["components"]["content_generator"] = (
+                content_generator.is_ready() if content_generator else False
+            )
+        
         # Überprüfe, ob alle Komponenten bereit sind
         all_ready = all(health_status["components"].values())
         if not all_ready:
@@ -234,12 +323,26 @@ async def health_check():
         return {"status": "unhealthy", "error": str(e)}
 
 
+def _estimate_processing_time(processing_options: dict) -> int:
+    """Geschätzte Sekunden pro Bild aus dem Ausführungsplan der Qualitätsstufe"""
+    plan = resolve_execution_plan(processing_options.get("quality"), processing_options)
+    style_preset = FashionStylePresets.get_style_preset(processing_options.get("style", "studio"))
+    two_stage = processing_options.get("two_stage")
+    if two_stage is None:
+        two_stage = settings.TWO_STAGE_DIFFUSION
+    return plan.estimate_seconds(
+        style_preset["style_strength"],
+        min(settings.MAX_IMAGE_SIZE, settings.TWO_STAGE_RESOLUTION) if two_stage else settings.MAX_IMAGE_SIZE,
+        settings.ESTIMATE_SECONDS_PER_MEGAPIXEL_STEP,
+        settings.ESTIMATE_OVERHEAD_SECONDS
+    )
+
+
 # Bildverarbeitung Endpoints
 @app.post("/api/v1/process/image", response_model=ProcessingResponse)
 async def process_image(
-    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
-    request: ImageProcessingRequest = None,
+    request: ImageProcessingRequest = Depends(ImageProcessingRequest.as_form),
     current_user = Depends(get_current_user)
 ):
     """
@@ -247,45 +350,46 @@ async def process_image(
     
     - **file**: Original-Produktfoto (JPG, PNG, WEBP)
     - **style**: Verarbeitungsstil (studio, street, lifestyle, luxury, artistic)
-    - **quality**: Qualitätsstufe (standard, high, ultra)
+    - **quality**: Qualitätsstufe (standard = schnell, high, ultra = Hero-Shots)
     - **enhance_colors**: Automatische Farbverbesserung
     - **generate_variants**: Multiple Stil-Varianten erstellen
+    - **smart_crop**: Nur den Produktausschnitt diffundieren und zurücksetzen
+    - **two_stage**: Diffusion in reduzierter Auflösung, danach Upscaler (detail_transfer, onnx)
     """
     try:
-        # Validierung der Datei
-        if not file.content_type.startswith("image/"):
-            raise HTTPException(status_code=400, detail="Only image files are allowed")
+        # Volle Queue ablehnen bevor der Upload gespeichert wird
+        await job_queue.ensure_capacity(1)
         
-        # File handling
-        uploaded_file = await file_handler.save_upload(file)
+        # Upload streamen und validieren (Größe, Magic Bytes, Dimensionen)
+        uploaded_file = await upload_ingestor.ingest(file)
         
-        # Job in Queue einreihen
+        # Job in Queue einreihen (ein Worker übernimmt die Verarbeitung)
         job_id = await job_queue.enqueue_image_processing(
             file_path=uploaded_file.path,
-            processing_options=request.dict() if request else {},
-            user_id=current_user.get("user_id")
+            processing_options=request.dict(),
+            user_id=current_user.get("user_id"),
+            priority=current_user.get("priority", 0)
         )
         
         # Metrics tracken
         metrics.increment_counter("images_submitted")
         
-        # Background processing starten
-        background_tasks.add_task(
-            ai_processor.process_image_async,
-            job_id,
-            uploaded_file.path,
-            request.dict() if request else {}
-        )
-        
         logger.info(f"Image processing job {job_id} queued for user {current_user.get('user_id')}")
         
         return ProcessingResponse(
             job_id=job_id,
             status="queued",
-            estimated_time=120,  # 2 Minuten geschätzt
+            estimated_time=_estimate_processing_time(request.dict()),
             message="Bildverarbeitung wurde gestartet. Sie erhalten eine Benachrichtigung, wenn der Prozess abgeschlossen ist."
         )
         
+    except JobQueueFullError as e:
+        raise _queue_full_response(e)
+    except UploadRejectedError as e:
+        metrics.increment_counter("uploads_rejected")
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Image processing failed: {e}")
         metrics.increment_counter("processing_errors")
@@ -294,7 +398,6 @@ async def process_image(
 
 @app.post("/api/v1/generate/content", response_model=ProcessingResponse)
 async def generate_content(
-    background_tasks: BackgroundTasks,
     image_url: str,
     request: ContentGenerationRequest,
     current_user = Depends(get_current_user)
@@ -310,19 +413,12 @@ async def generate_content(
     - **include_styling_tips**: Styling-Tipps hinzufügen
     """
     try:
-        # Job in Queue einreihen
+        # Job in Queue einreihen (ein Worker übernimmt die Generierung)
         job_id = await job_queue.enqueue_content_generation(
             image_url=image_url,
             generation_options=request.dict(),
-            user_id=current_user.get("user_id")
-        )
-        
-        # Background processing starten
-        background_tasks.add_task(
-            content_generator.generate_content_async,
-            job_id,
-            image_url,
-            request.dict()
+            user_id=current_user.get("user_id"),
+            priority=current_user.get("priority", 0)
         )
         
         metrics.increment_counter("content_requests")
@@ -336,6 +432,8 @@ async def generate_content(
             message="Content-Generierung wurde gestartet. Die Texte werden automatisch erstellt."
         )
         
+    except JobQueueFullError as e:
+        raise _queue_full_response(e)
     except Exception as e:
         logger.error(f"Content generation failed: {e}")
         metrics.increment_counter("generation_errors")
@@ -380,12 +478,141 @@ async def get_job_result(
         raise HTTPException(status_code=500, detail=f"Failed to get job result: {str(e)}")
 
 
+async def _get_owned_job(job_id: str, current_user: dict) -> dict:
+    """
+    Job laden, wenn er dem Nutzer gehört (Admins dürfen jeden Job sehen)
+
+    Raises:
+        HTTPException: 404 für unbekannte Jobs, 403 für fremde Jobs
+    """
+    job = await job_queue.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job["user_id"] != current_user.get("user_id") and not current_user.get("is_admin", False):
+        raise HTTPException(status_code=403, detail="Access to this job denied")
+    return job
+
+
+@app.delete("/api/v1/job/{job_id}", response_model=JobStatusResponse)
+async def cancel_job(
+    job_id: str,
+    current_user = Depends(get_current_user)
+):
+    """Wartenden oder laufenden Job abbrechen (z. B. nach erneutem Upload)"""
+    try:
+        await _get_owned_job(job_id, current_user)
+
+        status = await job_queue.cancel(job_id)
+
+        if status is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        if status != "cancelled":
+            raise HTTPException(status_code=409, detail=f"Job already {status}")
+
+        # Eingebetteter Worker stoppt sofort, separate Worker beim nächsten Polling
+        if job_worker:
+            job_worker.cancel(job_id)
+        metrics.increment_counter("jobs_cancelled")
+
+        return JobStatusResponse(**await job_queue.get_job_status(job_id))
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Failed to cancel job: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to cancel job: {str(e)}")
+
+
+# Endzustände, nach denen der Event-Stream schließt
+TERMINAL_JOB_STATUSES = ("completed", "failed", "cancelled")
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def _sse_event(event: str, data: dict) -> str:
+    """Server-Sent Event formatieren"""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+async def _job_event_stream(job_id: str):
+    """Status- und Vorschau-Events eines Jobs bis zu seinem Endzustand"""
+    interval = settings.PREVIEW_STREAM_INTERVAL_MS / 1000
+    last_status = None
+    last_preview = 0.0
+    last_sent = time.monotonic()
+
+    while True:
+        status = await job_queue.get_job_status(job_id)
+        if status is None:
+            yield _sse_event("error", {"job_id": job_id, "detail": "Job not found"})
+            return
+
+        events = []
+        if (status["status"], status["progress"]) != last_status:
+            last_status = (status["status"], status["progress"])
+            events.append(_sse_event("status", status))
+
+        if preview_store and status["status"] == "processing":
+            preview = await asyncio.to_thread(preview_store.read, job_id, last_preview)
+            if preview:
+                last_preview, event = preview
+                events.append(_sse_event("preview", event))
+
+        for event in events:
+            yield event
+        if events:
+            last_sent = time.monotonic()
+        elif time.monotonic() - last_sent > SSE_KEEPALIVE_SECONDS:
+            # Kommentarzeile hält Proxies und EventSource-Verbindungen offen
+            yield ": keepalive\n\n"
+            last_sent = time.monotonic()
+
+        if status["status"] in TERMINAL_JOB_STATUSES:
+            return
+        await asyncio.sleep(interval)
+
+
+@app.get("/api/v1/job/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    current_user = Depends(get_current_user)
+):
+    """
+    Fortschritt und Zwischenbilder eines Jobs als Server-Sent Events
+
+    Events: "status" (wie /status, Fortschritt schrittgenau während der
+    Diffusion), "preview" (stage, step, steps, progress, image als
+    JPEG-Data-URL). Der Stream endet mit dem Endzustand des Jobs.
+    """
+    await _get_owned_job(job_id, current_user)
+
+    return StreamingResponse(
+        _job_event_stream(job_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@app.get("/api/v1/job/{job_id}/preview")
+async def get_job_preview(
+    job_id: str,
+    current_user = Depends(get_current_user)
+):
+    """Letztes Zwischenbild eines laufenden Jobs (für Clients ohne SSE)"""
+    await _get_owned_job(job_id, current_user)
+
+    preview = None
+    if preview_store:
+        preview = await asyncio.to_thread(preview_store.read, job_id)
+    if not preview:
+        raise HTTPException(status_code=404, detail="No preview available")
+    return preview[1]
+
+
 # Batch Processing Endpoints
 @app.post("/api/v1/process/batch")
 async def process_batch(
-    background_tasks: BackgroundTasks,
     files: List[UploadFile] = File(...),
-    processing_options: Optional[dict] = None,
+    request: ImageProcessingRequest = Depends(ImageProcessingRequest.as_form),
     current_user = Depends(get_current_user)
 ):
     """Batch-Verarbeitung mehrerer Bilder"""
@@ -396,31 +623,34 @@ async def process_batch(
                 detail=f"Batch size exceeded. Maximum {settings.MAX_BATCH_SIZE} files allowed."
             )
         
-        batch_id = await job_queue.create_batch_job()
+        # Ganzer Batch wird angenommen oder mit 429 abgelehnt
+        await job_queue.ensure_capacity(len(files))
+        
+        batch_id = await job_queue.create_batch_job(
+            user_id=current_user.get("user_id"),
+            priority=current_user.get("priority", 0)
+        )
         job_ids = []
+        rejected_files = []
         
         for file in files:
-            if not file.content_type.startswith("image/"):
-                continue  # Skip non-image files
-                
-            uploaded_file = await file_handler.save_upload(file)
+            # Ungültige Dateien überspringen statt den ganzen Batch abzulehnen
+            try:
+                uploaded_file = await upload_ingestor.ingest(file)
+            except UploadRejectedError as e:
+                metrics.increment_counter("uploads_rejected")
+                rejected_files.append({"filename": file.filename, "reason": e.detail})
+                continue
             
+            # Batch-Jobs erben die Batch-Priorität
             job_id = await job_queue.enqueue_image_processing(
                 file_path=uploaded_file.path,
-                processing_options=processing_options or {},
+                processing_options=request.dict(),
                 user_id=current_user.get("user_id"),
                 batch_id=batch_id
             )
             
             job_ids.append(job_id)
-            
-            # Background processing für jedes Bild starten
-            background_tasks.add_task(
-                ai_processor.process_image_async,
-                job_id,
-                uploaded_file.path,
-                processing_options or {}
-            )
         
         metrics.increment_counter("batch_jobs", len(job_ids))
         
@@ -430,10 +660,15 @@ async def process_batch(
             "batch_id": batch_id,
             "job_ids": job_ids,
             "total_jobs": len(job_ids),
+            "rejected_files": rejected_files,
             "status": "queued",
-            "estimated_time": len(job_ids) * 120  # 2 Min pro Bild
+            "estimated_time": len(job_ids) * _estimate_processing_time(request.dict())
         }
         
+    except JobQueueFullError as e:
+        raise _queue_full_response(e)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Batch processing failed: {e}")
         raise HTTPException(status_code=500, detail=f"Batch processing failed: {str(e)}")
@@ -450,10 +685,13 @@ async def get_admin_stats(current_user = Depends(get_current_user)):
         
         stats = await job_queue.get_queue_stats()
         system_stats = await metrics.get_system_stats()
+        # Von allen Worker-Prozessen in der Queue abgelegt (auch ohne eingebetteten Worker)
+        bucket_stats = await job_queue.get_worker_stats(BUCKET_STATS_NAME)
         
         return {
             "queue_stats": stats,
             "system_stats": system_stats,
+            "aspect_buckets": merge_bucket_stats(entry["stats"] for entry in bucket_stats),
             "ai_models": {
                 "image_processor": ai_processor.get_model_info() if ai_processor else None,
                 "content_generator": content_generator.get_model_info() if content_generator else None
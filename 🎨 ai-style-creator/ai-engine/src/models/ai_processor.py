@@ -18,36 +18,68 @@ Version: 1.0.0
 """
 
 import os
+import gc
+import time
 import asyncio
+import threading
 import torch
-import numpy as np
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Callable, Dict, List, Optional, Tuple, Any, Union
 from pathlib import Path
+from contextlib import asynccontextmanager
 from PIL import Image, ImageEnhance, ImageFilter
-import cv2
 import structlog
 
 # Hugging Face Transformers
-from transformers import pipeline, BlipProcessor, BlipForConditionalGeneration
+from transformers import BlipProcessor, BlipForConditionalGeneration
 from diffusers import (
     StableDiffusionPipeline,
     StableDiffusionImg2ImgPipeline,
     StableDiffusionControlNetPipeline,
     ControlNetModel,
     DDIMScheduler,
+    DPMSolverMultistepScheduler,
     UniPCMultistepScheduler
 )
 from controlnet_aux import CannyDetector, OpenposeDetector
 from compel import Compel
+from accelerate import cpu_offload_with_hook
 
 # Lokale Imports
 from config.settings import Settings
 from utils.image_utils import ImageProcessor
+from utils.background_removal import BackgroundRemover
+from utils.renditions import RenditionEncoder
+from utils.product_crop import CropPlan, plan_product_crop
+from utils.aspect_buckets import AspectBucketer, BucketFit, resize_to_fit
+from utils.upscaling import Upscaler
+from utils.image_features import ImageFeatures, get_image_features
+from utils.image_context import ImageContext, LEVEL_ANALYSIS, LEVEL_DIFFUSION, LEVEL_THUMBNAIL
 from utils.model_cache import ModelCache
+from utils.model_registry import acquire_blip, release_blip, get_model_registry
+from utils.result_cache import ResultCache
+from utils.inference_executor import get_inference_executor
+from utils.cancellation import CancellationToken, JobCancelled, current_token, raise_if_cancelled, step_callback
+from utils.job_progress import (
+    JobProgressReporter, PreviewStore, bind_reporter, current_reporter, unbind_reporter
+)
+from utils.job_queue import JobQueue
+from models.inference_scheduler import Img2ImgBatchScheduler, Img2ImgRequest, BatchKey
+from models.multi_prompt_img2img import encode_image_latents, run_multi_prompt_img2img
+from models.prompt_cache import PromptEmbeddingCache
+from models.latent_cache import LatentCache
+from models.quality_tiers import ExecutionPlan, SCHEDULER_DPMPP_2M, SCHEDULER_UNIPC, resolve_execution_plan
 from utils.device_manager import DeviceManager
 
 logger = structlog.get_logger()
 
+# Scheduler der Qualitätsstufen (UniPC ist der beim Laden gesetzte Standard)
+SCHEDULER_FACTORIES = {
+    SCHEDULER_UNIPC: UniPCMultistepScheduler.from_config,
+    SCHEDULER_DPMPP_2M: lambda config: DPMSolverMultistepScheduler.from_config(
+        config, algorithm_type="dpmsolver++", use_karras_sigmas=True
+    )
+}
+
 
 class FashionStylePresets:
     """
@@ -90,16 +122,20 @@ class FashionStylePresets:
     }
 
     @classmethod
-    def get_style_preset(cls, style_name: str) -> Dict[str, Any]:
-        """Style-Preset basierend auf Namen abrufen"""
-        style_map = {
+    def get_all_presets(cls) -> Dict[str, Dict[str, Any]]:
+        """Alle Style-Presets nach Namen"""
+        return {
             "studio": cls.STUDIO_PROFESSIONAL,
             "street": cls.URBAN_STREET, 
             "luxury": cls.LUXURY_PREMIUM,
             "lifestyle": cls.LIFESTYLE_CASUAL,
             "artistic": cls.ARTISTIC_CREATIVE
         }
-        return style_map.get(style_name.lower(), cls.STUDIO_PROFESSIONAL)
+
+    @classmethod
+    def get_style_preset(cls, style_name: str) -> Dict[str, Any]:
+        """Style-Preset basierend auf Namen abrufen"""
+        return cls.get_all_presets().get(style_name.lower(), cls.STUDIO_PROFESSIONAL)
 
 
 class AIStyleProcessor:
@@ -117,19 +153,104 @@ class AIStyleProcessor:
         self.settings = settings
         self.device_manager = DeviceManager(settings)
         self.model_cache = ModelCache(settings)
-        self.image_processor = ImageProcessor()
+        self.background_remover = (
+            BackgroundRemover(settings) if settings.ENABLE_BACKGROUND_REMOVAL else None
+        )
+        self.image_processor = ImageProcessor(background_remover=self.background_remover)
+        
+        # Ausgabedateien pro Ergebnis (volles JPEG, WebP, Web-Größe, Thumbnail)
+        self.rendition_encoder = RenditionEncoder(settings.OUTPUT_RENDITIONS, settings.RENDITION_WORKERS)
+        
+        # Feste Diffusionsformen (Bucket-ID gruppiert Batches)
+        self.aspect_bucketer = AspectBucketer(
+            step=settings.ASPECT_BUCKET_STEP,
+            max_ratio=settings.ASPECT_BUCKET_MAX_RATIO,
+            mode=settings.ASPECT_BUCKET_FIT
+        )
+        
+        # Zweite Stufe der zweistufigen Generierung (volle Auflösung wiederherstellen)
+        self.upscaler = Upscaler(settings)
+        
+        # Alle blockierenden Modell-Aufrufe laufen im Inferenz-Pool
+        self.inference_executor = get_inference_executor(settings)
+        
+        # Persistente Job-Queue für Status und Fortschritt (vom Worker gesetzt)
+        self.job_queue: Optional[JobQueue] = None
+        
+        # Zwischenbilder laufender Jobs (per SSE von der API ausgeliefert)
+        self.preview_store: Optional[PreviewStore] = None
+        if settings.ENABLE_STEP_PREVIEWS:
+            self.preview_store = PreviewStore(settings.PREVIEW_DIR)
         
         # Model instances
         self.sd_pipeline: Optional[StableDiffusionImg2ImgPipeline] = None
         self.controlnet_pipeline: Optional[StableDiffusionControlNetPipeline] = None
         self.blip_processor: Optional[BlipProcessor] = None
         self.blip_model: Optional[BlipForConditionalGeneration] = None
+        self._blip_device: Optional[str] = None
         
         # Processing utilities
         self.canny_detector: Optional[CannyDetector] = None
         self.pose_detector: Optional[OpenposeDetector] = None
         self.compel: Optional[Compel] = None
         
+        # Conditioning-Tensoren für die endliche Menge an Preset-Prompts
+        self.prompt_cache = PromptEmbeddingCache(settings.PROMPT_CACHE_MAX_ENTRIES)
+        
+        # VAE-Latents pro vorbereitetem Bild und Bucket (überdauern das Entladen der Pipeline)
+        self.latent_cache = LatentCache(
+            settings.LATENT_CACHE_MAX_MB,
+            settings.LATENT_CACHE_SPILL_DIR or None,
+            settings.LATENT_CACHE_SPILL_MAX_MB
+        )
+        
+        # Content-adressierter Cache für komplette Ergebnisse
+        self.result_cache: Optional[ResultCache] = None
+        if settings.ENABLE_RESULT_CACHE:
+            self.result_cache = ResultCache(
+                settings.RESULT_CACHE_DIR,
+                max_entries=settings.CACHE_MAX_SIZE,
+                max_bytes=settings.RESULT_CACHE_MAX_MB * 1024 ** 2,
+                ttl_seconds=settings.CACHE_TTL_SECONDS
+            )
+        
+        # Micro-Batching für Img2Img-Aufrufe
+        self.img2img_scheduler = Img2ImgBatchScheduler(
+            self._run_img2img_batch,
+            max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+            max_wait_ms=settings.INFERENCE_MAX_WAIT_MS
+        )
+        
+        # Modellgruppen mit Loader und Unloader (für Lazy Loading)
+        self._model_loaders = {
+            "stable_diffusion": (self._load_stable_diffusion_models, self._unload_stable_diffusion_models),
+            "image_analysis": (self._load_image_analysis_models, self._unload_image_analysis_models),
+            "controlnet": (self._load_controlnet_models, self._unload_controlnet_models),
+            "canny_detector": (self._load_canny_detector, self._unload_canny_detector),
+            "pose_detector": (self._load_pose_detector, self._unload_pose_detector),
+        }
+        self._model_locks: Dict[str, asyncio.Lock] = {name: asyncio.Lock() for name in self._model_loaders}
+        # ControlNet baut bei geteilten Komponenten auf der Img2Img-Pipeline auf
+        self._model_dependencies: Dict[str, Tuple[str, ...]] = {
+            "controlnet": ("stable_diffusion",) if settings.SHARE_PIPELINE_COMPONENTS else ()
+        }
+        self._loaded_models: set = set()
+        # Pipeline-Sichten mit anderem Scheduler (teilen alle Modellkomponenten)
+        self._scheduler_views: Dict[Tuple[str, str], Any] = {}
+        # Pipeline-Aufrufe laufen in Executor-Threads; Scheduler (set_timesteps,
+        # Step-Index) und Offload-Hooks sind zustandsbehaftet, daher ein Lauf
+        # pro Pipeline gleichzeitig. Geteilte Komponenten teilen auch die Sperre.
+        sd_lock = threading.Lock()
+        # Offload-Hooks, die nach einem Pipeline-Aufruf ausgelagert werden
+        self._offload_hooks: Dict[str, List[Any]] = {}
+        self._pipeline_locks: Dict[str, threading.Lock] = {
+            "sd_pipeline": sd_lock,
+            "controlnet_pipeline": sd_lock if settings.SHARE_PIPELINE_COMPONENTS else threading.Lock()
+        }
+        self._model_last_used: Dict[str, float] = {}
+        self._model_in_use: Dict[str, int] = {name: 0 for name in self._model_loaders}
+        self._eviction_task: Optional[asyncio.Task] = None
+        
         # Status tracking
         self._is_ready = False
         self._initialization_error: Optional[str] = None
@@ -150,11 +271,15 @@ class AIStyleProcessor:
             device = await self.device_manager.setup_device()
             logger.info(f"Using device: {device}")
             
-            # Modelle laden
-            await self._load_stable_diffusion_models()
-            await self._load_image_analysis_models()
-            await self._load_controlnet_models()
-            await self._setup_processing_utilities()
+            if self.settings.LAZY_MODEL_LOADING:
+                # Modelle werden erst bei der ersten Nutzung geladen
+                logger.info("Lazy model loading enabled - models load on first use")
+                if self.settings.MODEL_IDLE_TTL_SECONDS > 0:
+                    self._eviction_task = asyncio.create_task(self._evict_idle_models_loop())
+            else:
+                # Modelle laden
+                for name in self._model_loaders:
+                    await self._ensure_model_loaded(name)
             
             self._is_ready = True
             logger.info("✅ AI Style Processor initialization complete!")
@@ -200,6 +325,10 @@ class AIStyleProcessor:
                 text_encoder=self.sd_pipeline.text_encoder
             )
             
+            # Conditioning-Tensoren aller Preset-Prompts vorberechnen
+            warmed = self.prompt_cache.warm(self.compel, self._iter_preset_prompts())
+            logger.info(f"Prompt embedding cache warmed with {warmed} prompts")
+            
             logger.info("✅ Stable Diffusion models loaded successfully")
             
         except Exception as e:
@@ -211,20 +340,10 @@ class AIStyleProcessor:
         logger.info("Loading image analysis models...")
         
         try:
-            # BLIP für Bildanalyse und Beschreibung
-            self.blip_processor = BlipProcessor.from_pretrained(
-                self.settings.BLIP_MODEL_NAME,
-                cache_dir=self.settings.HF_CACHE_DIR
-            )
-            
-            self.blip_model = BlipForConditionalGeneration.from_pretrained(
-                self.settings.BLIP_MODEL_NAME,
-                torch_dtype=torch.float16 if self.settings.USE_HALF_PRECISION else torch.float32,
-                cache_dir=self.settings.HF_CACHE_DIR
-            )
-            
+            # BLIP für Bildanalyse und Beschreibung (prozessweit geteilt)
             device = self.device_manager.get_device()
-            self.blip_model = self.blip_model.to(device)
+            self.blip_processor, self.blip_model = acquire_blip(self.settings, device)
+            self._blip_device = device
             
             logger.info("✅ Image analysis models loaded successfully")
             
@@ -244,17 +363,47 @@ class AIStyleProcessor:
                 cache_dir=self.settings.HF_CACHE_DIR
             )
             
-            self.controlnet_pipeline = StableDiffusionControlNetPipeline.from_pretrained(
-                self.settings.SD_MODEL_NAME,
-                controlnet=controlnet,
-                torch_dtype=torch.float16 if self.settings.USE_HALF_PRECISION else torch.float32,
-                safety_checker=None,
-                requires_safety_checker=False,
-                cache_dir=self.settings.HF_CACHE_DIR
-            )
-            
             device = self.device_manager.get_device()
-            self.controlnet_pipeline = self.controlnet_pipeline.to(device)
+            
+            if self.settings.SHARE_PIPELINE_COMPONENTS:
+                # UNet, VAE, Text-Encoder und Tokenizer der Img2Img-Pipeline
+                # wiederverwenden - nur die ControlNet-Gewichte kommen hinzu
+                self.controlnet_pipeline = StableDiffusionControlNetPipeline(
+                    vae=self.sd_pipeline.vae,
+                    text_encoder=self.sd_pipeline.text_encoder,
+                    tokenizer=self.sd_pipeline.tokenizer,
+                    unet=self.sd_pipeline.unet,
+                    controlnet=controlnet,
+                    # Scheduler sind zustandsbehaftet und werden nicht geteilt
+                    scheduler=UniPCMultistepScheduler.from_config(
+                        self.sd_pipeline.scheduler.config
+                    ),
+                    safety_checker=None,
+                    feature_extractor=self.sd_pipeline.feature_extractor,
+                    requires_safety_checker=False
+                )
+                
+                if self.settings.USE_HALF_PRECISION and device != "cpu":
+                    # Die geteilten Module tragen bereits die Offload-Hooks der
+                    # Img2Img-Pipeline; ein zweites enable_model_cpu_offload()
+                    # würde sie neu hängen und beide Pipelines um die Platzierung
+                    # streiten lassen. Nur das ControlNet bekommt einen eigenen
+                    # Hook und wird nach jedem Lauf wieder ausgelagert.
+                    self.controlnet_pipeline.enable_attention_slicing()
+                    _, hook = cpu_offload_with_hook(controlnet, device)
+                    self._offload_hooks["controlnet_pipeline"] = [hook]
+                else:
+                    self.controlnet_pipeline = self.controlnet_pipeline.to(device)
+            else:
+                self.controlnet_pipeline = StableDiffusionControlNetPipeline.from_pretrained(
+                    self.settings.SD_MODEL_NAME,
+                    controlnet=controlnet,
+                    torch_dtype=torch.float16 if self.settings.USE_HALF_PRECISION else torch.float32,
+                    safety_checker=None,
+                    requires_safety_checker=False,
+                    cache_dir=self.settings.HF_CACHE_DIR
+                )
+                self.controlnet_pipeline = self.controlnet_pipeline.to(device)
             
             logger.info("✅ ControlNet models loaded successfully")
             
@@ -262,105 +411,323 @@ class AIStyleProcessor:
             logger.error(f"Failed to load ControlNet models: {e}")
             raise
 
-    async def _setup_processing_utilities(self):
-        """Setup für Bildverarbeitungs-Utilities"""
-        logger.info("Setting up processing utilities...")
+    async def _load_canny_detector(self):
+        """Setup des Canny-Preprocessors für ControlNet"""
+        self.canny_detector = CannyDetector()
+
+    async def _load_pose_detector(self):
+        """Lade Openpose-Preprocessor für ControlNet"""
+        logger.info("Loading Openpose detector...")
         
         try:
-            # ControlNet Preprocessors
-            self.canny_detector = CannyDetector()
             self.pose_detector = OpenposeDetector.from_pretrained("lllyasviel/Annotators")
-            
-            logger.info("✅ Processing utilities setup complete")
+            logger.info("✅ Openpose detector loaded successfully")
             
         except Exception as e:
-            logger.error(f"Failed to setup processing utilities: {e}")
+            logger.error(f"Failed to load Openpose detector: {e}")
             raise
 
-    async def analyze_image(self, image_path: str) -> Dict[str, Any]:
+    # ================================================
+    # Lazy Loading & Idle Eviction
+    # ================================================
+
+    async def _ensure_model_loaded(self, name: str):
+        """Lade eine Modellgruppe, falls sie noch nicht im Speicher ist"""
+        if name in self._loaded_models:
+            return
+        
+        for dependency in self._model_dependencies.get(name, ()):
+            await self._ensure_model_loaded(dependency)
+        
+        async with self._model_locks[name]:
+            # Erneut prüfen - ein paralleler Request könnte bereits geladen haben
+            if name in self._loaded_models:
+                return
+            
+            loader, _ = self._model_loaders[name]
+            start = time.perf_counter()
+            # from_pretrained blockiert - im Inferenz-Pool mit eigenem Loop laden
+            await self.inference_executor.run(asyncio.run, loader())
+            self._loaded_models.add(name)
+            self._model_last_used[name] = time.monotonic()
+            logger.info(f"Model group '{name}' warm after {time.perf_counter() - start:.1f}s")
+
+    @asynccontextmanager
+    async def _use_models(self, *names: str):
         """
-        Analysiere Produktbild und extrahiere Informationen
+        Modellgruppen für die Dauer eines Aufrufs nutzen
+        
+        Lädt fehlende Gruppen nach und schützt sie währenddessen vor Eviction.
+        """
+        # Abhängigkeiten mitnutzen, damit sie nicht vorher entladen werden
+        expanded = []
+        for name in names:
+            for dependency in self._model_dependencies.get(name, ()):
+                if dependency not in expanded:
+                    expanded.append(dependency)
+            if name not in expanded:
+                expanded.append(name)
+        
+        acquired = []
+        try:
+            for name in expanded:
+                await self._ensure_model_loaded(name)
+                self._model_in_use[name] += 1
+                acquired.append(name)
+            yield
+        finally:
+            now = time.monotonic()
+            for name in acquired:
+                self._model_in_use[name] -= 1
+                self._model_last_used[name] = now
+
+    async def _evict_idle_models_loop(self):
+        """Hintergrund-Task: ungenutzte Modelle periodisch entladen"""
+        while True:
+            await asyncio.sleep(self.settings.MODEL_EVICTION_INTERVAL_SECONDS)
+            try:
+                await self.evict_idle_models()
+            except Exception as e:
+                logger.error(f"Model eviction failed: {e}")
+
+    async def evict_idle_models(self, ttl_seconds: Optional[int] = None) -> List[str]:
+        """
+        Entlade Modellgruppen, die länger als die TTL nicht genutzt wurden
+        
+        Args:
+            ttl_seconds: Überschreibt MODEL_IDLE_TTL_SECONDS
+            
+        Returns:
+            Liste der entladenen Modellgruppen
+        """
+        ttl = self.settings.MODEL_IDLE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+        evicted = []
+        
+        for name in list(self._loaded_models):
+            if self._model_in_use[name] > 0:
+                continue
+            if self._has_loaded_dependents(name):
+                continue
+            if time.monotonic() - self._model_last_used.get(name, 0.0) < ttl:
+                continue
+            
+            async with self._model_locks[name]:
+                if name not in self._loaded_models or self._model_in_use[name] > 0:
+                    continue
+                if self._has_loaded_dependents(name):
+                    continue
+                
+                _, unloader = self._model_loaders[name]
+                await unloader()
+                self._loaded_models.discard(name)
+                evicted.append(name)
+        
+        if evicted:
+            gc.collect()
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+            logger.info(f"Evicted idle models: {', '.join(evicted)}")
+        
+        return evicted
+
+    def _has_loaded_dependents(self, name: str) -> bool:
+        """Prüfe ob eine geladene Modellgruppe von dieser Gruppe abhängt"""
+        return any(
+            name in self._model_dependencies.get(other, ())
+            for other in self._loaded_models
+        )
+
+    async def _unload_stable_diffusion_models(self):
+        """Stable Diffusion Pipeline freigeben"""
+        self.sd_pipeline = None
+        self.compel = None
+        self._drop_scheduler_views("sd_pipeline")
+        # Tensoren gehören zum entladenen Text-Encoder
+        self.prompt_cache.clear()
+
+    async def _unload_image_analysis_models(self):
+        """BLIP an die Model Registry zurückgeben"""
+        self.blip_model = None
+        self.blip_processor = None
+        release_blip(self.settings, self._blip_device)
+
+    async def _unload_controlnet_models(self):
+        """ControlNet Pipeline freigeben"""
+        self.controlnet_pipeline = None
+        self._drop_scheduler_views("controlnet_pipeline")
+        for hook in self._offload_hooks.pop("controlnet_pipeline", []):
+            hook.remove()
+
+    async def _unload_canny_detector(self):
+        """Canny-Preprocessor freigeben"""
+        self.canny_detector = None
+
+    async def _unload_pose_detector(self):
+        """Openpose-Preprocessor freigeben"""
+        self.pose_detector = None
+
+    def _drop_scheduler_views(self, pipeline_name: str):
+        """Scheduler-Sichten einer entladenen Pipeline verwerfen"""
+        for key in [key for key in self._scheduler_views if key[0] == pipeline_name]:
+            del self._scheduler_views[key]
+
+    def _pipeline_with_scheduler(self, pipeline_name: str, scheduler: str) -> Any:
+        """
+        Pipeline mit dem Scheduler eines Ausführungsplans
+        
+        Scheduler sind zustandsbehaftet; statt den Scheduler der geladenen
+        Pipeline umzuschalten, entsteht pro Scheduler eine Sicht auf dieselben
+        Modellkomponenten.
+        """
+        pipe = getattr(self, pipeline_name)
+        if scheduler == SCHEDULER_UNIPC:
+            return pipe
+        
+        key = (pipeline_name, scheduler)
+        view = self._scheduler_views.get(key)
+        if view is None:
+            view = type(pipe)(**{
+                **pipe.components,
+                "scheduler": SCHEDULER_FACTORIES[scheduler](pipe.scheduler.config)
+            })
+            self._scheduler_views[key] = view
+        return view
+
+    def get_model_status(self) -> Dict[str, Any]:
+        """Warm/Cold-Status aller Modellgruppen"""
+        now = time.monotonic()
+        return {
+            "lazy_loading": self.settings.LAZY_MODEL_LOADING,
+            "idle_ttl_seconds": self.settings.MODEL_IDLE_TTL_SECONDS,
+            "warm": sorted(self._loaded_models),
+            "cold": sorted(set(self._model_loaders) - self._loaded_models),
+            "idle_seconds": {
+                name: round(now - self._model_last_used[name], 1)
+                for name in self._loaded_models
+                if name in self._model_last_used
+            },
+            "in_use": {name: count for name, count in self._model_in_use.items() if count > 0}
+        }
+
+    async def load_image_context(self, image_path: str) -> ImageContext:
+        """
+        Upload einmal decodieren und die Auflösungspyramide aufbauen
         
         Args:
             image_path: Pfad zum Eingabebild
             
+        Returns:
+            ImageContext für alle Verarbeitungsstufen des Jobs
+        """
+        level_sizes = {
+            LEVEL_ANALYSIS: self.settings.ANALYSIS_IMAGE_SIZE,
+            LEVEL_DIFFUSION: self.settings.MAX_IMAGE_SIZE,
+            LEVEL_THUMBNAIL: self.settings.THUMBNAIL_SIZE
+        }
+        context = await self.inference_executor.run(ImageContext.load, image_path, level_sizes)
+        logger.debug(f"Image context for {image_path}: {context.levels}")
+        return context
+
+    async def _resolve_context(self, source: Union[str, ImageContext]) -> ImageContext:
+        """Pfad bei Bedarf in einen ImageContext überführen"""
+        if isinstance(source, ImageContext):
+            return source
+        return await self.load_image_context(source)
+
+    async def analyze_image(self, source: Union[str, ImageContext]) -> Dict[str, Any]:
+        """
+        Analysiere Produktbild und extrahiere Informationen
+        
+        Args:
+            source: Pfad zum Eingabebild oder bereits decodierter ImageContext
+            
         Returns:
             Dict mit Analyse-Ergebnissen
         """
         try:
-            # Bild laden und vorbereiten
-            image = Image.open(image_path).convert("RGB")
-            image = self.image_processor.resize_image(image, self.settings.MAX_IMAGE_SIZE)
+            # Analysestufe aus dem einmal decodierten Bild
+            context = await self._resolve_context(source)
+            image = context.get(LEVEL_ANALYSIS)
             
             # BLIP Analyse für Beschreibung
-            inputs = self.blip_processor(image, return_tensors="pt")
-            inputs = {k: v.to(self.device_manager.get_device()) for k, v in inputs.items()}
-            
-            with torch.no_grad():
-                generated_ids = self.blip_model.generate(**inputs, max_length=50)
-                description = self.blip_processor.decode(generated_ids[0], skip_special_tokens=True)
+            async with self._use_models("image_analysis"):
+                description = await self.inference_executor.run(self._caption_image, image)
             
-            # Bild-Eigenschaften analysieren
-            image_stats = self.image_processor.analyze_image_properties(image)
+            # Bildmerkmale einmal berechnen (am Bild memoisiert)
+            features = await self.inference_executor.run(get_image_features, image)
+            image_stats = features.as_properties()
             
             # Fashion-spezifische Analyse
-            fashion_analysis = await self._analyze_fashion_elements(image)
+            fashion_analysis = await self._analyze_fashion_elements(image, context.get(LEVEL_THUMBNAIL))
             
             analysis_result = {
                 "description": description,
                 "dimensions": image.size,
-                "format": image.format,
+                "format": context.source_format,
                 "mode": image.mode,
                 "stats": image_stats,
                 "fashion_elements": fashion_analysis,
-                "recommended_styles": self._recommend_styles(fashion_analysis),
-                "processing_suggestions": self._get_processing_suggestions(image_stats)
+                "recommended_styles": self._recommend_styles(features),
+                "processing_suggestions": self._get_processing_suggestions(features)
             }
             
-            logger.info(f"Image analysis complete for {image_path}")
+            logger.info(f"Image analysis complete for {context.source_path}")
             return analysis_result
             
         except Exception as e:
             logger.error(f"Image analysis failed: {e}")
             raise
 
-    async def _analyze_fashion_elements(self, image: Image.Image) -> Dict[str, Any]:
+    def _caption_image(self, image: Image.Image) -> str:
+        """BLIP-Bildbeschreibung erzeugen (blockierend)"""
+        inputs = self.blip_processor(image, return_tensors="pt")
+        inputs = {k: v.to(self.device_manager.get_device()) for k, v in inputs.items()}
+        
+        with torch.no_grad():
+            generated_ids = self.blip_model.generate(**inputs, max_length=50)
+            return self.blip_processor.decode(generated_ids[0], skip_special_tokens=True)
+
+    async def _analyze_fashion_elements(
+        self, 
+        image: Image.Image, 
+        color_image: Optional[Image.Image] = None
+    ) -> Dict[str, Any]:
         """Analysiere Fashion-spezifische Elemente"""
         try:
-            # Verwende Bildverarbeitungsalgorithmen für Fashion-Analyse
-            image_np = np.array(image)
-            
-            # Farbanalyse
-            colors = self.image_processor.extract_dominant_colors(image, num_colors=5)
-            
-            # Textur-Analyse (vereinfacht)
-            gray = cv2.cvtColor(image_np, cv2.COLOR_RGB2GRAY)
-            texture_variance = cv2.Laplacian(gray, cv2.CV_64F).var()
-            
-            # Kantenerkennung für Strukturanalyse
-            edges = cv2.Canny(gray, 50, 150)
-            edge_density = np.sum(edges > 0) / edges.size
-            
-            return {
-                "dominant_colors": colors,
-                "texture_complexity": float(texture_variance),
-                "edge_density": float(edge_density),
-                "brightness": float(np.mean(gray)),
-                "contrast": float(np.std(gray))
-            }
+            return await self.inference_executor.run(self._compute_fashion_elements, image, color_image)
             
         except Exception as e:
             logger.error(f"Fashion element analysis failed: {e}")
             return {}
 
-    def _recommend_styles(self, fashion_analysis: Dict[str, Any]) -> List[str]:
-        """Empfehle geeignete Styles basierend auf Fashion-Analyse"""
+    def _compute_fashion_elements(
+        self, 
+        image: Image.Image, 
+        color_image: Optional[Image.Image] = None
+    ) -> Dict[str, Any]:
+        """Fashion-Elemente mit Bildverarbeitungsalgorithmen berechnen (blockierend)"""
+        features = get_image_features(image)
+        
+        # Farbanalyse (die Palette braucht nur eine kleine Stufe)
+        colors = self.image_processor.extract_dominant_colors(color_image or image, num_colors=5)
+        
+        return {
+            "dominant_colors": colors,
+            # Textur-Analyse (Laplacian-Varianz) und Kantendichte für Strukturanalyse
+            "texture_complexity": features.sharpness,
+            "edge_density": features.edge_density,
+            "brightness": features.brightness,
+            "contrast": features.contrast
+        }
+
+    def _recommend_styles(self, features: ImageFeatures) -> List[str]:
+        """Empfehle geeignete Styles basierend auf den Bildmerkmalen"""
         recommendations = []
         
         # Einfache Regel-basierte Empfehlungen
-        edge_density = fashion_analysis.get("edge_density", 0)
-        brightness = fashion_analysis.get("brightness", 0)
-        contrast = fashion_analysis.get("contrast", 0)
+        edge_density = features.edge_density
+        brightness = features.brightness
+        contrast = features.contrast
         
         # Studio-Style für klare, einfache Produkte
         if edge_density < 0.1 and brightness > 150:
@@ -379,14 +746,14 @@ class AIStyleProcessor:
         
         return recommendations
 
-    def _get_processing_suggestions(self, image_stats: Dict[str, Any]) -> Dict[str, bool]:
+    def _get_processing_suggestions(self, features: ImageFeatures) -> Dict[str, bool]:
         """Verarbeitungsvorschläge basierend auf Bildstatistiken"""
         return {
-            "enhance_colors": image_stats.get("saturation", 0) < 100,
-            "improve_lighting": image_stats.get("brightness", 0) < 120,
-            "increase_contrast": image_stats.get("contrast", 0) < 40,
-            "remove_noise": image_stats.get("noise_level", 0) > 0.1,
-            "sharpen_details": image_stats.get("sharpness", 0) < 50
+            "enhance_colors": features.saturation < 100,
+            "improve_lighting": features.brightness < 120,
+            "increase_contrast": features.contrast < 40,
+            "remove_noise": features.noise_level > 0.1,
+            "sharpen_details": features.sharpness < 50
         }
 
     async def process_image_async(
@@ -404,30 +771,94 @@ class AIStyleProcessor:
             processing_options: Verarbeitungsoptionen
         """
         try:
-            logger.info(f"Starting async image processing for job {job_id}")
-            
-            # Analysiere Bild
-            analysis = await self.analyze_image(image_path)
-            
-            # Verarbeite mit gewähltem Style
-            style = processing_options.get("style", "studio")
-            results = await self.enhance_image(image_path, style, processing_options)
-            
-            # Speichere Ergebnisse
-            await self._save_processing_results(job_id, results, analysis)
+            summary = await self.run_image_job(job_id, image_path, processing_options)
             
             # Job als abgeschlossen markieren
-            await self._update_job_status(job_id, "completed", results)
-            
-            logger.info(f"Image processing completed for job {job_id}")
+            await self._update_job_status(job_id, "completed", summary)
             
         except Exception as e:
             logger.error(f"Image processing failed for job {job_id}: {e}")
             await self._update_job_status(job_id, "failed", {"error": str(e)})
 
-    async def enhance_image(
+    async def run_image_job(
         self, 
+        job_id: str, 
         image_path: str, 
+        processing_options: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Bildverarbeitungs-Job ausführen (vom Worker aufgerufen)
+        
+        Fehler werden nicht abgefangen, damit der Worker über Retry
+        oder endgültiges Scheitern entscheiden kann.
+        
+        Returns:
+            JSON-serialisierbare Zusammenfassung mit gespeicherten Dateien
+        """
+        logger.info(f"Starting async image processing for job {job_id}")
+        
+        # Upload einmal decodieren; alle Stufen lesen aus dem Kontext
+        await self._update_job_status(job_id, "processing", {"progress": 10})
+        raise_if_cancelled()
+        context = await self.load_image_context(image_path)
+        
+        # Analyse und Verarbeitung mit gewähltem Style
+        await self._update_job_status(job_id, "processing", {"progress": 30})
+        raise_if_cancelled()
+        style = processing_options.get("style", "studio")
+        
+        # Diffusionsschritte melden Fortschritt (30-90 %) und Vorschauen
+        reporter = JobProgressReporter(
+            job_id,
+            publish_progress=lambda progress: self._update_job_status(job_id, "processing", {"progress": progress}),
+            preview_store=self.preview_store,
+            preview_every=self.settings.PREVIEW_EVERY_N_STEPS,
+            preview_size=self.settings.PREVIEW_SIZE
+        )
+        binding = bind_reporter(reporter)
+        try:
+            if self.settings.OVERLAP_ANALYSIS_AND_ENHANCEMENT:
+                # BLIP-Captioning überlappt mit der Diffusion
+                analysis, results = await self._run_concurrently(
+                    self.analyze_image(context),
+                    self.enhance_image(context, style, processing_options)
+                )
+            else:
+                analysis = await self.analyze_image(context)
+                results = await self.enhance_image(context, style, processing_options)
+        finally:
+            unbind_reporter(binding)
+            await self.inference_executor.run(reporter.close)
+        
+        # Speichere Ergebnisse
+        await self._update_job_status(job_id, "processing", {"progress": 90})
+        raise_if_cancelled()
+        saved_files, renditions = await self._save_processing_results(job_id, results, analysis)
+        
+        logger.info(f"Image processing completed for job {job_id}")
+        
+        return {
+            "files": saved_files,
+            "renditions": renditions,
+            "metadata": results.get("metadata", {}),
+            "analysis": analysis
+        }
+
+    @staticmethod
+    async def _run_concurrently(*coroutines) -> List[Any]:
+        """Coroutines parallel ausführen; bei einem Fehler die übrigen abbrechen"""
+        tasks = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+    async def enhance_image(
+        self, 
+        source: Union[str, ImageContext], 
         style: str = "studio", 
         options: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
@@ -435,7 +866,7 @@ class AIStyleProcessor:
         Verbessere Produktbild mit KI-Modellen
         
         Args:
-            image_path: Pfad zum Eingabebild
+            source: Pfad zum Eingabebild oder bereits decodierter ImageContext
             style: Gewünschter Style (studio, street, luxury, lifestyle, artistic)
             options: Zusätzliche Verarbeitungsoptionen
             
@@ -445,12 +876,36 @@ class AIStyleProcessor:
         try:
             options = options or {}
             
-            # Bild laden und vorbereiten
-            original_image = Image.open(image_path).convert("RGB")
-            processed_image = self.image_processor.prepare_for_processing(
-                original_image, 
-                self.settings.MAX_IMAGE_SIZE
-            )
+            # Diffusionsstufe aus dem einmal decodierten Bild vorbereiten
+            context = await self._resolve_context(source)
+            processed_image = await self.inference_executor.run(self._prepare_diffusion_image, context)
+            smart_crop = options.get("smart_crop")
+            if smart_crop is None:
+                smart_crop = self.settings.ENABLE_PRODUCT_CROP
+            
+            # Qualitätsstufe bestimmt Schritte, Scheduler, Auflösung und Umfang
+            plan = resolve_execution_plan(options.get("quality"), options)
+            
+            # Zweistufig: Diffusion in reduzierter Auflösung, danach Upscaler
+            two_stage = options.get("two_stage")
+            if two_stage is None:
+                two_stage = self.settings.TWO_STAGE_DIFFUSION
+            upscaler = self.upscaler.resolve_method(options.get("upscaler")) if two_stage else None
+            
+            # Identische Eingaben liefern dank festem Seed identische Ergebnisse
+            cache_keys = None
+            if self.result_cache:
+                cache_keys = await self.inference_executor.run(
+                    self.result_cache.make_keys,
+                    processed_image, 
+                    style, 
+                    {**options, "smart_crop": smart_crop, "quality": plan.tier, "upscaler": upscaler}, 
+                    self._get_model_versions()
+                )
+                cached = await self.inference_executor.run(self.result_cache.get, *cache_keys)
+                if cached:
+                    logger.info(f"Image enhancement served from result cache (style: {style})")
+                    return cached
             
             # Style-Preset abrufen
             style_preset = FashionStylePresets.get_style_preset(style)
@@ -458,60 +913,204 @@ class AIStyleProcessor:
             # Prompt für Fashion-Verbesserung erstellen
             base_prompt = self._create_fashion_prompt(style_preset, options)
             
+            # Optional nur den Produktausschnitt in nativer Modellauflösung diffundieren
+            crop_plan = None
+            diffusion_image = processed_image
+            if smart_crop:
+                crop_plan = await self.inference_executor.run(self._plan_product_crop, processed_image)
+                if crop_plan:
+                    diffusion_image = await self.inference_executor.run(crop_plan.crop, processed_image)
+            
+            # In den nächstgelegenen Auflösungs-Bucket einpassen (zweistufig
+            # verkleinert der Bucket auf TWO_STAGE_RESOLUTION)
+            bucket_fit = None
+            bucketed = self.settings.ENABLE_ASPECT_BUCKETS or two_stage
+            unbucketed_image = diffusion_image
+            long_side = plan.diffusion_size(
+                self.settings.DIFFUSION_NATIVE_SIZE if crop_plan else self.settings.MAX_IMAGE_SIZE
+            )
+            if two_stage:
+                long_side = min(long_side, self.settings.TWO_STAGE_RESOLUTION)
+            if bucketed:
+                bucket_fit = await self.inference_executor.run(self.aspect_bucketer.fit, diffusion_image, long_side)
+            elif max(diffusion_image.size) > long_side:
+                # Ohne Buckets gilt die Auflösung der Qualitätsstufe über eine einfache Verkleinerung
+                bucket_fit = await self.inference_executor.run(resize_to_fit, diffusion_image, long_side)
+            if bucket_fit:
+                diffusion_image = bucket_fit.image
+            
+            # Erwartete Denoising-Schritte für schrittgenauen Fortschritt
+            reporter = current_reporter()
+            if reporter:
+                reporter.set_stages(self._diffusion_stages(plan, style, style_preset))
+            
             # Verschiedene Verarbeitungsansätze
             results = {}
             
             # 1. Standard Img2Img mit Style Transfer
             enhanced_image = await self._enhance_with_img2img(
-                processed_image, 
+                diffusion_image, 
                 base_prompt, 
-                style_preset
+                style_preset,
+                plan
             )
             results["enhanced"] = enhanced_image
             
             # 2. ControlNet für strukturelle Erhaltung (optional)
-            if options.get("preserve_structure", True):
+            if plan.run_controlnet:
+                raise_if_cancelled()
                 controlled_image = await self._enhance_with_controlnet(
-                    processed_image, 
+                    diffusion_image, 
                     base_prompt, 
-                    style_preset
+                    style_preset,
+                    plan
                 )
                 results["controlled"] = controlled_image
             
             # 3. Multiple Varianten (wenn gewünscht)
-            if options.get("generate_variants", False):
+            if plan.num_variants:
+                raise_if_cancelled()
                 variants = await self._generate_style_variants(
-                    processed_image, 
+                    diffusion_image, 
                     style, 
-                    num_variants=3
+                    num_variants=plan.num_variants,
+                    plan=plan
                 )
                 results["variants"] = variants
             
-            # 4. Post-Processing-Verbesserungen
-            for key, image in results.items():
-                if isinstance(image, Image.Image):
-                    results[key] = self.image_processor.post_process_image(
-                        image, 
-                        options
-                    )
+            # Bucket-Anpassung umkehren und Ausschnitte vor dem Post-Processing zurücksetzen
+            if bucket_fit or crop_plan:
+                results = await self.inference_executor.run(
+                    self._restore_diffusion_results, 
+                    results, 
+                    bucket_fit, 
+                    unbucketed_image, 
+                    crop_plan, 
+                    processed_image, 
+                    upscaler
+                )
+            
+            # 4. Post-Processing-Verbesserungen (alle Ergebnisse inkl. Varianten)
+            results = await self.inference_executor.run(
+                self._post_process_results, results, plan.post_processing_options(options)
+            )
             
             # Metadaten hinzufügen
             results["metadata"] = {
-                "original_size": original_image.size,
+                "original_size": context.source_size,
                 "processed_size": processed_image.size,
                 "style": style,
                 "style_preset": style_preset,
                 "processing_options": options,
+                "product_crop": crop_plan.as_metadata(context.source_size) if crop_plan else None,
+                "aspect_bucket": bucket_fit.bucket.id if bucket_fit and bucketed else None,
+                "quality_tier": plan.tier,
+                "two_stage": {
+                    "diffusion_size": bucket_fit.bucket.size,
+                    "upscaler": upscaler
+                } if upscaler else None,
                 "timestamp": asyncio.get_event_loop().time()
             }
             
+            if cache_keys:
+                await self.inference_executor.run(self.result_cache.put, *cache_keys, results)
+            
             logger.info(f"Image enhancement completed with style: {style}")
             return results
             
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.error(f"Image enhancement failed: {e}")
             raise
 
+    def _plan_product_crop(self, image: Image.Image) -> Optional[CropPlan]:
+        """Produktausschnitt für die Diffusion bestimmen (blockierend)"""
+        crop_plan = plan_product_crop(
+            image,
+            self.image_processor.detect_product_bounds(image),
+            native_size=self.settings.DIFFUSION_NATIVE_SIZE,
+            padding=self.settings.PRODUCT_CROP_PADDING,
+            min_area_ratio=self.settings.PRODUCT_CROP_MIN_AREA_RATIO,
+            max_area_ratio=self.settings.PRODUCT_CROP_MAX_AREA_RATIO
+        )
+        if crop_plan:
+            logger.info(
+                f"Diffusing product crop {crop_plan.box} at {crop_plan.diffusion_size} "
+                f"({crop_plan.area_ratio:.0%} of frame)"
+            )
+        return crop_plan
+
+    @staticmethod
+    def _map_result_images(
+        results: Dict[str, Any], 
+        transform: Callable[[Image.Image], Image.Image]
+    ) -> Dict[str, Any]:
+        """Transformation auf jedes Ergebnisbild anwenden, auch in Listen"""
+        mapped = {}
+        for key, value in results.items():
+            if isinstance(value, Image.Image):
+                mapped[key] = transform(value)
+            elif isinstance(value, list):
+                mapped[key] = [
+                    transform(item) if isinstance(item, Image.Image) else item
+                    for item in value
+                ]
+            else:
+                mapped[key] = value
+        return mapped
+
+    def _restore_diffusion_results(
+        self, 
+        results: Dict[str, Any], 
+        bucket_fit: Optional[BucketFit], 
+        bucket_source: Image.Image, 
+        crop_plan: Optional[CropPlan], 
+        frame: Image.Image, 
+        upscaler: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Bucket-Anpassung umkehren und Ausschnitte auf den Hintergrund setzen (blockierend)"""
+        if bucket_fit:
+            # Zweistufig stellt der Upscaler statt Lanczos die Auflösung wieder her
+            upscale = (
+                (lambda content, source: self.upscaler.upscale(content, source, upscaler))
+                if upscaler else None
+            )
+            results = self._map_result_images(
+                results, 
+                lambda image: bucket_fit.restore(image, bucket_source, upscale)
+            )
+        if crop_plan:
+            background = crop_plan.make_background(frame, self.settings.PRODUCT_CROP_BACKGROUND)
+            results = self._map_result_images(results, lambda image: crop_plan.composite(image, background))
+        return results
+
+    def _post_process_results(self, results: Dict[str, Any], options: Dict[str, Any]) -> Dict[str, Any]:
+        """Post-Processing auf jedes Ergebnisbild anwenden, auch in Listen (blockierend)"""
+        return self._map_result_images(
+            results, 
+            lambda image: self.image_processor.post_process_image(image, options)
+        )
+
+    def _prepare_diffusion_image(self, context: ImageContext) -> Image.Image:
+        """Diffusionsstufe einmal pro Kontext für die KI vorbereiten (blockierend)"""
+        return context.derive(
+            "prepared_for_diffusion",
+            lambda: self.image_processor.prepare_for_processing(
+                context.get(LEVEL_DIFFUSION), 
+                self.settings.MAX_IMAGE_SIZE
+            )
+        )
+
+    def _get_model_versions(self) -> Dict[str, Any]:
+        """Modell- und Pipeline-Versionen für den Result-Cache-Schlüssel"""
+        return {
+            "app": self.settings.VERSION,
+            "sd_model": self.settings.SD_MODEL_NAME,
+            "controlnet_model": self.settings.SD_CONTROLNET_MODEL,
+            "half_precision": self.settings.USE_HALF_PRECISION
+        }
+
     def _create_fashion_prompt(
         self, 
         style_preset: Dict[str, Any], 
@@ -536,63 +1135,207 @@ class AIStyleProcessor:
         
         return base_prompt
 
+    def _iter_preset_prompts(self):
+        """Alle Prompts aus Presets × Options-Kombinationen"""
+        option_keys = ("enhance_colors", "improve_lighting", "high_quality")
+        
+        for preset in FashionStylePresets.get_all_presets().values():
+            yield preset["negative"]
+            for mask in range(2 ** len(option_keys)):
+                options = {key: bool(mask & (1 << i)) for i, key in enumerate(option_keys)}
+                yield self._create_fashion_prompt(preset, options)
+
     async def _enhance_with_img2img(
         self, 
         image: Image.Image, 
         prompt: str, 
-        style_preset: Dict[str, Any]
+        style_preset: Dict[str, Any],
+        plan: Optional[ExecutionPlan] = None
     ) -> Image.Image:
         """Verbessere Bild mit Stable Diffusion Img2Img"""
         try:
-            # Prompt durch Compel verarbeiten für bessere Qualität
-            conditioning = self.compel.build_conditioning_tensor(prompt)
-            negative_conditioning = self.compel.build_conditioning_tensor(
-                style_preset["negative"]
-            )
-            
-            # Generierung mit optimierten Parametern
-            with torch.no_grad():
-                result = self.sd_pipeline(
-                    prompt_embeds=conditioning,
-                    negative_prompt_embeds=negative_conditioning,
-                    image=image,
+            plan = plan or resolve_execution_plan(None)
+            async with self._use_models("stable_diffusion"):
+                # Prompt durch Compel verarbeiten (gecacht) für bessere Qualität
+                conditioning, negative_conditioning = await self.inference_executor.run(
+                    self._get_conditioning,
+                    prompt,
+                    style_preset["negative"]
+                )
+                
+                # Generierung über den Micro-Batching-Scheduler
+                return await self.img2img_scheduler.submit(
+                    image,
+                    conditioning,
+                    negative_conditioning,
                     strength=style_preset["style_strength"],
                     guidance_scale=style_preset["guidance_scale"],
-                    num_inference_steps=30,  # Kompromiss zwischen Qualität und Geschwindigkeit
-                    generator=torch.manual_seed(42)  # Konsistente Ergebnisse
+                    num_inference_steps=plan.img2img_steps,
+                    scheduler=plan.scheduler,
+                    seed=42  # Konsistente Ergebnisse
                 )
             
-            return result.images[0]
-            
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.error(f"Img2Img enhancement failed: {e}")
             raise
 
+    async def _run_img2img_batch(
+        self, 
+        key: BatchKey, 
+        requests: List[Img2ImgRequest]
+    ) -> List[Image.Image]:
+        """Führe mehrere Img2Img-Anfragen als einen Denoising-Lauf aus"""
+        strength, guidance_scale, num_inference_steps, scheduler, _ = key
+        
+        # Positive und negative Embeddings auf gleiche Token-Länge bringen
+        embeddings = self.compel.pad_conditioning_tensors_to_same_length(
+            [r.prompt_embeds for r in requests] + [r.negative_prompt_embeds for r in requests]
+        )
+        prompt_embeds = torch.cat(embeddings[:len(requests)])
+        negative_prompt_embeds = torch.cat(embeddings[len(requests):])
+        
+        # Ein Generator pro Bild hält die Ergebnisse unabhängig von der Batch-Größe
+        generators = [torch.Generator().manual_seed(r.seed) for r in requests]
+        
+        # Gecachte Latents (4 Kanäle) überspringen den VAE-Encode der Pipeline
+        image_latents = await self.inference_executor.run(
+            self._get_batch_latents, [r.image for r in requests]
+        )
+        
+        result = await self.inference_executor.run(
+            self._call_pipeline,
+            "sd_pipeline",
+            scheduler,
+            prompt_embeds=prompt_embeds,
+            negative_prompt_embeds=negative_prompt_embeds,
+            image=image_latents,
+            strength=strength,
+            guidance_scale=guidance_scale,
+            num_inference_steps=num_inference_steps,
+            generator=generators,
+            # Abbruch nach dem nächsten Schritt, sobald kein Job mehr wartet
+            callback_on_step_end=self._step_callback(
+                "enhanced", [r.token for r in requests], [r.reporter for r in requests]
+            )
+        )
+        
+        return result.images
+
+    def _get_image_latents(self, image: Image.Image) -> torch.Tensor:
+        """VAE-Latents des vorbereiteten Bildes (Encoder läuft nur bei Cache-Miss, blockierend)"""
+        model_tag = f"{self.settings.SD_MODEL_NAME}:{self.sd_pipeline.vae.dtype}"
+        return self.latent_cache.get_or_encode(
+            LatentCache.make_key(image, model_tag),
+            lambda: encode_image_latents(self.sd_pipeline, image)
+        )
+
+    def _get_batch_latents(self, images: List[Image.Image]) -> torch.Tensor:
+        """Latents eines Img2Img-Batches (N, 4, H/8, W/8) (blockierend)"""
+        return torch.cat([self._get_image_latents(image) for image in images])
+
+    def _get_conditioning(self, prompt: str, negative_prompt: str) -> Tuple[Any, Any]:
+        """Positives und negatives Conditioning (Text-Encoder läuft nur bei Cache-Miss)"""
+        return (
+            self.prompt_cache.get_or_build(self.compel, prompt),
+            self.prompt_cache.get_or_build(self.compel, negative_prompt)
+        )
+
+    def _call_pipeline(self, pipeline_name: str, scheduler: str, **kwargs: Any) -> Any:
+        """
+        Diffusers-Pipeline ohne Gradienten aufrufen (blockierend)
+        
+        Wartet auf laufende Aufrufe derselben Pipeline; ein inzwischen
+        abgebrochener Job bricht spätestens nach dem ersten Schritt ab.
+        """
+        with self._pipeline_locks[pipeline_name]:
+            pipe = self._pipeline_with_scheduler(pipeline_name, scheduler)
+            try:
+                with torch.no_grad():
+                    return pipe(**kwargs)
+            finally:
+                for hook in self._offload_hooks.get(pipeline_name, ()):
+                    hook.offload()
+
+    @staticmethod
+    def _step_callback(
+        stage: str,
+        tokens: List[Optional[CancellationToken]],
+        reporters: List[Optional[JobProgressReporter]]
+    ) -> Optional[Callable]:
+        """
+        callback_on_step_end für einen Denoising-Lauf
+
+        Prüft den Abbruch und meldet Fortschritt und Vorschau an die Jobs,
+        Sample i des Laufs gehört zu tokens[i] / reporters[i].
+        """
+        check_cancelled = step_callback(tokens)
+        previews = [(index, reporter) for index, reporter in enumerate(reporters) if reporter]
+        if check_cancelled is None and not previews:
+            return None
+        
+        def _callback(pipe: Any, step: int, timestep: Any, callback_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+            if check_cancelled:
+                check_cancelled(pipe, step, timestep, callback_kwargs)
+            latents = callback_kwargs["latents"]
+            for index, reporter in previews:
+                reporter.on_step(stage, step, latents[index])
+            return callback_kwargs
+        
+        return _callback
+
+    def _diffusion_stages(
+        self, 
+        plan: ExecutionPlan, 
+        style: str, 
+        style_preset: Dict[str, Any]
+    ) -> Dict[str, int]:
+        """Erwartete Denoising-Schritte pro Stufe (Img2Img rechnet nur strength * Schritte)"""
+        def img2img_steps(strength: float) -> int:
+            return min(int(plan.img2img_steps * strength), plan.img2img_steps)
+        
+        stages = {"enhanced": img2img_steps(style_preset["style_strength"])}
+        if plan.run_controlnet:
+            stages["controlled"] = plan.controlnet_steps
+        presets = self._variant_presets(style, plan.num_variants) if plan.num_variants else []
+        if presets:
+            stages["variants"] = img2img_steps(sum(p["style_strength"] for p in presets) / len(presets))
+        return stages
+
     async def _enhance_with_controlnet(
         self, 
         image: Image.Image, 
         prompt: str, 
-        style_preset: Dict[str, Any]
+        style_preset: Dict[str, Any],
+        plan: Optional[ExecutionPlan] = None
     ) -> Image.Image:
         """Verbessere Bild mit ControlNet für strukturelle Kontrolle"""
         try:
-            # Canny-Edges für strukturelle Kontrolle erstellen
-            canny_image = self.canny_detector(image)
-            
-            # ControlNet-Pipeline verwenden
-            with torch.no_grad():
-                result = self.controlnet_pipeline(
+            plan = plan or resolve_execution_plan(None)
+            async with self._use_models("controlnet", "canny_detector"):
+                # Canny-Edges für strukturelle Kontrolle erstellen
+                canny_image = await self.inference_executor.run(self.canny_detector, image)
+                
+                # ControlNet-Pipeline verwenden
+                result = await self.inference_executor.run(
+                    self._call_pipeline,
+                    "controlnet_pipeline",
+                    plan.scheduler,
                     prompt=prompt,
                     negative_prompt=style_preset["negative"],
                     image=canny_image,
-                    num_inference_steps=25,
+                    num_inference_steps=plan.controlnet_steps,
                     guidance_scale=style_preset["guidance_scale"],
                     controlnet_conditioning_scale=0.8,  # Strukturelle Kontrolle
-                    generator=torch.manual_seed(42)
+                    generator=torch.manual_seed(42),
+                    callback_on_step_end=self._step_callback("controlled", [current_token()], [current_reporter()])
                 )
             
             return result.images[0]
             
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.error(f"ControlNet enhancement failed: {e}")
             raise
@@ -601,52 +1344,117 @@ class AIStyleProcessor:
         self, 
         image: Image.Image, 
         base_style: str, 
-        num_variants: int = 3
+        num_variants: int = 3,
+        plan: Optional[ExecutionPlan] = None
     ) -> List[Image.Image]:
-        """Generiere multiple Style-Varianten"""
-        variants = []
+        """
+        Generiere multiple Style-Varianten in einem gebatchten Diffusion-Lauf
         
+        Das Eingabebild wird einmal encodiert; Prompt-Embeddings und
+        Guidance-Scale gelten pro Variante. Die Varianten teilen sich einen
+        Denoising-Plan mit der mittleren Style-Stärke der gewählten Presets.
+        """
         try:
-            # Verschiedene Styles ausprobieren
-            available_styles = ["studio", "street", "luxury", "lifestyle", "artistic"]
-            
-            # Base-Style ausschließen und zufällige Auswahl
-            other_styles = [s for s in available_styles if s != base_style]
-            selected_styles = other_styles[:num_variants]
-            
-            for style in selected_styles:
-                style_preset = FashionStylePresets.get_style_preset(style)
-                prompt = self._create_fashion_prompt(style_preset, {})
-                
-                variant = await self._enhance_with_img2img(image, prompt, style_preset)
-                variants.append(variant)
+            presets = self._variant_presets(base_style, num_variants)
+            if not presets:
+                return []
+            
+            plan = plan or resolve_execution_plan(None)
+            
+            async with self._use_models("stable_diffusion"):
+                variants = await self.inference_executor.run(
+                    self._run_style_variants,
+                    image,
+                    presets,
+                    plan,
+                    # Vorschau zeigt die erste Variante
+                    self._step_callback("variants", [current_token()], [current_reporter()])
+                )
             
             return variants
             
+        except JobCancelled:
+            raise
         except Exception as e:
             logger.error(f"Style variant generation failed: {e}")
             return []
 
+    @staticmethod
+    def _variant_presets(base_style: str, num_variants: int) -> List[Dict[str, Any]]:
+        """Presets der Style-Varianten (alle Styles außer dem gewählten)"""
+        # Verschiedene Styles ausprobieren
+        available_styles = ["studio", "street", "luxury", "lifestyle", "artistic"]
+        
+        # Base-Style ausschließen und zufällige Auswahl
+        other_styles = [s for s in available_styles if s != base_style]
+        return [FashionStylePresets.get_style_preset(style) for style in other_styles[:num_variants]]
+
+    def _run_style_variants(
+        self, 
+        image: Image.Image, 
+        presets: List[Dict[str, Any]],
+        plan: ExecutionPlan,
+        callback_on_step_end: Optional[Callable] = None
+    ) -> List[Image.Image]:
+        """Gebatchter Varianten-Lauf (blockierend)"""
+        positive = [
+            self.prompt_cache.get_or_build(self.compel, self._create_fashion_prompt(preset, {}))
+            for preset in presets
+        ]
+        negative = [
+            self.prompt_cache.get_or_build(self.compel, preset["negative"])
+            for preset in presets
+        ]
+        embeddings = self.compel.pad_conditioning_tensors_to_same_length(positive + negative)
+        
+        return run_multi_prompt_img2img(
+            self._pipeline_with_scheduler("sd_pipeline", plan.scheduler),
+            image,
+            prompt_embeds=torch.cat(embeddings[:len(presets)]),
+            negative_prompt_embeds=torch.cat(embeddings[len(presets):]),
+            guidance_scales=[preset["guidance_scale"] for preset in presets],
+            strength=sum(preset["style_strength"] for preset in presets) / len(presets),
+            num_inference_steps=plan.img2img_steps,
+            generators=[torch.Generator().manual_seed(42) for _ in presets],
+            image_latents=self._get_image_latents(image),
+            callback_on_step_end=callback_on_step_end
+        )
+
     async def _save_processing_results(
         self, 
         job_id: str, 
         results: Dict[str, Any], 
         analysis: Dict[str, Any]
-    ):
-        """Speichere Verarbeitungsergebnisse"""
+    ) -> Tuple[Dict[str, str], Dict[str, Dict[str, str]]]:
+        """
+        Speichere Verarbeitungsergebnisse
+        
+        Returns:
+            Tuple aus (Ergebnis -> primäre Datei, Ergebnis -> {Rendition -> Datei})
+        """
         try:
             # Erstelle Ausgabeverzeichnis
             output_dir = Path(self.settings.PROCESSED_DIR) / job_id
             output_dir.mkdir(parents=True, exist_ok=True)
             
-            # Speichere alle verarbeiteten Bilder
-            saved_files = {}
-            for key, image in results.items():
-                if isinstance(image, Image.Image):
-                    filename = f"{key}.jpg"
-                    filepath = output_dir / filename
-                    image.save(filepath, "JPEG", quality=95, optimize=True)
-                    saved_files[key] = str(filepath)
+            # Alle Ergebnisbilder inkl. Varianten einsammeln
+            images = {}
+            for key, value in results.items():
+                if isinstance(value, Image.Image):
+                    images[key] = value
+                elif isinstance(value, list):
+                    for index, item in enumerate(value, 1):
+                        if isinstance(item, Image.Image):
+                            images[f"{key}_{index}"] = item
+            
+            # Renditions parallel im Prozess-Pool encodieren und schreiben
+            renditions = await self.rendition_encoder.encode(images, output_dir)
+            
+            # Primäre Datei pro Ergebnis (erste konfigurierte Rendition)
+            saved_files = {
+                key: next(iter(files.values()))
+                for key, files in renditions.items() if files
+            }
             
             # Speichere Metadaten und Analyse
             metadata = {
@@ -654,6 +1462,7 @@ class AIStyleProcessor:
                 "results": results.get("metadata", {}),
                 "analysis": analysis,
                 "saved_files": saved_files,
+                "renditions": renditions,
                 "timestamp": asyncio.get_event_loop().time()
             }
             
@@ -663,6 +1472,7 @@ class AIStyleProcessor:
                 json.dump(metadata, f, indent=2, default=str)
             
             logger.info(f"Processing results saved for job {job_id}")
+            return saved_files, renditions
             
         except Exception as e:
             logger.error(f"Failed to save processing results: {e}")
@@ -674,10 +1484,16 @@ class AIStyleProcessor:
         status: str, 
         result_data: Optional[Dict[str, Any]] = None
     ):
-        """Update Job-Status in der Datenbank"""
+        """Update Job-Status in der Job-Queue"""
         try:
-            # Hier würde die Integration mit der Job-Queue erfolgen
-            # Vereinfachte Implementierung für jetzt
+            if self.job_queue:
+                if status == "processing":
+                    await self.job_queue.update_progress(job_id, (result_data or {}).get("progress", 0))
+                elif status == "completed":
+                    await self.job_queue.complete(job_id, result_data or {})
+                elif status == "failed":
+                    await self.job_queue.fail(job_id, (result_data or {}).get("error", "unknown error"))
+            
             logger.info(f"Job {job_id} status updated to: {status}")
             
         except Exception as e:
@@ -695,7 +1511,18 @@ class AIStyleProcessor:
             "blip_model": self.settings.BLIP_MODEL_NAME,
             "device": self.device_manager.get_device(),
             "ready": self._is_ready,
-            "error": self._initialization_error
+            "error": self._initialization_error,
+            "model_status": self.get_model_status(),
+            "img2img_scheduler": self.img2img_scheduler.get_stats(),
+            "prompt_cache": self.prompt_cache.get_stats(),
+            "latent_cache": self.latent_cache.get_stats(),
+            "result_cache": self.result_cache.get_stats() if self.result_cache else None,
+            "inference_executor": self.inference_executor.get_stats(),
+            "background_removal": self.background_remover.get_stats() if self.background_remover else None,
+            "renditions": self.rendition_encoder.get_stats(),
+            "aspect_buckets": self.aspect_bucketer.get_stats(),
+            "upscaler": self.upscaler.get_stats(),
+            "shared_models": get_model_registry().get_model_info()
         }
 
     async def cleanup(self):
@@ -703,15 +1530,19 @@ class AIStyleProcessor:
         try:
             logger.info("Cleaning up AI Style Processor...")
             
-            # Modelle aus GPU-Memory entfernen
-            if self.sd_pipeline:
-                del self.sd_pipeline
-                
-            if self.controlnet_pipeline:
-                del self.controlnet_pipeline
-                
-            if self.blip_model:
-                del self.blip_model
+            if self._eviction_task:
+                self._eviction_task.cancel()
+                self._eviction_task = None
+            
+            await self.img2img_scheduler.shutdown()
+            self.rendition_encoder.shutdown()
+            
+            # Modelle aus GPU-Memory entfernen (abhängige Gruppen zuerst)
+            for name in sorted(self._loaded_models, key=self._has_loaded_dependents):
+                _, unloader = self._model_loaders[name]
+                await unloader()
+                self._loaded_models.discard(name)
+            gc.collect()
             
             # GPU-Cache leeren
             if torch.cuda.is_available():
@@ -22,6 +22,7 @@ import asyncio
 import re
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime
+from pathlib import Path
 import structlog
 
 # NLP und AI Models
@@ -38,6 +39,10 @@ import torch
 from config.settings import Settings
 from utils.text_utils import TextProcessor
 from utils.fashion_knowledge import FashionKnowledgeBase
+from utils.model_registry import acquire_blip, release_blip, get_model_registry
+from utils.inference_executor import get_inference_executor
+from utils.job_queue import JobQueue
+from utils.device_manager import DeviceManager
 
 logger = structlog.get_logger()
 
@@ -169,17 +174,26 @@ class ContentGenerator:
         self.settings = settings
         self.text_processor = TextProcessor()
         self.fashion_kb = FashionKnowledgeBase()
+        # Gleiche Device-Auflösung (MODEL_DEVICE) wie im AIStyleProcessor
+        self.device_manager = DeviceManager(settings)
         
         # Model instances
         self.language_model: Optional[Any] = None
         self.tokenizer: Optional[Any] = None
         self.blip_processor: Optional[BlipProcessor] = None
         self.blip_model: Optional[BlipForConditionalGeneration] = None
+        self._blip_device: Optional[str] = None
         
         # Content pipelines
         self.text_generator: Optional[Any] = None
         self.summarizer: Optional[Any] = None
         
+        # Textgenerierung blockiert - läuft im gemeinsamen Inferenz-Pool
+        self.inference_executor = get_inference_executor(settings)
+        
+        # Persistente Job-Queue für Status und Fortschritt (vom Worker gesetzt)
+        self.job_queue: Optional[JobQueue] = None
+        
         # Status tracking
         self._is_ready = False
         self._initialization_error: Optional[str] = None
@@ -196,6 +210,10 @@ class ContentGenerator:
         try:
             logger.info("🖋️ Initializing Content Generator...")
             
+            # Device Setup
+            device = await self.device_manager.setup_device()
+            logger.info(f"Using device: {device}")
+            
             # Language Models laden
             await self._load_language_models()
             await self._load_image_analysis_models()
@@ -247,17 +265,11 @@ class ContentGenerator:
         logger.info("Loading image analysis models for content generation...")
         
         try:
-            # BLIP für detaillierte Bildanalyse
-            self.blip_processor = BlipProcessor.from_pretrained(
-                self.settings.BLIP_MODEL_NAME,
-                cache_dir=self.settings.HF_CACHE_DIR
-            )
-            
-            self.blip_model = BlipForConditionalGeneration.from_pretrained(
-                self.settings.BLIP_MODEL_NAME,
-                torch_dtype=torch.float16 if self.settings.USE_HALF_PRECISION else torch.float32,
-                cache_dir=self.settings.HF_CACHE_DIR
-            )
+            # BLIP für detaillierte Bildanalyse (geteilt mit dem AIStyleProcessor)
+            # Gleicher Registry-Schlüssel wie im AIStyleProcessor (DeviceManager)
+            device = self.device_manager.get_device()
+            self.blip_processor, self.blip_model = acquire_blip(self.settings, device)
+            self._blip_device = device
             
             logger.info("✅ Image analysis models loaded successfully")
             
@@ -319,29 +331,48 @@ class ContentGenerator:
             generation_options: Generierungsoptionen
         """
         try:
-            logger.info(f"Starting async content generation for job {job_id}")
-            
-            # Lade und analysiere Bild
-            image_analysis = await self._analyze_image_for_content(image_url)
-            
-            # Generiere verschiedene Content-Arten
-            content_results = await self.generate_comprehensive_content(
-                image_analysis,
-                generation_options
-            )
-            
-            # Speichere Ergebnisse
-            await self._save_content_results(job_id, content_results, image_analysis)
+            content_results = await self.run_content_job(job_id, image_url, generation_options)
             
             # Job als abgeschlossen markieren
             await self._update_job_status(job_id, "completed", content_results)
             
-            logger.info(f"Content generation completed for job {job_id}")
-            
         except Exception as e:
             logger.error(f"Content generation failed for job {job_id}: {e}")
             await self._update_job_status(job_id, "failed", {"error": str(e)})
 
+    async def run_content_job(
+        self,
+        job_id: str,
+        image_url: str,
+        generation_options: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Content-Generierungs-Job ausführen (vom Worker aufgerufen)
+        
+        Fehler werden an den Worker weitergereicht.
+        
+        Returns:
+            Generierte Content-Ergebnisse
+        """
+        logger.info(f"Starting async content generation for job {job_id}")
+        
+        # Lade und analysiere Bild
+        await self._update_job_status(job_id, "processing", {"progress": 10})
+        image_analysis = await self._analyze_image_for_content(image_url)
+        
+        # Generiere verschiedene Content-Arten
+        await self._update_job_status(job_id, "processing", {"progress": 40})
+        content_results = await self.generate_comprehensive_content(
+            image_analysis,
+            generation_options
+        )
+        
+        # Speichere Ergebnisse
+        await self._save_content_results(job_id, content_results, image_analysis)
+        
+        logger.info(f"Content generation completed for job {job_id}")
+        return content_results
+
     async def _analyze_image_for_content(self, image_url: str) -> Dict[str, Any]:
         """Analysiere Bild für Content-Generierung"""
         try:
@@ -695,7 +726,8 @@ Styling tips:"""
         """Generiere Text mit dem Language Model"""
         try:
             # Text mit Pipeline generieren
-            generated = self.text_generator(
+            generated = await self.inference_executor.run(
+                self.text_generator,
                 prompt,
                 max_length=len(prompt.split()) + max_length,
                 num_return_sequences=1,
@@ -789,6 +821,14 @@ Styling tips:"""
     ):
         """Update Job-Status"""
         try:
+            if self.job_queue:
+                if status == "processing":
+                    await self.job_queue.update_progress(job_id, (result_data or {}).get("progress", 0))
+                elif status == "completed":
+                    await self.job_queue.complete(job_id, result_data or {})
+                elif status == "failed":
+                    await self.job_queue.fail(job_id, (result_data or {}).get("error", "unknown error"))
+            
             logger.info(f"Content generation job {job_id} status updated to: {status}")
             
         except Exception as e:
@@ -805,7 +845,8 @@ Styling tips:"""
             "blip_model": self.settings.BLIP_MODEL_NAME,
             "supported_languages": self.settings.SUPPORTED_LANGUAGES,
             "ready": self._is_ready,
-            "error": self._initialization_error
+            "error": self._initialization_error,
+            "shared_models": get_model_registry().get_model_info()
         }
 
     async def cleanup(self):
@@ -816,7 +857,9 @@ Styling tips:"""
             if self.language_model:
                 del self.language_model
             if self.blip_model:
-                del self.blip_model
+                self.blip_model = None
+                self.blip_processor = None
+                release_blip(self.settings, self._blip_device)
             
             if torch.cuda.is_available():
                 torch.cuda.empty_cache()
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Inference Scheduler
+=======================================================
+
+Dynamisches Micro-Batching für Stable Diffusion Img2Img-Aufrufe.
+Sammelt Anfragen mit identischen Generierungsparametern innerhalb eines
+kurzen Zeitfensters und führt sie als einen gebatchten Denoising-Lauf aus.
+
+Wird der Job einer Anfrage abgebrochen, erhält sie sofort JobCancelled und
+verlässt ihren Batch; der Denoising-Lauf selbst stoppt erst, wenn keine
+Anfrage mehr auf ihn wartet.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from PIL import Image
+import structlog
+
+from utils.aspect_buckets import bucket_id
+from utils.cancellation import CancellationToken, current_token
+from utils.job_progress import JobProgressReporter, current_reporter
+
+logger = structlog.get_logger()
+
+# (strength, guidance_scale, num_inference_steps, Scheduler, Bucket-ID "BREITExHÖHE")
+BatchKey = Tuple[float, float, int, str, str]
+
+
+@dataclass
+class Img2ImgRequest:
+    """Einzelne Img2Img-Anfrage innerhalb eines Batches"""
+    image: Image.Image
+    prompt_embeds: Any
+    negative_prompt_embeds: Any
+    seed: int
+    future: asyncio.Future
+    token: Optional[CancellationToken] = None
+    reporter: Optional[JobProgressReporter] = None
+    submitted_at: float = field(default_factory=time.monotonic)
+
+
+class Img2ImgBatchScheduler:
+    """
+    Micro-Batching-Scheduler vor der Img2Img-Pipeline
+
+    Anfragen werden nach Strength, Guidance, Schrittzahl, Scheduler und
+    Aspect-Bucket (Bildgröße) gruppiert. Ein Batch startet, sobald er voll ist oder die maximale
+    Wartezeit der ältesten Anfrage abgelaufen ist.
+    """
+
+    def __init__(
+        self,
+        run_batch: Callable[[BatchKey, List[Img2ImgRequest]], Awaitable[List[Image.Image]]],
+        max_batch_size: int = 4,
+        max_wait_ms: int = 50
+    ):
+        """
+        Initialisierung des Schedulers
+
+        Args:
+            run_batch: Coroutine, die einen Batch ausführt und die Bilder
+                in Reihenfolge der Anfragen zurückgibt
+            max_batch_size: Maximale Anzahl Bilder pro Denoising-Lauf
+            max_wait_ms: Maximale Wartezeit auf weitere Anfragen
+        """
+        self._run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0, max_wait_ms) / 1000
+
+        self._pending: Dict[BatchKey, List[Img2ImgRequest]] = {}
+        self._timers: Dict[BatchKey, asyncio.Task] = {}
+        self._running: set = set()
+
+        # Statistiken
+        self._batches_run = 0
+        self._images_run = 0
+        self._batch_size_histogram: Dict[int, int] = {}
+        self._batches_by_bucket: Dict[str, int] = {}
+        self._requests_abandoned = 0
+
+        logger.info(
+            f"Img2ImgBatchScheduler initialized "
+            f"(max_batch_size={self.max_batch_size}, max_wait_ms={max_wait_ms})"
+        )
+
+    async def submit(
+        self,
+        image: Image.Image,
+        prompt_embeds: Any,
+        negative_prompt_embeds: Any,
+        strength: float,
+        guidance_scale: float,
+        num_inference_steps: int,
+        scheduler: str = "unipc",
+        seed: int = 42
+    ) -> Image.Image:
+        """
+        Img2Img-Anfrage einreihen und auf das Ergebnis warten
+
+        Returns:
+            Generiertes Bild dieser Anfrage
+        """
+        token = current_token()
+        if token is not None:
+            token.raise_if_cancelled()
+
+        key: BatchKey = (
+            float(strength), float(guidance_scale), int(num_inference_steps), scheduler, bucket_id(image.size)
+        )
+        request = Img2ImgRequest(
+            image=image,
+            prompt_embeds=prompt_embeds,
+            negative_prompt_embeds=negative_prompt_embeds,
+            seed=seed,
+            future=asyncio.get_running_loop().create_future(),
+            token=token,
+            reporter=current_reporter()
+        )
+
+        batch = self._pending.setdefault(key, [])
+        batch.append(request)
+
+        if len(batch) >= self.max_batch_size or self.max_wait_seconds == 0:
+            self._flush(key)
+        elif key not in self._timers:
+            self._timers[key] = asyncio.create_task(self._flush_after_wait(key))
+
+        if token is None:
+            return await request.future
+
+        # Der Abbruch kann aus einem Executor-Thread kommen (Deadline im Step-Callback)
+        loop = asyncio.get_running_loop()
+        on_cancel = lambda: loop.call_soon_threadsafe(self._abandon, key, request)
+        token.add_callback(on_cancel)
+        try:
+            return await request.future
+        finally:
+            token.remove_callback(on_cancel)
+
+    def _abandon(self, key: BatchKey, request: Img2ImgRequest):
+        """Anfrage eines abgebrochenen Jobs aus ihrem Batch lösen"""
+        batch = self._pending.get(key)
+        if batch and request in batch:
+            batch.remove(request)
+            if not batch:
+                self._pending.pop(key, None)
+                timer = self._timers.pop(key, None)
+                if timer:
+                    timer.cancel()
+
+        if not request.future.done():
+            request.future.set_exception(request.token.exception())
+            self._requests_abandoned += 1
+
+    async def _flush_after_wait(self, key: BatchKey):
+        """Batch nach Ablauf der Wartezeit starten"""
+        await asyncio.sleep(self.max_wait_seconds)
+        self._timers.pop(key, None)
+        self._flush(key)
+
+    def _flush(self, key: BatchKey):
+        """Wartende Anfragen eines Schlüssels als Batch starten"""
+        timer = self._timers.pop(key, None)
+        if timer and timer is not asyncio.current_task():
+            timer.cancel()
+
+        batch = self._pending.pop(key, [])
+        while batch:
+            chunk, batch = batch[:self.max_batch_size], batch[self.max_batch_size:]
+            task = asyncio.create_task(self._execute(key, chunk))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _execute(self, key: BatchKey, batch: List[Img2ImgRequest]):
+        """Batch ausführen und Ergebnisse auf die Anfragen verteilen"""
+        # Zwischenzeitlich abgebrochene Anfragen nicht mehr rechnen
+        live = [request for request in batch if not request.future.done()]
+        if not live:
+            return
+        batch = live
+
+        start = time.perf_counter()
+        try:
+            images = await self._run_batch(key, batch)
+            if len(images) != len(batch):
+                raise RuntimeError(f"Batch returned {len(images)} images for {len(batch)} requests")
+
+            for request, image in zip(batch, images):
+                if not request.future.done():
+                    request.future.set_result(image)
+
+            self._batches_run += 1
+            self._images_run += len(batch)
+            self._batch_size_histogram[len(batch)] = self._batch_size_histogram.get(len(batch), 0) + 1
+            self._batches_by_bucket[key[-1]] = self._batches_by_bucket.get(key[-1], 0) + 1
+            logger.debug(
+                f"Img2Img batch of {len(batch)} finished in {time.perf_counter() - start:.1f}s"
+            )
+
+        except Exception as e:
+            logger.error(f"Img2Img batch of {len(batch)} failed: {e}")
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Scheduler-Statistiken für Monitoring"""
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": int(self.max_wait_seconds * 1000),
+            "pending_requests": sum(len(batch) for batch in self._pending.values()),
+            "running_batches": len(self._running),
+            "batches_run": self._batches_run,
+            "images_run": self._images_run,
+            "avg_batch_size": round(self._images_run / self._batches_run, 2) if self._batches_run else 0.0,
+            "batch_size_histogram": dict(sorted(self._batch_size_histogram.items())),
+            "batches_by_bucket": dict(sorted(self._batches_by_bucket.items())),
+            "requests_abandoned": self._requests_abandoned
+        }
+
+    async def shutdown(self):
+        """Offene Timer abbrechen und wartende Anfragen beenden"""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+
+        for batch in self._pending.values():
+            for request in batch:
+                if not request.future.done():
+                    request.future.set_exception(RuntimeError("Inference scheduler shut down"))
+        self._pending.clear()
+
+        if self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Latent Cache
+================================================
+
+LRU-Cache für VAE-encodierte Eingabebilder.
+Erste Verbesserung, Style-Varianten und spätere Läufe mit anderem Style
+(z. B. Studio, dann Luxury, dann Street im Telegram-Bot) starten alle vom
+selben vorbereiteten Bild - der VAE-Encoder muss dafür nur einmal laufen.
+
+- Schlüssel: Hash des vorbereiteten Bildes, Bucket-Auflösung und Modell
+- Speichergrenze in MB, Verdrängung nach LRU
+- optional werden verdrängte Latents als .npy auf Disk ausgelagert und bei
+  einem Treffer wieder in den Speicher geholt
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import numpy as np
+import torch
+from PIL import Image
+import structlog
+
+logger = structlog.get_logger()
+
+
+class LatentCache:
+    """
+    Speicherbegrenzter LRU-Cache für Latents (1, 4, H/8, W/8) auf der CPU
+    """
+
+    def __init__(self, max_mb: int = 256, spill_dir: Optional[str] = None, spill_max_mb: int = 1024):
+        """
+        Initialisierung des Caches
+
+        Args:
+            max_mb: Maximale Größe der Latents im Speicher
+            spill_dir: Verzeichnis für verdrängte Latents (None = kein Spill)
+            spill_max_mb: Maximale Größe des Spill-Verzeichnisses
+        """
+        self.max_bytes = max(1, max_mb) * 1024 * 1024
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.spill_max_bytes = max(1, spill_max_mb) * 1024 * 1024
+        if self.spill_dir:
+            self.spill_dir.mkdir(parents=True, exist_ok=True)
+
+        self._entries: "OrderedDict[str, torch.Tensor]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._disk_hits = 0
+        self._misses = 0
+        self._spilled = 0
+        logger.info(
+            f"LatentCache initialized (max_mb={max_mb}, spill={'on' if self.spill_dir else 'off'})"
+        )
+
+    @staticmethod
+    def make_key(image: Image.Image, model_tag: str) -> str:
+        """
+        Cache-Schlüssel aus Bildinhalt, Auflösung (Bucket) und Modell
+
+        Args:
+            image: Vorbereitetes, in den Bucket eingepasstes Bild
+            model_tag: Modellname und dtype des VAE
+        """
+        digest = hashlib.blake2b(image.tobytes(), digest_size=16)
+        digest.update(f"{image.mode}:{model_tag}".encode())
+        return f"{digest.hexdigest()}-{image.width}x{image.height}"
+
+    # ================================================
+    # Lesen & Schreiben
+    # ================================================
+
+    def get_or_encode(self, key: str, encode: Callable[[], torch.Tensor]) -> torch.Tensor:
+        """
+        Latents aus dem Cache holen oder encodieren
+
+        Args:
+            key: Ergebnis von make_key
+            encode: Berechnet die Latents bei einem Miss (VAE-Encode)
+
+        Returns:
+            Latents auf der CPU
+        """
+        with self._lock:
+            latents = self._entries.get(key)
+            if latents is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return latents
+
+        latents = self._load_spilled(key)
+        if latents is not None:
+            with self._lock:
+                self._disk_hits += 1
+        else:
+            with self._lock:
+                self._misses += 1
+            latents = encode().detach().to("cpu")
+
+        self._store(key, latents)
+        return latents
+
+    def _store(self, key: str, latents: torch.Tensor):
+        """Eintrag ablegen und bis zur Speichergrenze verdrängen"""
+        evicted = []
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = latents
+            self._bytes += latents.element_size() * latents.nelement()
+            while self._bytes > self.max_bytes and len(self._entries) > 1:
+                old_key, old_latents = self._entries.popitem(last=False)
+                self._bytes -= old_latents.element_size() * old_latents.nelement()
+                evicted.append((old_key, old_latents))
+
+        # Disk-I/O außerhalb des Locks
+        for old_key, old_latents in evicted:
+            self._spill(old_key, old_latents)
+
+    # ================================================
+    # Auslagerung auf Disk
+    # ================================================
+
+    def _spill_path(self, key: str) -> Path:
+        return self.spill_dir / f"{key}.npy"
+
+    def _spill(self, key: str, latents: torch.Tensor):
+        """Verdrängte Latents als .npy auslagern (atomar über .part)"""
+        if not self.spill_dir:
+            return
+        path = self._spill_path(key)
+        part_path = path.with_suffix(".part")
+        try:
+            with open(part_path, "wb") as f:
+                np.save(f, latents.numpy())
+            os.replace(part_path, path)
+            with self._lock:
+                self._spilled += 1
+            self._prune_spill_dir()
+        except OSError as e:
+            logger.warning(f"Failed to spill latents {key}: {e}")
+            part_path.unlink(missing_ok=True)
+
+    def _load_spilled(self, key: str) -> Optional[torch.Tensor]:
+        """Ausgelagerte Latents laden (die Datei bleibt für andere Prozesse erhalten)"""
+        if not self.spill_dir:
+            return None
+        path = self._spill_path(key)
+        try:
+            latents = torch.from_numpy(np.load(path))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Discarding unreadable spilled latents {key}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        os.utime(path)
+        return latents
+
+    def _prune_spill_dir(self):
+        """Älteste ausgelagerte Dateien löschen, bis die Größengrenze eingehalten ist"""
+        files = []
+        for path in self.spill_dir.glob("*.npy"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.spill_max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    # ================================================
+    # Verwaltung
+    # ================================================
+
+    def clear(self):
+        """Alle Einträge im Speicher verwerfen"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/Miss-Zähler und Speicherbelegung für Monitoring"""
+        with self._lock:
+            total = self._hits + self._disk_hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "memory_mb": round(self._bytes / (1024 * 1024), 2),
+                "max_mb": round(self.max_bytes / (1024 * 1024)),
+                "hits": self._hits,
+                "disk_hits": self._disk_hits,
+                "misses": self._misses,
+                "spilled": self._spilled,
+                "hit_rate": round((self._hits + self._disk_hits) / total, 3) if total else 0.0
+            }
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Multi-Prompt Img2Img
+========================================================
+
+Gebatchter Img2Img-Denoising-Lauf für mehrere Prompts auf demselben
+Eingabebild. Das Bild wird einmal VAE-encodiert und auf den Batch
+gebroadcastet; Prompt-Embeddings und Guidance-Scale gelten pro Sample.
+
+Wird für Style-Varianten genutzt, die sonst je einen vollständigen
+Encode/Denoise/Decode-Zyklus auf dem identischen Bild benötigen würden.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+from typing import Any, Callable, List, Optional
+
+import torch
+from PIL import Image
+from diffusers.utils.torch_utils import randn_tensor
+import structlog
+
+logger = structlog.get_logger()
+
+
+def encode_image_latents(pipeline: Any, image: Image.Image) -> torch.Tensor:
+    """
+    Eingabebild einmalig in skalierte VAE-Latents encodieren
+
+    Verwendet den Mittelwert der Latent-Verteilung, damit das Ergebnis
+    deterministisch ist und wiederverwendet werden kann.
+
+    Returns:
+        Tensor der Form (1, 4, H/8, W/8)
+    """
+    device = pipeline._execution_device
+    pixels = pipeline.image_processor.preprocess(image).to(device=device, dtype=pipeline.vae.dtype)
+
+    with torch.no_grad():
+        latents = pipeline.vae.encode(pixels).latent_dist.mode()
+
+    return latents * pipeline.vae.config.scaling_factor
+
+
+def run_multi_prompt_img2img(
+    pipeline: Any,
+    image: Image.Image,
+    prompt_embeds: torch.Tensor,
+    negative_prompt_embeds: torch.Tensor,
+    guidance_scales: List[float],
+    strength: float,
+    num_inference_steps: int,
+    generators: List[torch.Generator],
+    image_latents: Optional[torch.Tensor] = None,
+    callback_on_step_end: Optional[Callable] = None
+) -> List[Image.Image]:
+    """
+    Mehrere Prompts auf einem Bild in einem Denoising-Lauf generieren
+
+    Args:
+        pipeline: Geladene StableDiffusionImg2ImgPipeline
+        image: Gemeinsames Eingabebild
+        prompt_embeds: Positive Embeddings (B, L, D)
+        negative_prompt_embeds: Negative Embeddings (B, L, D)
+        guidance_scales: Guidance-Scale pro Sample
+        strength: Gemeinsame Denoising-Stärke
+        num_inference_steps: Anzahl Scheduler-Schritte
+        generators: Ein Generator pro Sample für das Start-Rauschen
+        image_latents: Bereits encodierte Latents (überspringt den VAE-Encode)
+        callback_on_step_end: Wie bei diffusers nach jedem Schritt aufgerufen
+            (pipeline, step, timestep, {"latents": ...}); darf abbrechen
+
+    Returns:
+        Liste mit B generierten Bildern
+    """
+    batch_size = prompt_embeds.shape[0]
+    if not (len(guidance_scales) == len(generators) == negative_prompt_embeds.shape[0] == batch_size):
+        raise ValueError("prompt_embeds, negative_prompt_embeds, guidance_scales und generators "
+                         "müssen dieselbe Batch-Größe haben")
+
+    device = pipeline._execution_device
+    dtype = pipeline.unet.dtype
+
+    with torch.no_grad():
+        # 1. Bild einmal encodieren und auf den Batch broadcasten
+        if image_latents is None:
+            image_latents = encode_image_latents(pipeline, image)
+        image_latents = image_latents.to(device=device, dtype=dtype)
+
+        # 2. Eigener Scheduler pro Lauf - Multistep-Scheduler sind zustandsbehaftet
+        scheduler = type(pipeline.scheduler).from_config(pipeline.scheduler.config)
+        scheduler.set_timesteps(num_inference_steps, device=device)
+        init_timestep = min(int(num_inference_steps * strength), num_inference_steps)
+        t_start = max(num_inference_steps - init_timestep, 0)
+        timesteps = scheduler.timesteps[t_start * scheduler.order:]
+        if len(timesteps) == 0:
+            raise ValueError(f"strength={strength} ergibt keine Denoising-Schritte")
+
+        # 3. Start-Rauschen pro Sample
+        noise = torch.cat([
+            randn_tensor(image_latents.shape, generator=generator, device=device, dtype=dtype)
+            for generator in generators
+        ])
+        latents = scheduler.add_noise(
+            image_latents.expand(batch_size, -1, -1, -1),
+            noise,
+            timesteps[:1].repeat(batch_size)
+        )
+
+        encoder_hidden_states = torch.cat([negative_prompt_embeds, prompt_embeds]).to(device=device, dtype=dtype)
+        guidance = torch.tensor(guidance_scales, device=device, dtype=dtype).view(-1, 1, 1, 1)
+
+        # 4. Denoising-Loop mit Guidance pro Sample
+        for i, t in enumerate(timesteps):
+            latent_model_input = scheduler.scale_model_input(torch.cat([latents] * 2), t)
+            noise_pred = pipeline.unet(
+                latent_model_input,
+                t,
+                encoder_hidden_states=encoder_hidden_states,
+                return_dict=False
+            )[0]
+            noise_uncond, noise_text = noise_pred.chunk(2)
+            noise_pred = noise_uncond + guidance * (noise_text - noise_uncond)
+            latents = scheduler.step(noise_pred, t, latents, return_dict=False)[0]
+
+            if callback_on_step_end is not None:
+                callback_outputs = callback_on_step_end(pipeline, i, t, {"latents": latents})
+                latents = callback_outputs.pop("latents", latents)
+
+        # 5. Gemeinsamer Decode
+        decoded = pipeline.vae.decode(latents / pipeline.vae.config.scaling_factor, return_dict=False)[0]
+        images = pipeline.image_processor.postprocess(decoded, output_type="pil")
+
+    if hasattr(pipeline, "maybe_free_model_hooks"):
+        pipeline.maybe_free_model_hooks()
+
+    logger.debug(f"Multi-prompt img2img generated {batch_size} images in {len(timesteps)} steps")
+    return images
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Prompt Embedding Cache
+==========================================================
+
+LRU-Cache für Compel-Conditioning-Tensoren.
+Die Prompts stammen aus wenigen festen Style-Presets plus Options-Suffixen,
+daher muss der Text-Encoder pro Prompt nur einmal laufen.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class PromptEmbeddingCache:
+    """
+    LRU-Cache für Conditioning-Tensoren
+
+    Schlüssel: (Prompt-Text, Tokenizer-/Encoder-Identität, dtype, Device)
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """
+        Initialisierung des Caches
+
+        Args:
+            max_entries: Maximale Anzahl gecachter Tensoren
+        """
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        logger.info(f"PromptEmbeddingCache initialized (max_entries={self.max_entries})")
+
+    @staticmethod
+    def _make_key(compel: Any, prompt: str) -> Tuple[Hashable, ...]:
+        """Cache-Schlüssel aus Prompt und Encoder-Identität"""
+        text_encoder = compel.conditioning_provider.text_encoder
+        tokenizer = compel.conditioning_provider.tokenizer
+        return (
+            prompt,
+            id(tokenizer),
+            id(text_encoder),
+            str(text_encoder.dtype),
+            str(text_encoder.device)
+        )
+
+    def get_or_build(self, compel: Any, prompt: str) -> Any:
+        """
+        Conditioning-Tensor aus dem Cache holen oder mit Compel erzeugen
+
+        Args:
+            compel: Compel-Instanz der aktuellen Pipeline
+            prompt: Prompt-Text
+
+        Returns:
+            Conditioning-Tensor (1, L, D)
+        """
+        key = self._make_key(compel, prompt)
+
+        with self._lock:
+            tensor = self._entries.get(key)
+            if tensor is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return tensor
+            self._misses += 1
+
+        tensor = compel.build_conditioning_tensor(prompt)
+
+        with self._lock:
+            self._entries[key] = tensor
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+        return tensor
+
+    def warm(self, compel: Any, prompts: Iterable[str]) -> int:
+        """
+        Cache mit bekannten Prompts vorbefüllen
+
+        Returns:
+            Anzahl neu berechneter Tensoren
+        """
+        built = 0
+        for prompt in prompts:
+            key = self._make_key(compel, prompt)
+            with self._lock:
+                if key in self._entries:
+                    continue
+            tensor = compel.build_conditioning_tensor(prompt)
+            with self._lock:
+                self._entries[key] = tensor
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            built += 1
+        return built
+
+    def clear(self):
+        """Alle Einträge verwerfen (z.B. wenn der Text-Encoder entladen wird)"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/Miss-Zähler für Monitoring"""
+        with self._lock:
+            total = self._hits + self._misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / total, 3) if total else 0.0
+            }
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Quality Tiers
+=================================================
+
+Qualitätsstufen (Feld "quality" der Processing-Requests) als vollständige
+Ausführungspläne:
+- standard: schnelle Listings (auch "Quick Process" im Telegram-Bot) -
+  wenige Schritte, kleinere Diffusionsauflösung, kein ControlNet, keine
+  Varianten, nur günstiges Post-Processing
+- high: bisheriges Verhalten (Standard der API)
+- ultra: Hero-Shots - mehr Schritte, DPM++-2M-Scheduler, alle Varianten
+
+Aus dem Plan wird auch die geschätzte Verarbeitungszeit der Job-Antwort
+berechnet.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional, Tuple
+
+import structlog
+
+from utils.post_processing import OPERATIONS, OP_ENHANCE_COLORS, OP_SHARPEN
+
+logger = structlog.get_logger()
+
+QUALITY_STANDARD = "standard"
+QUALITY_HIGH = "high"
+QUALITY_ULTRA = "ultra"
+DEFAULT_QUALITY = QUALITY_HIGH
+
+# Diffusers-Scheduler (Zuordnung zu Klassen im AIStyleProcessor)
+SCHEDULER_UNIPC = "unipc"
+SCHEDULER_DPMPP_2M = "dpmpp_2m"
+
+
+@dataclass(frozen=True)
+class ExecutionPlan:
+    """Ausführungsplan einer Qualitätsstufe"""
+    tier: str
+    img2img_steps: int
+    controlnet_steps: int
+    scheduler: str
+    resolution: Optional[int]  # Längste Seite der Diffusion (None = MAX_IMAGE_SIZE)
+    run_controlnet: bool
+    num_variants: int
+    post_processing: Optional[Tuple[str, ...]]  # Erlaubte Operationen (None = alle)
+
+    def diffusion_size(self, max_size: int) -> int:
+        """Längste Seite der Diffusionseingabe (Aspect-Bucket-Größe)"""
+        return min(self.resolution, max_size) if self.resolution else max_size
+
+    def post_processing_options(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """Optionen mit abgeschalteten Operationen außerhalb des Plans"""
+        if self.post_processing is None:
+            return options
+        return {
+            **options,
+            **{op: False for op in OPERATIONS if op not in self.post_processing}
+        }
+
+    def estimate_seconds(
+        self,
+        strength: float,
+        max_size: int,
+        seconds_per_megapixel_step: float,
+        overhead_seconds: float
+    ) -> int:
+        """
+        Verarbeitungszeit aus den Denoising-Schritten schätzen
+
+        Img2Img führt nur strength * Schritte aus; die Fläche wird als
+        quadratischer Bucket (obere Schranke) angesetzt.
+        """
+        steps = self.img2img_steps * strength * (1 + self.num_variants)
+        if self.run_controlnet:
+            steps += self.controlnet_steps
+        megapixels = self.diffusion_size(max_size) ** 2 / 1_000_000
+        return int(round(overhead_seconds + steps * megapixels * seconds_per_megapixel_step))
+
+
+QUALITY_TIERS: Dict[str, ExecutionPlan] = {
+    QUALITY_STANDARD: ExecutionPlan(
+        tier=QUALITY_STANDARD,
+        img2img_steps=12,
+        controlnet_steps=0,
+        scheduler=SCHEDULER_UNIPC,
+        resolution=768,
+        run_controlnet=False,
+        num_variants=0,
+        post_processing=(OP_ENHANCE_COLORS, OP_SHARPEN)
+    ),
+    QUALITY_HIGH: ExecutionPlan(
+        tier=QUALITY_HIGH,
+        img2img_steps=30,
+        controlnet_steps=25,
+        scheduler=SCHEDULER_UNIPC,
+        resolution=None,
+        run_controlnet=True,
+        num_variants=3,
+        post_processing=None
+    ),
+    QUALITY_ULTRA: ExecutionPlan(
+        tier=QUALITY_ULTRA,
+        img2img_steps=40,
+        controlnet_steps=35,
+        scheduler=SCHEDULER_DPMPP_2M,
+        resolution=None,
+        run_controlnet=True,
+        num_variants=4,
+        post_processing=None
+    )
+}
+
+
+def resolve_execution_plan(quality: Optional[str], options: Optional[Dict[str, Any]] = None) -> ExecutionPlan:
+    """
+    Ausführungsplan für eine Qualitätsstufe und die Job-Optionen
+
+    preserve_structure=False schaltet ControlNet ab, generate_variants=False
+    die Varianten; einschalten können die Optionen nur, was der Plan erlaubt.
+
+    Args:
+        quality: standard, high oder ultra (unbekannte Werte -> high)
+        options: Verarbeitungsoptionen des Jobs
+    """
+    options = options or {}
+    tier = (quality or DEFAULT_QUALITY).lower()
+    if tier not in QUALITY_TIERS:
+        logger.warning(f"Unknown quality tier '{quality}', using {DEFAULT_QUALITY}")
+        tier = DEFAULT_QUALITY
+
+    plan = QUALITY_TIERS[tier]
+    return replace(
+        plan,
+        run_controlnet=plan.run_controlnet and options.get("preserve_structure", True),
+        num_variants=plan.num_variants if options.get("generate_variants", False) else 0
+    )
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Aspect Buckets
+==================================================
+
+Feste Auflösungs-Buckets für Diffusionseingaben:
+- pro Zielgröße (längste Seite) eine Menge von Buckets mit Seitenlängen
+  in Vielfachen von ASPECT_BUCKET_STEP bis zum maximalen Seitenverhältnis
+- die Zielgröße wird auf die längste Seite des Bildes begrenzt (auf
+  ASPECT_BUCKET_STEP abgerundet); Buckets vergrößern also nie
+- jedes Bild wird in den Bucket mit dem nächstgelegenen Seitenverhältnis
+  eingepasst: "pad" skaliert hinein und füllt mit Randpixeln auf, "crop"
+  skaliert deckend und schneidet mittig zu
+- nach der Generierung wird die Anpassung umgekehrt, die Ergebnisse haben
+  wieder die Größe des Eingabebildes
+
+Wenige, immer gleiche Formen ermöglichen Batching im Img2ImgBatchScheduler
+und die Wiederverwendung von Speicherplänen in den Pipelines. Die Bucket-ID
+("BREITExHÖHE") dient Batching- und Cache-Schichten als Gruppierungsschlüssel.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import math
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+FIT_PAD = "pad"
+FIT_CROP = "crop"
+
+# Name der Statistik in der worker_stats-Tabelle der JobQueue
+BUCKET_STATS_NAME = "aspect_buckets"
+
+
+@dataclass(frozen=True)
+class AspectBucket:
+    """Zielauflösung für Diffusionseingaben"""
+    width: int
+    height: int
+
+    @property
+    def id(self) -> str:
+        return bucket_id((self.width, self.height))
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return (self.width, self.height)
+
+    @property
+    def aspect(self) -> float:
+        return self.width / self.height
+
+
+@dataclass(frozen=True)
+class BucketFit:
+    """Eingepasstes Bild und die Angaben zum Umkehren der Anpassung"""
+    image: Image.Image
+    bucket: AspectBucket
+    mode: str
+    original_size: Tuple[int, int]
+    scaled_size: Tuple[int, int]
+    offset: Tuple[int, int]  # Position des skalierten Bildes im Bucket (bei crop negativ)
+
+    @property
+    def padding_ratio(self) -> float:
+        """Anteil aufgefüllter Fläche im Bucket (0 bei crop)"""
+        if self.mode != FIT_PAD:
+            return 0.0
+        content = self.scaled_size[0] * self.scaled_size[1]
+        return 1.0 - content / (self.bucket.width * self.bucket.height)
+
+    def restore(
+        self,
+        result: Image.Image,
+        source: Image.Image,
+        upscale: Optional[Callable[[Image.Image, Image.Image], Image.Image]] = None
+    ) -> Image.Image:
+        """
+        Anpassung an einem Generierungsergebnis umkehren
+
+        Args:
+            result: Ergebnis in Bucket-Größe
+            source: Eingabebild vor dem Einpassen (liefert bei crop die Ränder)
+            upscale: Ersetzt Lanczos beim Vergrößern auf die Eingabegröße
+                (erhält Inhalt und source, liefert ein Bild in source.size)
+
+        Returns:
+            Ergebnis in der Größe des Eingabebildes
+        """
+        result = result.convert("RGB")
+        if result.size != self.bucket.size:
+            result = result.resize(self.bucket.size, Image.LANCZOS)
+
+        x, y = self.offset
+        if self.mode == FIT_PAD:
+            content = result.crop((x, y, x + self.scaled_size[0], y + self.scaled_size[1]))
+        else:
+            # Abgeschnittene Ränder aus dem Eingabebild ergänzen
+            content = source.convert("RGB").resize(self.scaled_size, Image.LANCZOS)
+            content.paste(result, (-x, -y))
+
+        if content.size != self.original_size:
+            enlarging = content.width < self.original_size[0]
+            if upscale and enlarging:
+                content = upscale(content, source)
+            else:
+                content = content.resize(self.original_size, Image.LANCZOS)
+        return content
+
+
+def bucket_id(size: Tuple[int, int]) -> str:
+    """Bucket-ID für eine Bildgröße"""
+    return f"{size[0]}x{size[1]}"
+
+
+@lru_cache(maxsize=None)
+def build_buckets(long_side: int, step: int = 64, max_ratio: float = 2.0) -> Tuple[AspectBucket, ...]:
+    """
+    Buckets für eine Zielgröße erzeugen
+
+    Args:
+        long_side: Längste Seite (wird auf ein Vielfaches von step abgerundet)
+        step: Raster der Seitenlängen
+        max_ratio: Größtes Seitenverhältnis (längste / kürzeste Seite)
+
+    Returns:
+        Buckets im Quer- und Hochformat, aufsteigend nach Seitenverhältnis
+    """
+    long_side = max(step, long_side // step * step)
+    shortest = max(step, int(math.ceil(long_side / max_ratio / step)) * step)
+
+    buckets = {AspectBucket(long_side, long_side)}
+    for short in range(shortest, long_side, step):
+        buckets.add(AspectBucket(long_side, short))
+        buckets.add(AspectBucket(short, long_side))
+    return tuple(sorted(buckets, key=lambda bucket: bucket.aspect))
+
+
+def nearest_bucket(size: Tuple[int, int], long_side: int, step: int = 64, max_ratio: float = 2.0) -> AspectBucket:
+    """
+    Bucket mit dem nächstgelegenen Seitenverhältnis (logarithmischer Abstand)
+
+    Die Zielgröße wird auf die längste Bildseite begrenzt: kleine Uploads
+    werden nicht auf die Diffusionsauflösung hochskaliert.
+    """
+    aspect = math.log(size[0] / size[1])
+    return min(
+        build_buckets(min(long_side, max(size)), step, max_ratio),
+        key=lambda bucket: abs(math.log(bucket.aspect) - aspect)
+    )
+
+
+def fit_to_bucket(image: Image.Image, bucket: AspectBucket, mode: str = FIT_PAD) -> BucketFit:
+    """
+    Bild in einen Bucket einpassen
+
+    Args:
+        image: RGB-Eingabebild
+        bucket: Zielbucket
+        mode: "pad" (hineinskalieren, Randpixel fortsetzen) oder "crop"
+            (deckend skalieren, mittig zuschneiden)
+    """
+    width, height = image.size
+    if mode == FIT_CROP:
+        scale = max(bucket.width / width, bucket.height / height)
+    else:
+        scale = min(bucket.width / width, bucket.height / height)
+    scaled_size = (
+        max(1, int(round(width * scale))),
+        max(1, int(round(height * scale)))
+    )
+    # Rundung darf bei pad nicht über den Bucket hinausragen
+    if mode != FIT_CROP:
+        scaled_size = (min(scaled_size[0], bucket.width), min(scaled_size[1], bucket.height))
+    else:
+        scaled_size = (max(scaled_size[0], bucket.width), max(scaled_size[1], bucket.height))
+
+    scaled = image.convert("RGB")
+    if scaled.size != scaled_size:
+        scaled = scaled.resize(scaled_size, Image.LANCZOS)
+
+    offset = ((bucket.width - scaled_size[0]) // 2, (bucket.height - scaled_size[1]) // 2)
+    if mode == FIT_CROP:
+        left, top = -offset[0], -offset[1]
+        fitted = scaled.crop((left, top, left + bucket.width, top + bucket.height))
+    elif scaled_size == bucket.size:
+        fitted = scaled
+    else:
+        # Randpixel fortsetzen statt schwarzer Balken (keine harten Kanten für die Diffusion)
+        pad_x, pad_y = offset
+        pixels = np.pad(
+            np.asarray(scaled),
+            (
+                (pad_y, bucket.height - scaled_size[1] - pad_y),
+                (pad_x, bucket.width - scaled_size[0] - pad_x),
+                (0, 0)
+            ),
+            mode="edge"
+        )
+        fitted = Image.fromarray(pixels)
+
+    return BucketFit(
+        image=fitted,
+        bucket=bucket,
+        mode=mode,
+        original_size=image.size,
+        scaled_size=scaled_size,
+        offset=offset
+    )
+
+
+def resize_to_fit(image: Image.Image, long_side: int, multiple: int = 8) -> BucketFit:
+    """
+    Einfache Verkleinerung auf eine längste Seite (ohne feste Buckets)
+
+    Für ENABLE_ASPECT_BUCKETS=false: Seitenlängen werden nur auf Vielfache
+    von multiple (VAE) gebracht; restore() skaliert zurück.
+    """
+    scale = min(1.0, long_side / max(image.size))
+    size = tuple(
+        max(multiple, int(round(side * scale / multiple)) * multiple)
+        for side in image.size
+    )
+    resized = image.convert("RGB")
+    if resized.size != size:
+        resized = resized.resize(size, Image.LANCZOS)
+    return BucketFit(
+        image=resized,
+        bucket=AspectBucket(*size),
+        mode=FIT_PAD,
+        original_size=image.size,
+        scaled_size=size,
+        offset=(0, 0)
+    )
+
+
+def merge_bucket_stats(stats: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Statistiken mehrerer AspectBucketer (z. B. aller Worker-Prozesse) zusammenfassen
+
+    Args:
+        stats: Ergebnisse von AspectBucketer.get_stats()
+
+    Returns:
+        Gleiches Format wie get_stats(), zusätzlich Anzahl der Quellen
+    """
+    hits: Counter = Counter()
+    fits = exact_hits = sources = 0
+    padding_total = 0.0
+    settings: Dict[str, Any] = {}
+
+    for entry in stats:
+        sources += 1
+        fits += entry.get("fits", 0)
+        exact_hits += entry.get("exact_hits", 0)
+        padding_total += entry.get("avg_padding_ratio", 0.0) * entry.get("fits", 0)
+        hits.update(entry.get("bucket_hits", {}))
+        settings = {key: entry.get(key) for key in ("mode", "step", "max_ratio")}
+
+    return {
+        **settings,
+        "sources": sources,
+        "fits": fits,
+        "exact_hits": exact_hits,
+        "avg_padding_ratio": round(padding_total / fits, 4) if fits else 0.0,
+        "bucket_hits": dict(hits.most_common())
+    }
+
+
+class AspectBucketer:
+    """
+    Einpassen in Buckets mit Trefferstatistik
+    """
+
+    def __init__(self, step: int = 64, max_ratio: float = 2.0, mode: str = FIT_PAD):
+        """
+        Initialisierung
+
+        Args:
+            step: Raster der Seitenlängen
+            max_ratio: Größtes Seitenverhältnis der Buckets
+            mode: Einpassung ("pad" oder "crop")
+        """
+        self.step = step
+        self.max_ratio = max_ratio
+        self.mode = mode if mode in (FIT_PAD, FIT_CROP) else FIT_PAD
+
+        self._lock = threading.Lock()
+        self._hits: Counter = Counter()
+        self._exact_hits = 0
+        self._padding_total = 0.0
+
+    def fit(self, image: Image.Image, long_side: int) -> BucketFit:
+        """Bild in den nächstgelegenen Bucket für die Zielgröße einpassen (blockierend)"""
+        bucket = nearest_bucket(image.size, long_side, self.step, self.max_ratio)
+        fit = fit_to_bucket(image, bucket, self.mode)
+
+        with self._lock:
+            self._hits[bucket.id] += 1
+            self._exact_hits += int(image.size == bucket.size)
+            self._padding_total += fit.padding_ratio
+        return fit
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Verteilung der Bucket-Treffer für Monitoring"""
+        with self._lock:
+            total = sum(self._hits.values())
+            return {
+                "mode": self.mode,
+                "step": self.step,
+                "max_ratio": self.max_ratio,
+                "fits": total,
+                "exact_hits": self._exact_hits,
+                "avg_padding_ratio": round(self._padding_total / total, 4) if total else 0.0,
+                "bucket_hits": dict(self._hits.most_common())
+            }
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Background Removal
+======================================================
+
+Segmentierungsbasierte Hintergrundentfernung mit ONNX Runtime (CPU):
+- gepoolte InferenceSessions pro Worker (Sessions sind teuer im Aufbau)
+- Maske wird in niedriger Auflösung (BACKGROUND_MODEL_INPUT_SIZE) berechnet
+- Hochskalieren und kantenerhaltende Verfeinerung per Guided Filter mit
+  dem Originalbild als Führungsbild
+- Anwendung der Maske als Alphakanal in voller Auflösung
+- Batch-Inferenz für Katalogläufe
+
+Erwartet ein U2-Net-kompatibles Modell (z. B. u2net/u2netp/isnet aus rembg):
+ein Eingang (N, 3, H, W) mit ImageNet-Normalisierung, erster Ausgang
+(N, 1, H, W) mit Vordergrund-Wahrscheinlichkeiten.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import queue
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import cv2
+import numpy as np
+from PIL import Image
+import structlog
+
+from config.settings import Settings
+
+try:
+    import onnxruntime as ort
+except ImportError:  # Optionale Abhängigkeit; ImageProcessor fällt dann zurück
+    ort = None
+
+logger = structlog.get_logger()
+
+# ImageNet-Normalisierung (U2-Net-Training)
+_MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+_STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+# Guided Filter: Radius relativ zur längsten Seite und Regularisierung
+GUIDED_RADIUS_RATIO = 0.004
+GUIDED_EPS = 1e-4
+
+
+def guided_filter(guide: np.ndarray, src: np.ndarray, radius: int, eps: float) -> np.ndarray:
+    """
+    Guided Filter (He et al.) mit Graustufen-Führungsbild
+
+    Args:
+        guide: float32-Führungsbild (H, W) in 0-1
+        src: float32-Eingabe (H, W) in 0-1, z. B. hochskalierte Maske
+        radius: Fensterradius in Pixeln
+        eps: Regularisierung (kleiner = kantentreuer)
+
+    Returns:
+        Gefilterte float32-Maske (H, W)
+    """
+    ksize = (2 * radius + 1, 2 * radius + 1)
+
+    def box(x: np.ndarray) -> np.ndarray:
+        return cv2.boxFilter(x, cv2.CV_32F, ksize, borderType=cv2.BORDER_REFLECT)
+
+    mean_guide = box(guide)
+    mean_src = box(src)
+    var_guide = box(guide * guide) - mean_guide * mean_guide
+    cov = box(guide * src) - mean_guide * mean_src
+
+    a = cov / (var_guide + eps)
+    b = mean_src - a * mean_guide
+    return box(a) * guide + box(b)
+
+
+class BackgroundRemover:
+    """
+    Hintergrundentfernung mit gepoolten ONNX-Runtime-Sessions
+    """
+
+    def __init__(self, settings: Settings):
+        """
+        Initialisierung (Sessions werden erst bei Bedarf erzeugt)
+
+        Args:
+            settings: Anwendungseinstellungen
+        """
+        self.model_path = Path(settings.BACKGROUND_MODEL_PATH)
+        self.input_size = settings.BACKGROUND_MODEL_INPUT_SIZE
+        self.pool_size = max(1, settings.BACKGROUND_SESSION_POOL_SIZE)
+        self.intra_op_threads = settings.BACKGROUND_INTRA_OP_THREADS
+        self.batch_size = max(1, settings.BACKGROUND_BATCH_SIZE)
+
+        self._sessions: "queue.Queue[ort.InferenceSession]" = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._fixed_batch: Optional[int] = None
+
+    def is_available(self) -> bool:
+        """True, wenn onnxruntime installiert und das Modell vorhanden ist"""
+        return ort is not None and self.model_path.is_file()
+
+    def _create_session(self) -> "ort.InferenceSession":
+        """Neue CPU-Session mit begrenzten Threads"""
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = self.intra_op_threads
+        options.inter_op_num_threads = 1
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session = ort.InferenceSession(
+            str(self.model_path),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+
+        # Modelle mit fester Batch-Dimension können nur einzeln laufen
+        batch_dim = session.get_inputs()[0].shape[0]
+        self._fixed_batch = batch_dim if isinstance(batch_dim, int) else None
+
+        logger.info(f"Background segmentation session created ({self.model_path.name})")
+        return session
+
+    @contextmanager
+    def _session(self) -> Iterator["ort.InferenceSession"]:
+        """Session aus dem Pool leihen; bis pool_size Sessions werden erzeugt"""
+        try:
+            session = self._sessions.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                create = self._created < self.pool_size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    session = self._create_session()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                session = self._sessions.get()
+
+        try:
+            yield session
+        finally:
+            self._sessions.put(session)
+
+    def _preprocess(self, images: List[Image.Image]) -> np.ndarray:
+        """Bilder auf Modellgröße bringen und normalisieren (N, 3, S, S)"""
+        size = (self.input_size, self.input_size)
+        batch = np.empty((len(images), 3, self.input_size, self.input_size), dtype=np.float32)
+        for i, image in enumerate(images):
+            # Maske wird in niedriger Auflösung berechnet; reduce() spart den Großteil der Arbeit
+            small = image.convert("RGB").resize(size, Image.BILINEAR, reducing_gap=2.0)
+            pixels = np.asarray(small, dtype=np.float32) / 255.0
+            batch[i] = ((pixels - _MEAN) / _STD).transpose(2, 0, 1)
+        return batch
+
+    def predict_masks(self, images: List[Image.Image]) -> List[np.ndarray]:
+        """
+        Vordergrundmasken in Modellauflösung berechnen
+
+        Returns:
+            Liste von float32-Masken (S, S) in 0-1
+        """
+        inputs = self._preprocess(images)
+
+        masks = []
+        with self._session() as session:
+            input_name = session.get_inputs()[0].name
+            # Erst nach dem Anlegen der Session ist die Batch-Dimension bekannt
+            chunk = self._fixed_batch or self.batch_size
+            for start in range(0, len(inputs), chunk):
+                output = session.run(None, {input_name: inputs[start:start + chunk]})[0]
+                for prediction in output[:, 0]:
+                    # Auf 0-1 normieren (wie rembg)
+                    low, high = float(prediction.min()), float(prediction.max())
+                    masks.append((prediction - low) / (high - low + 1e-8))
+        return masks
+
+    def refine_mask(self, image: Image.Image, mask: np.ndarray) -> np.ndarray:
+        """
+        Maske auf volle Auflösung bringen und an Bildkanten ausrichten
+
+        Args:
+            image: Originalbild in voller Auflösung
+            mask: float32-Maske in Modellauflösung
+
+        Returns:
+            uint8-Alphamaske (H, W)
+        """
+        width, height = image.size
+        upsampled = cv2.resize(mask.astype(np.float32), (width, height), interpolation=cv2.INTER_LINEAR)
+
+        guide = np.asarray(image.convert("L"), dtype=np.float32) / 255.0
+        radius = max(2, int(max(width, height) * GUIDED_RADIUS_RATIO))
+        refined = guided_filter(guide, upsampled, radius, GUIDED_EPS)
+
+        return (np.clip(refined, 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+
+    def remove_background_batch(self, images: List[Image.Image]) -> List[Image.Image]:
+        """
+        Hintergrund mehrerer Bilder entfernen (ein Inferenzlauf pro Batch)
+
+        Returns:
+            RGBA-Bilder in Originalauflösung
+        """
+        if not images:
+            return []
+
+        masks = self.predict_masks(images)
+        results = []
+        for image, mask in zip(images, masks):
+            cutout = image.convert("RGBA")
+            cutout.putalpha(Image.fromarray(self.refine_mask(image, mask)))
+            results.append(cutout)
+        return results
+
+    def remove_background(self, image: Image.Image) -> Image.Image:
+        """Hintergrund eines Bildes entfernen (RGBA)"""
+        return self.remove_background_batch([image])[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool-Status für Health-Checks"""
+        return {
+            "available": self.is_available(),
+            "model": self.model_path.name,
+            "sessions_created": self._created,
+            "sessions_idle": self._sessions.qsize(),
+            "pool_size": self.pool_size
+        }
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Cancellation
+================================================
+
+Kooperativer Abbruch laufender Jobs:
+- pro Job ein CancellationToken, das der Worker beim Leasen anlegt
+  (DELETE /api/v1/job/{id}, Deadline, Herunterfahren, verlorene Lease)
+- das Token des laufenden Jobs liegt in einer ContextVar; Processor und
+  Img2ImgBatchScheduler lesen es ohne zusätzliche Parameter
+- Diffusers-Pipelines prüfen es über callback_on_step_end nach jedem
+  Denoising-Schritt, der Executor-Thread wird also spätestens nach einem
+  Schritt frei
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import threading
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import structlog
+
+logger = structlog.get_logger()
+
+REASON_CANCELLED = "cancelled"    # Vom Client abgebrochen
+REASON_DEADLINE = "deadline"      # JOB_TIMEOUT_SECONDS überschritten
+REASON_SHUTDOWN = "shutdown"      # Worker fährt herunter, Job wird neu eingereiht
+REASON_LEASE_LOST = "lease_lost"  # Lease abgelaufen, ein anderer Worker übernimmt
+
+_current_token: ContextVar[Optional["CancellationToken"]] = ContextVar("cancellation_token", default=None)
+
+
+class JobCancelled(Exception):
+    """Job wurde kooperativ abgebrochen"""
+
+    def __init__(self, job_id: str, reason: str):
+        self.job_id = job_id
+        self.reason = reason
+        super().__init__(f"Job {job_id} cancelled ({reason})")
+
+
+class CancellationToken:
+    """
+    Threadsicheres Abbruchsignal eines Jobs
+    """
+
+    def __init__(self, job_id: str):
+        """
+        Initialisierung
+
+        Args:
+            job_id: ID des Jobs
+        """
+        self.job_id = job_id
+        self.reason: Optional[str] = None
+
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+
+    def cancel(self, reason: str = REASON_CANCELLED) -> bool:
+        """
+        Abbruch signalisieren (nur der erste Grund zählt)
+
+        Returns:
+            False, wenn das Token bereits abgebrochen war
+        """
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        logger.info(f"Cancelling job {self.job_id} ({reason})")
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.error(f"Cancellation callback failed for job {self.job_id}: {e}")
+        return True
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def exception(self) -> JobCancelled:
+        return JobCancelled(self.job_id, self.reason or REASON_CANCELLED)
+
+    def raise_if_cancelled(self):
+        """JobCancelled auslösen, wenn abgebrochen wurde"""
+        if self._event.is_set():
+            raise self.exception()
+
+    def add_callback(self, callback: Callable[[], None]):
+        """Callback beim Abbruch ausführen (sofort, wenn bereits abgebrochen)"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], None]):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+def current_token() -> Optional[CancellationToken]:
+    """Token des Jobs, in dessen Kontext gerade gearbeitet wird"""
+    return _current_token.get()
+
+
+def bind_token(token: Optional[CancellationToken]):
+    """
+    Token an den aktuellen Kontext binden
+
+    Tasks übernehmen den Kontext bei ihrer Erzeugung; der Worker bindet
+    das Token daher in der Task des Jobs, bevor er den Processor aufruft.
+    """
+    return _current_token.set(token)
+
+
+def raise_if_cancelled():
+    """Abbruch zwischen zwei Verarbeitungsstufen prüfen"""
+    token = _current_token.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+def step_callback(
+    tokens: Sequence[Optional[CancellationToken]]
+) -> Optional[Callable[[Any, int, Any, Dict[str, Any]], Dict[str, Any]]]:
+    """
+    Step-Callback für diffusers (callback_on_step_end)
+
+    Ein Denoising-Lauf kann mehrere Jobs bedienen (Micro-Batching); er
+    wird erst abgebrochen, wenn alle beteiligten Jobs abgebrochen sind.
+
+    Args:
+        tokens: Tokens der Jobs im Lauf
+
+    Returns:
+        Callback oder None, wenn ein Beteiligter nicht abbrechbar ist
+    """
+    if not tokens or any(token is None for token in tokens):
+        return None
+
+    def _callback(pipeline: Any, step: int, timestep: Any, callback_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        if all(token.is_cancelled() for token in tokens):
+            raise tokens[0].exception()
+        return callback_kwargs
+
+    return _callback
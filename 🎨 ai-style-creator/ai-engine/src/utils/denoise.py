@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Denoising
+=============================================
+
+Rauschreduzierung in Stufen, gekachelt auf mehreren Kernen:
+
+Stufen:
+- none:     sauberes Bild, kein Filter
+- fast:     Bilateralfilter (kantenerhaltend, wenige ms)
+- standard: Non-local Means (h=10, bisheriges Verhalten)
+- strong:   Non-local Means (h=15) für stark verrauschte Bilder
+
+Mit "auto" wird die Stufe aus dem gemessenen noise_level (siehe
+utils.image_features) gewählt; saubere Bilder werden nicht gefiltert.
+
+Große Bilder werden in Kacheln zerlegt, die um den Einflussradius des
+Filters (Halo) überlappen. Jede Kachel wird mit Halo gefiltert und nur ihr
+Kern zurückgeschrieben; da jeder Ausgabepixel dieselbe Nachbarschaft wie
+im Vollbild sieht, entstehen keine Nähte. Die Kacheln laufen in einem
+Thread-Pool (OpenCV gibt den GIL frei).
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from utils.image_features import estimate_noise
+
+TIER_NONE = "none"
+TIER_FAST = "fast"
+TIER_STANDARD = "standard"
+TIER_STRONG = "strong"
+TIER_AUTO = "auto"
+TIERS = (TIER_NONE, TIER_FAST, TIER_STANDARD, TIER_STRONG)
+
+# noise_level-Schwellen für "auto" (Untergrenze je Stufe)
+FAST_THRESHOLD = 0.1
+STANDARD_THRESHOLD = 0.3
+STRONG_THRESHOLD = 0.5
+
+# Kachelgröße (Kern ohne Halo); kleinere Bilder werden am Stück gefiltert
+TILE_SIZE = 384
+
+# NLM-Parameter: (h, hColor, templateWindowSize, searchWindowSize)
+_NLM_PARAMS = {
+    TIER_STANDARD: (10, 10, 7, 21),
+    TIER_STRONG: (15, 15, 7, 21)
+}
+
+# Bilateral: (Durchmesser, sigmaColor, sigmaSpace)
+_BILATERAL_PARAMS = (5, 35, 5)
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def measure_noise_level(pixels: np.ndarray) -> float:
+    """noise_level (0-1) eines RGB-Puffers, wie ImageFeatures.noise_level"""
+    gray = cv2.cvtColor(pixels, cv2.COLOR_RGB2GRAY)
+    _, gray_std = cv2.meanStdDev(gray)
+    _, laplacian_std = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_16S))
+    return float(estimate_noise(laplacian_std[0, 0] ** 2, gray_std[0, 0] ** 2))
+
+
+def select_tier(noise_level: float) -> str:
+    """Denoise-Stufe für einen gemessenen noise_level"""
+    if noise_level >= STRONG_THRESHOLD:
+        return TIER_STRONG
+    if noise_level >= STANDARD_THRESHOLD:
+        return TIER_STANDARD
+    if noise_level >= FAST_THRESHOLD:
+        return TIER_FAST
+    return TIER_NONE
+
+
+def _bilateral(tile: np.ndarray) -> np.ndarray:
+    diameter, sigma_color, sigma_space = _BILATERAL_PARAMS
+    return cv2.bilateralFilter(tile, diameter, sigma_color, sigma_space)
+
+
+def _nlm(tier: str) -> Callable[[np.ndarray], np.ndarray]:
+    h, h_color, template, search = _NLM_PARAMS[tier]
+    return lambda tile: cv2.fastNlMeansDenoisingColored(tile, None, h, h_color, template, search)
+
+
+# Stufe -> (Filter, Halo = Einflussradius in Pixeln)
+_FILTERS: Dict[str, Tuple[Callable[[np.ndarray], np.ndarray], int]] = {
+    TIER_FAST: (_bilateral, _BILATERAL_PARAMS[0] // 2),
+    TIER_STANDARD: (_nlm(TIER_STANDARD), _NLM_PARAMS[TIER_STANDARD][2] // 2 + _NLM_PARAMS[TIER_STANDARD][3] // 2),
+    TIER_STRONG: (_nlm(TIER_STRONG), _NLM_PARAMS[TIER_STRONG][2] // 2 + _NLM_PARAMS[TIER_STRONG][3] // 2)
+}
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """Gemeinsamer Kachel-Pool (ein Thread pro Kern)"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=os.cpu_count() or 1, thread_name_prefix="denoise")
+        return _pool
+
+
+def _tile_grid(height: int, width: int, tile_size: int) -> List[Tuple[int, int, int, int]]:
+    """Kacheln als (y0, y1, x0, x1) ohne Halo"""
+    return [
+        (y, min(y + tile_size, height), x, min(x + tile_size, width))
+        for y in range(0, height, tile_size)
+        for x in range(0, width, tile_size)
+    ]
+
+
+def denoise_inplace(
+    pixels: np.ndarray,
+    tier: str = TIER_AUTO,
+    tile_size: int = TILE_SIZE
+) -> str:
+    """
+    RGB-Puffer in-place entrauschen
+
+    Args:
+        pixels: Zusammenhängendes uint8-Array (H, W, 3)
+        tier: Stufe aus TIERS oder "auto" (Wahl über noise_level)
+        tile_size: Kachelgröße ohne Halo
+
+    Returns:
+        Tatsächlich angewendete Stufe
+    """
+    if tier == TIER_AUTO:
+        tier = select_tier(measure_noise_level(pixels))
+    if tier not in TIERS:
+        raise ValueError(f"Unknown denoise tier: {tier}")
+    if tier == TIER_NONE:
+        return tier
+
+    filter_fn, halo = _FILTERS[tier]
+    height, width = pixels.shape[:2]
+    tiles = _tile_grid(height, width, tile_size)
+    workers = os.cpu_count() or 1
+
+    if len(tiles) == 1 or workers == 1:
+        pixels[...] = filter_fn(pixels)
+        return tier
+
+    # Kacheln lesen aus einer unveränderten Kopie, Kerne werden in den Puffer geschrieben
+    source = pixels.copy()
+
+    def process(bounds: Tuple[int, int, int, int]) -> None:
+        y0, y1, x0, x1 = bounds
+        hy0, hy1 = max(0, y0 - halo), min(height, y1 + halo)
+        hx0, hx1 = max(0, x0 - halo), min(width, x1 + halo)
+        filtered = filter_fn(np.ascontiguousarray(source[hy0:hy1, hx0:hx1]))
+        pixels[y0:y1, x0:x1] = filtered[y0 - hy0:y1 - hy0, x0 - hx0:x1 - hx0]
+
+    # list() sammelt Exceptions aus den Worker-Threads ein
+    list(_get_pool().map(process, tiles))
+    return tier
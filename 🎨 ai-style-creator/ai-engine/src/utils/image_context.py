@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Image Context
+=================================================
+
+Pro Job wird der Upload genau einmal decodiert. Der ImageContext hält
+daraus eine kleine Auflösungspyramide (Analyse, Diffusion, Thumbnail),
+die alle Verarbeitungsstufen gemeinsam nutzen:
+- die größte Stufe wird per skaliertem Decode direkt aus der Datei erzeugt
+- kleinere Stufen werden aus der nächstgrößeren abgeleitet
+- Stufen gleicher Größe teilen sich dasselbe Image-Objekt
+- abgeleitete Bilder (z. B. das für die Diffusion vorbereitete Bild)
+  werden einmal berechnet und zwischengespeichert
+
+Die Bilder im Kontext werden nie in-place verändert und können daher von
+Analyse und Enhancement gleichzeitig gelesen werden.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import threading
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from PIL import Image
+
+from utils.image_loading import decode_image, oriented_size
+
+# Stufen der Pyramide
+LEVEL_ANALYSIS = "analysis"
+LEVEL_DIFFUSION = "diffusion"
+LEVEL_THUMBNAIL = "thumbnail"
+
+
+class ImageContext:
+    """
+    Einmal decodiertes Bild eines Jobs mit Auflösungspyramide
+    """
+
+    def __init__(
+        self,
+        source_path: str,
+        source_size: Tuple[int, int],
+        source_format: Optional[str],
+        levels: Dict[str, Image.Image]
+    ):
+        """
+        Initialisierung des Kontexts (siehe ImageContext.load)
+
+        Args:
+            source_path: Pfad zur Originaldatei
+            source_size: Originalgröße nach EXIF-Orientierung
+            source_format: PIL-Format der Originaldatei
+            levels: Stufenname -> decodiertes RGB-Bild
+        """
+        self.source_path = source_path
+        self.source_size = source_size
+        self.source_format = source_format
+        self._levels = levels
+        self._derived: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, image_path: str, level_sizes: Dict[str, int]) -> "ImageContext":
+        """
+        Datei einmal decodieren und die Pyramide aufbauen (blockierend)
+
+        Args:
+            image_path: Pfad zum Eingabebild
+            level_sizes: Stufenname -> maximale Seitenlänge
+
+        Returns:
+            ImageContext mit allen Stufen
+        """
+        ordered = sorted(level_sizes.items(), key=lambda item: item[1], reverse=True)
+
+        with Image.open(image_path) as source:
+            source_size = oriented_size(source)
+            source_format = source.format
+            current = decode_image(source, ordered[0][1])
+
+        # Jede Stufe aus der nächstgrößeren ableiten
+        levels: Dict[str, Image.Image] = {}
+        for name, max_size in ordered:
+            current = decode_image(current, max_size)
+            levels[name] = current
+
+        return cls(image_path, source_size, source_format, levels)
+
+    def get(self, level: str) -> Image.Image:
+        """Bild einer Pyramidenstufe (nicht verändern)"""
+        return self._levels[level]
+
+    @property
+    def levels(self) -> Dict[str, Tuple[int, int]]:
+        """Stufenname -> Größe"""
+        return {name: image.size for name, image in self._levels.items()}
+
+    def derive(self, key: str, factory: Callable[[], Any]) -> Any:
+        """
+        Aus dem Kontext abgeleiteten Wert einmalig berechnen
+
+        Args:
+            key: Eindeutiger Name des abgeleiteten Werts
+            factory: Berechnung (blockierend), wird höchstens einmal ausgeführt
+
+        Returns:
+            Zwischengespeicherter Wert
+        """
+        with self._lock:
+            if key not in self._derived:
+                self._derived[key] = factory()
+            return self._derived[key]
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Image Features
+==================================================
+
+Einmalige, fusionierte Berechnung aller Bildmerkmale, die Analyse,
+Style-Empfehlungen und Qualitätsvalidierung benötigen:
+Graustufen, Helligkeit/Kontrast, Laplacian-Varianz, Sättigung,
+Rauschschätzung, Kanalstatistiken und Kantendichte.
+
+Das Ergebnis wird am Bild gespeichert, sodass weitere Aufrufe mit
+demselben Image-Objekt nichts neu berechnen. Bilder werden in den
+Analysepfaden nicht in-place verändert; nach einer Änderung muss ein
+neues Image-Objekt verwendet werden.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+
+# Attribut, unter dem die Features am PIL-Image gespeichert werden
+FEATURES_ATTR = "_dfp_image_features"
+
+
+@dataclass(frozen=True)
+class ImageFeatures:
+    """Bildmerkmale aus einem fusionierten Durchlauf"""
+    size: Tuple[int, int]
+    mode: str
+    brightness: float
+    contrast: float
+    sharpness: float
+    saturation: float
+    noise_level: float
+    edge_density: float
+    mean_rgb: List[float]
+    stddev_rgb: List[float]
+    extrema: List[Tuple[int, int]]
+
+    def as_properties(self) -> Dict[str, Any]:
+        """Format von ImageProcessor.analyze_image_properties"""
+        return {
+            "brightness": self.brightness,
+            "contrast": self.contrast,
+            "sharpness": self.sharpness,
+            "saturation": self.saturation,
+            "noise_level": self.noise_level,
+            "mean_rgb": list(self.mean_rgb),
+            "stddev_rgb": list(self.stddev_rgb),
+            "extrema": list(self.extrema),
+            "size": self.size,
+            "mode": self.mode
+        }
+
+
+def estimate_noise(laplacian_variance: float, gray_variance: float) -> float:
+    """Rauschpegel (0-1) aus Laplacian- und Graustufen-Varianz"""
+    return min(laplacian_variance / (gray_variance + 1e-7), 1.0)
+
+
+def compute_image_features(image: Image.Image) -> ImageFeatures:
+    """
+    Alle Merkmale in einem Durchlauf berechnen (ohne Memoisierung)
+
+    Jede Zwischenstufe (RGB-Array, Graustufen, Laplacian) wird genau
+    einmal erzeugt; Mittelwerte und Varianzen kommen aus cv2.meanStdDev.
+    """
+    rgb = np.asarray(image if image.mode == "RGB" else image.convert("RGB"))
+
+    # Kanalstatistiken (entspricht ImageStat.Stat: Mittelwert, Populations-Stddev)
+    channel_mean, channel_std = cv2.meanStdDev(rgb)
+    extrema = [cv2.minMaxLoc(channel)[:2] for channel in cv2.split(rgb)]
+
+    gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+    gray_mean, gray_std = cv2.meanStdDev(gray)
+    brightness = float(gray_mean[0, 0])
+    contrast = float(gray_std[0, 0])
+
+    # Schärfe und Rauschen teilen sich denselben Laplacian
+    # (int16 ist für uint8-Eingaben verlustfrei und halb so groß wie float64)
+    _, laplacian_std = cv2.meanStdDev(cv2.Laplacian(gray, cv2.CV_16S))
+    sharpness = float(laplacian_std[0, 0] ** 2)
+
+    saturation = float(cv2.mean(cv2.cvtColor(rgb, cv2.COLOR_RGB2HSV))[1])
+
+    edges = cv2.Canny(gray, 50, 150)
+    edge_density = cv2.countNonZero(edges) / edges.size
+
+    return ImageFeatures(
+        size=image.size,
+        mode=image.mode,
+        brightness=brightness,
+        contrast=contrast,
+        sharpness=sharpness,
+        saturation=saturation,
+        noise_level=float(estimate_noise(sharpness, contrast ** 2)),
+        edge_density=float(edge_density),
+        mean_rgb=[float(v) for v in channel_mean[:, 0]],
+        stddev_rgb=[float(v) for v in channel_std[:, 0]],
+        extrema=[(int(lo), int(hi)) for lo, hi in extrema]
+    )
+
+
+def get_image_features(image: Image.Image) -> ImageFeatures:
+    """
+    Memoisierte Bildmerkmale für ein PIL-Image
+
+    Returns:
+        ImageFeatures (beim ersten Aufruf berechnet, danach aus dem Bild gelesen)
+    """
+    features = getattr(image, FEATURES_ATTR, None)
+    if features is None or features.size != image.size:
+        features = compute_image_features(image)
+        setattr(image, FEATURES_ATTR, features)
+    return features
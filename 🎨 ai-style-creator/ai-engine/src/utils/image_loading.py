@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Image Loading
+=================================================
+
+Decodierung in der Zielauflösung statt Voll-Decode mit anschließendem
+Verkleinern:
+- JPEG: DCT-Skalierung des Decoders (Image.draft, Faktor 1/2, 1/4, 1/8)
+- PNG/WebP: kein skalierter Decode möglich; stattdessen ganzzahliges
+  Box-Reduce (Image.reduce) vor dem finalen LANCZOS-Schritt
+- EXIF-Orientierung wird genau einmal beim Decodieren angewendet
+
+Der Decoder liefert mindestens das reducing_gap-fache der Zielgröße, damit
+der abschließende LANCZOS-Schritt dieselbe Qualität wie bisher erreicht.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+from pathlib import Path
+from typing import Optional, Tuple, Union
+
+from PIL import Image, ImageOps
+
+# Mindestabstand zwischen Decode- und Zielgröße (wie Image.thumbnail)
+DEFAULT_REDUCING_GAP = 2.0
+
+# EXIF-Orientierungen, bei denen Breite und Höhe vertauscht werden
+_TRANSPOSED_ORIENTATIONS = (5, 6, 7, 8)
+_EXIF_ORIENTATION_TAG = 0x0112
+
+
+def fit_size(size: Tuple[int, int], box: Tuple[int, int]) -> Tuple[int, int]:
+    """
+    Größe proportional in eine Box einpassen (nur verkleinern)
+
+    Args:
+        size: (Breite, Höhe) des Bildes
+        box: Maximale (Breite, Höhe)
+
+    Returns:
+        Neue (Breite, Höhe); unverändert, wenn das Bild bereits passt
+    """
+    width, height = size
+    box_width, box_height = box
+    if width <= box_width and height <= box_height:
+        return width, height
+
+    if width * box_height >= height * box_width:
+        return box_width, max(1, int((height * box_width) / width))
+    return max(1, int((width * box_height) / height)), box_height
+
+
+def oriented_size(image: Image.Image) -> Tuple[int, int]:
+    """Bildgröße nach Anwendung der EXIF-Orientierung (ohne Decodieren)"""
+    orientation = image.getexif().get(_EXIF_ORIENTATION_TAG, 1)
+    if orientation in _TRANSPOSED_ORIENTATIONS:
+        return image.height, image.width
+    return image.size
+
+
+def is_decoded(image: Image.Image) -> bool:
+    """True, wenn die Pixeldaten bereits geladen sind"""
+    return not getattr(image, "tile", None)
+
+
+def apply_exif_orientation(image: Image.Image) -> Image.Image:
+    """
+    EXIF-Orientierung in-place anwenden
+
+    Das Orientierungs-Tag wird dabei entfernt; ein zweiter Aufruf ist
+    daher wirkungslos.
+    """
+    ImageOps.exif_transpose(image, in_place=True)
+    return image
+
+
+def decode_image(
+    image: Image.Image,
+    max_size: Optional[Union[int, Tuple[int, int]]] = None,
+    mode: Optional[str] = "RGB",
+    reducing_gap: float = DEFAULT_REDUCING_GAP
+) -> Image.Image:
+    """
+    Geöffnetes Bild in der benötigten Auflösung decodieren
+
+    Args:
+        image: Frisch mit Image.open geöffnetes (oder bereits geladenes) Bild
+        max_size: Längste Seite oder (Breite, Höhe)-Box; None = volle Auflösung
+        mode: Zielmodus (None = Modus beibehalten)
+        reducing_gap: Mindestfaktor zwischen Decode- und Zielgröße
+
+    Returns:
+        Orientiertes, konvertiertes und ggf. verkleinertes Bild
+    """
+    box = (max_size, max_size) if isinstance(max_size, int) else max_size
+
+    if not is_decoded(image):
+        if box is not None:
+            # Zielgröße in Speicherorientierung (Drehung tauscht die Achsen)
+            stored_box = box
+            if oriented_size(image) != image.size:
+                stored_box = (box[1], box[0])
+            target = fit_size(image.size, stored_box)
+            if target != image.size:
+                # JPEG wählt die kleinste DCT-Skalierung >= angefragter Größe;
+                # andere Formate ignorieren draft()
+                image.draft(None, (int(target[0] * reducing_gap), int(target[1] * reducing_gap)))
+        image.load()
+        apply_exif_orientation(image)
+
+    if mode is not None and image.mode != mode:
+        image = image.convert(mode)
+
+    if box is not None:
+        target = fit_size(image.size, box)
+        if target != image.size:
+            # reducing_gap: ganzzahliges Box-Reduce vor dem LANCZOS-Schritt
+            image = image.resize(target, Image.LANCZOS, reducing_gap=reducing_gap)
+
+    return image
+
+
+def load_image(
+    source: Union[str, Path],
+    max_size: Optional[Union[int, Tuple[int, int]]] = None,
+    mode: Optional[str] = "RGB",
+    reducing_gap: float = DEFAULT_REDUCING_GAP
+) -> Image.Image:
+    """
+    Bild von Disk laden, orientieren und in Zielauflösung decodieren
+
+    Args:
+        source: Dateipfad
+        max_size: Längste Seite oder (Breite, Höhe)-Box; None = volle Auflösung
+        mode: Zielmodus (None = Modus beibehalten)
+        reducing_gap: Mindestfaktor zwischen Decode- und Zielgröße
+
+    Returns:
+        Vollständig geladenes PIL Image
+    """
+    # Pixeldaten sind nach decode_image geladen; nur das Dateihandle wird geschlossen
+    with Image.open(source) as image:
+        return decode_image(image, max_size, mode, reducing_gap)
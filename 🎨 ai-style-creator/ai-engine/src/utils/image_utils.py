@@ -12,12 +12,28 @@ Version: 1.0.0
 
 import numpy as np
 import cv2
-from PIL import Image, ImageEnhance, ImageFilter, ImageOps, ImageStat
-from typing import Tuple, List, Dict, Any, Optional
+from PIL import Image, ImageEnhance, ImageFilter, ImageOps
+from typing import TYPE_CHECKING, Tuple, List, Dict, Any, Optional
 import colorsys
-from sklearn.cluster import KMeans
 import structlog
 
+from utils.denoise import TIER_AUTO
+from utils.image_features import get_image_features
+from utils.image_loading import decode_image
+from utils.palette import extract_palette
+from utils.post_processing import (
+    OP_AUTO_EXPOSURE,
+    OP_DENOISE,
+    OP_ENHANCE_COLORS,
+    OP_SHARPEN,
+    post_process,
+    selected_operations
+)
+from utils.renditions import WEB_MAX_SIZE, WEB_QUALITY
+
+if TYPE_CHECKING:
+    from utils.background_removal import BackgroundRemover
+
 logger = structlog.get_logger()
 
 
@@ -26,15 +42,25 @@ class ImageProcessor:
     Hauptklasse für Bildverarbeitung und -optimierung
     """
     
-    def __init__(self):
-        """Initialisierung des Image Processors"""
+    def __init__(self, background_remover: Optional["BackgroundRemover"] = None):
+        """
+        Initialisierung des Image Processors
+        
+        Args:
+            background_remover: Segmentierungs-Engine für remove_background
+                (ohne Engine oder Modell wird die Schwellwert-Methode genutzt)
+        """
         self.supported_formats = ["JPEG", "PNG", "WEBP", "BMP"]
+        self.background_remover = background_remover
         logger.info("ImageProcessor initialized")
 
     def resize_image(self, image: Image.Image, max_size: int = 1024) -> Image.Image:
         """
         Ändere Bildgröße bei Beibehaltung des Seitenverhältnisses
         
+        Noch nicht decodierte Bilder (frisch aus Image.open) werden direkt
+        in reduzierter Auflösung decodiert und EXIF-orientiert.
+        
         Args:
             image: PIL Image
             max_size: Maximale Größe für längste Seite
@@ -46,24 +72,10 @@ class ImageProcessor:
             # Aktuelle Dimensionen
             width, height = image.size
             
-            # Berechne neue Dimensionen
-            if width > height:
-                if width > max_size:
-                    new_width = max_size
-                    new_height = int((height * max_size) / width)
-                else:
-                    new_width, new_height = width, height
-            else:
-                if height > max_size:
-                    new_height = max_size
-                    new_width = int((width * max_size) / height)
-                else:
-                    new_width, new_height = width, height
-            
-            # Resize mit hochwertiger Resampling
-            resized = image.resize((new_width, new_height), Image.LANCZOS)
+            # Skalierter Decode bzw. Box-Reduce vor dem LANCZOS-Schritt
+            resized = decode_image(image, max_size, mode=None)
             
-            logger.debug(f"Image resized from {width}x{height} to {new_width}x{new_height}")
+            logger.debug(f"Image resized from {width}x{height} to {resized.width}x{resized.height}")
             return resized
             
         except Exception as e:
@@ -138,43 +150,21 @@ class ImageProcessor:
             Post-processed Bild
         """
         try:
-            processed = image.copy()
-            
-            # Farbverbesserungen
-            if options.get("enhance_colors", False):
-                processed = self.enhance_colors(processed)
-            
-            # Schärfe-Verbesserung
-            if options.get("sharpen", False):
-                processed = self.sharpen_image(processed)
-            
-            # Rauschreduzierung
-            if options.get("denoise", False):
-                processed = self.reduce_noise(processed)
-            
-            # Belichtungskorrektur
-            if options.get("auto_exposure", False):
-                processed = self.auto_exposure_correction(processed)
-            
-            return processed
+            # Eine Konvertierung nach numpy, alle Operationen auf demselben Puffer
+            return post_process(
+                image, 
+                selected_operations(options), 
+                options.get("denoise_tier", TIER_AUTO)
+            )
             
         except Exception as e:
             logger.error(f"Post-processing failed: {e}")
             return image
 
     def enhance_colors(self, image: Image.Image) -> Image.Image:
-        """Verbessere Farbqualität"""
+        """Verbessere Farbqualität (Sättigung 1.15, Helligkeit 1.05)"""
         try:
-            # Farbsättigung erhöhen
-            enhancer = ImageEnhance.Color(image)
-            saturated = enhancer.enhance(1.15)
-            
-            # Lebendigkeit erhöhen
-            enhancer = ImageEnhance.Brightness(saturated)
-            brightened = enhancer.enhance(1.05)
-            
-            return brightened
-            
+            return post_process(image, (OP_ENHANCE_COLORS,))
         except Exception as e:
             logger.error(f"Color enhancement failed: {e}")
             return image
@@ -182,44 +172,32 @@ class ImageProcessor:
     def sharpen_image(self, image: Image.Image) -> Image.Image:
         """Schärfe das Bild"""
         try:
-            return image.filter(ImageFilter.UnsharpMask(radius=2, percent=150, threshold=3))
+            return post_process(image, (OP_SHARPEN,))
         except Exception as e:
             logger.error(f"Sharpening failed: {e}")
             return image
 
-    def reduce_noise(self, image: Image.Image) -> Image.Image:
-        """Reduziere Bildrauschen"""
-        try:
-            # Konvertiere zu numpy für OpenCV
-            img_array = np.array(image)
-            
-            # Non-local Means Denoising
-            denoised = cv2.fastNlMeansDenoisingColored(img_array, None, 10, 10, 7, 21)
-            
-            return Image.fromarray(denoised)
+    def reduce_noise(self, image: Image.Image, tier: str = TIER_AUTO) -> Image.Image:
+        """
+        Reduziere Bildrauschen
+        
+        Args:
+            image: Eingabebild
+            tier: none, fast, standard, strong oder auto (nach noise_level)
             
+        Returns:
+            Entrauschtes Bild
+        """
+        try:
+            return post_process(image, (OP_DENOISE,), tier)
         except Exception as e:
             logger.error(f"Noise reduction failed: {e}")
             return image
 
     def auto_exposure_correction(self, image: Image.Image) -> Image.Image:
-        """Automatische Belichtungskorrektur"""
+        """Automatische Belichtungskorrektur (CLAHE auf dem L-Kanal)"""
         try:
-            # Histogram-Analyse
-            img_array = np.array(image)
-            
-            # CLAHE (Contrast Limited Adaptive Histogram Equalization)
-            lab = cv2.cvtColor(img_array, cv2.COLOR_RGB2LAB)
-            l, a, b = cv2.split(lab)
-            
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-            l = clahe.apply(l)
-            
-            corrected = cv2.merge([l, a, b])
-            corrected = cv2.cvtColor(corrected, cv2.COLOR_LAB2RGB)
-            
-            return Image.fromarray(corrected)
-            
+            return post_process(image, (OP_AUTO_EXPOSURE,))
         except Exception as e:
             logger.error(f"Exposure correction failed: {e}")
             return image
@@ -235,56 +213,13 @@ class ImageProcessor:
             Dict mit Bildstatistiken
         """
         try:
-            # Grundlegende Statistiken
-            stat = ImageStat.Stat(image)
-            
-            # RGB zu numpy
-            img_array = np.array(image)
-            gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-            
-            # Verschiedene Metriken berechnen
-            brightness = np.mean(gray)
-            contrast = np.std(gray)
-            
-            # Schärfe messen (Laplacian Variance)
-            sharpness = cv2.Laplacian(gray, cv2.CV_64F).var()
-            
-            # Farbsättigung
-            hsv = cv2.cvtColor(img_array, cv2.COLOR_RGB2HSV)
-            saturation = np.mean(hsv[:, :, 1])
-            
-            # Rauscheinschätzung
-            noise_level = self._estimate_noise(gray)
-            
-            return {
-                "brightness": float(brightness),
-                "contrast": float(contrast),
-                "sharpness": float(sharpness),
-                "saturation": float(saturation),
-                "noise_level": float(noise_level),
-                "mean_rgb": stat.mean,
-                "stddev_rgb": stat.stddev,
-                "extrema": stat.extrema,
-                "size": image.size,
-                "mode": image.mode
-            }
+            # Fusionierter, pro Bild memoisierter Durchlauf
+            return get_image_features(image).as_properties()
             
         except Exception as e:
             logger.error(f"Image analysis failed: {e}")
             return {}
 
-    def _estimate_noise(self, gray_image: np.ndarray) -> float:
-        """Schätze Rauschpegel im Bild"""
-        try:
-            # Verwende Laplacian für Rauscheinschätzung
-            laplacian = cv2.Laplacian(gray_image, cv2.CV_64F)
-            noise_estimate = laplacian.var() / (gray_image.var() + 1e-7)
-            return min(noise_estimate, 1.0)  # Normalisiere auf 0-1
-            
-        except Exception as e:
-            logger.error(f"Noise estimation failed: {e}")
-            return 0.0
-
     def extract_dominant_colors(self, image: Image.Image, num_colors: int = 5) -> List[Dict[str, Any]]:
         """
         Extrahiere dominante Farben aus dem Bild
@@ -298,19 +233,15 @@ class ImageProcessor:
         """
         try:
             # Resize für Performance
-            small_image = image.resize((150, 150))
-            img_array = np.array(small_image)
-            
-            # Reshape für KMeans
-            pixels = img_array.reshape((-1, 3))
+            small_image = image.convert("RGB").resize((150, 150))
+            pixels = np.asarray(small_image).reshape((-1, 3))
             
-            # KMeans Clustering
-            kmeans = KMeans(n_clusters=num_colors, random_state=42, n_init=10)
-            kmeans.fit(pixels)
+            # Histogramm-Quantisierung mit Verfeinerung (deterministisch)
+            centers, shares = extract_palette(pixels, num_colors)
             
             colors = []
-            for i, color in enumerate(kmeans.cluster_centers_):
-                rgb = tuple(map(int, color))
+            for color, share in zip(centers, shares):
+                rgb = tuple(int(round(c)) for c in color)
                 
                 # Zusätzliche Farbinformationen
                 hsv = colorsys.rgb_to_hsv(rgb[0]/255, rgb[1]/255, rgb[2]/255)
@@ -327,12 +258,10 @@ class ImageProcessor:
                         "value": hsv[2] * 100
                     },
                     "name": color_name,
-                    "percentage": float(np.sum(kmeans.labels_ == i) / len(kmeans.labels_) * 100)
+                    "percentage": float(share * 100)
                 })
             
-            # Sortiere nach Häufigkeit
-            colors.sort(key=lambda x: x["percentage"], reverse=True)
-            
+            # extract_palette liefert bereits nach Häufigkeit sortiert
             return colors
             
         except Exception as e:
@@ -372,31 +301,29 @@ class ImageProcessor:
     def create_thumbnail(self, image: Image.Image, size: Tuple[int, int] = (256, 256)) -> Image.Image:
         """Erstelle Thumbnail mit Seitenverhältnis"""
         try:
-            # Kopie erstellen
-            thumb = image.copy()
-            
-            # Thumbnail erstellen (behält Seitenverhältnis bei)
-            thumb.thumbnail(size, Image.LANCZOS)
+            # Thumbnail erstellen (behält Seitenverhältnis bei); resize()
+            # liefert ein neues Bild, eine Vollkopie vorab ist nicht nötig
+            thumb = decode_image(image, size, mode=None)
             
-            return thumb
+            return thumb if thumb is not image else image.copy()
             
         except Exception as e:
             logger.error(f"Thumbnail creation failed: {e}")
             return image
 
-    def create_web_optimized(self, image: Image.Image, quality: int = 85) -> Image.Image:
-        """Erstelle web-optimierte Version"""
+    def create_web_optimized(self, image: Image.Image, quality: int = WEB_QUALITY) -> Image.Image:
+        """
+        Erstelle web-optimierte Version (Größe und Farbmodus)
+        
+        Die JPEG-Komprimierung mit `quality` erfolgt erst beim Speichern
+        (Rendition "web" in utils.renditions), nicht durch Encodieren und
+        erneutes Decodieren im Speicher.
+        """
         try:
             # Web-optimale Größe
-            web_image = self.resize_image(image, 1200)
-            
-            # Leichte Komprimierung für Web
-            from io import BytesIO
-            output = BytesIO()
-            web_image.save(output, format='JPEG', quality=quality, optimize=True)
-            output.seek(0)
+            web_image = self.resize_image(image, WEB_MAX_SIZE)
             
-            return Image.open(output)
+            return web_image if web_image.mode == "RGB" else web_image.convert("RGB")
             
         except Exception as e:
             logger.error(f"Web optimization failed: {e}")
@@ -404,8 +331,37 @@ class ImageProcessor:
 
     def remove_background(self, image: Image.Image) -> Image.Image:
         """
-        Einfache Background-Entfernung für Produktfotos
-        (Vereinfachte Version - für Production würde rembg oder U2Net verwendet)
+        Background-Entfernung für Produktfotos
+        
+        Nutzt die ONNX-Segmentierung (utils.background_removal), wenn
+        verfügbar; sonst die Schwellwert-Methode für weiße Hintergründe.
+        """
+        if self._segmentation_available():
+            try:
+                return self.background_remover.remove_background(image)
+            except Exception as e:
+                logger.error(f"Segmentation background removal failed, using threshold: {e}")
+        
+        return self._remove_background_threshold(image)
+
+    def remove_background_batch(self, images: List[Image.Image]) -> List[Image.Image]:
+        """Background-Entfernung für mehrere Bilder (ein Inferenzlauf pro Batch)"""
+        if self._segmentation_available():
+            try:
+                return self.background_remover.remove_background_batch(images)
+            except Exception as e:
+                logger.error(f"Batch background removal failed, using threshold: {e}")
+        
+        return [self._remove_background_threshold(image) for image in images]
+
+    def _segmentation_available(self) -> bool:
+        """True, wenn eine Segmentierungs-Engine mit Modell konfiguriert ist"""
+        return self.background_remover is not None and self.background_remover.is_available()
+
+    def _remove_background_threshold(self, image: Image.Image) -> Image.Image:
+        """
+        Einfache Background-Entfernung für Produktfotos auf weißem Hintergrund
+        (Helligkeits-Schwellwert + Morphologie)
         """
         try:
             # Konvertiere zu RGBA für Transparenz
@@ -503,7 +459,7 @@ class ImageProcessor:
             Dict mit Qualitätsbewertung und Empfehlungen
         """
         try:
-            props = self.analyze_image_properties(image)
+            props = get_image_features(image).as_properties()
             
             quality_score = 100.0
             issues = []
@@ -569,17 +525,16 @@ class ImageProcessor:
 
 
 # Utility Functions
-def load_image_safe(file_path: str) -> Optional[Image.Image]:
-    """Sicheres Laden von Bildern mit Error Handling"""
+def load_image_safe(file_path: str, max_size: Optional[int] = None) -> Optional[Image.Image]:
+    """Sicheres Laden von Bildern mit Error Handling (EXIF-orientiert)"""
     try:
-        image = Image.open(file_path)
-        
-        # Grundlegende Validierung
-        if image.width < 10 or image.height < 10:
-            logger.warning(f"Image too small: {image.size}")
-            return None
-        
-        return image
+        with Image.open(file_path) as image:
+            # Grundlegende Validierung anhand des Headers, vor dem Decodieren
+            if image.width < 10 or image.height < 10:
+                logger.warning(f"Image too small: {image.size}")
+                return None
+            
+            return decode_image(image, max_size, mode=None)
         
     except Exception as e:
         logger.error(f"Failed to load image {file_path}: {e}")
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Inference Executor
+======================================================
+
+Dedizierter Thread-Pool für blockierende Modell- und Bildverarbeitungs-
+Aufrufe (Diffusion, BLIP, OpenCV). Hält den uvicorn Event-Loop frei,
+damit /health und Status-Abfragen während einer Generierung antworten.
+
+Threads statt Prozesse: torch und OpenCV geben den GIL frei und die
+Modelle liegen nur einmal im Speicher.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+class InferenceExecutor:
+    """
+    Begrenzter Worker-Pool für blockierende Inferenz-Aufrufe
+    """
+
+    def __init__(self, max_workers: int = 4):
+        """
+        Initialisierung des Executors
+
+        Args:
+            max_workers: Parallele blockierende Aufrufe (MAX_CONCURRENT_JOBS)
+        """
+        self.max_workers = max(1, max_workers)
+
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        self._slots: Optional[asyncio.Semaphore] = None
+
+        # Statistiken
+        self._calls_running = 0
+        self._calls_waiting = 0
+        self._calls_completed = 0
+
+        logger.info(f"InferenceExecutor initialized (workers={self.max_workers})")
+
+    # ================================================
+    # Blockierende Aufrufe
+    # ================================================
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """
+        Blockierende Funktion im Inferenz-Pool ausführen
+
+        Es laufen höchstens max_workers Aufrufe gleichzeitig; weitere warten
+        im Event-Loop statt im unbegrenzten Queue des ThreadPoolExecutors.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+        self._calls_waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._calls_waiting -= 1
+
+        self._calls_running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._pool, functools.partial(fn, *args, **kwargs))
+        finally:
+            self._calls_running -= 1
+            self._calls_completed += 1
+            self._slots.release()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Auslastung für Monitoring"""
+        return {
+            "workers": self.max_workers,
+            "calls_running": self._calls_running,
+            "calls_waiting": self._calls_waiting,
+            "calls_completed": self._calls_completed
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Pool beenden"""
+        self._pool.shutdown(wait=wait, cancel_futures=True)
+
+
+_executor: Optional[InferenceExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_inference_executor(settings: Any) -> InferenceExecutor:
+    """
+    Prozessweiter Executor, geteilt von AIStyleProcessor und ContentGenerator
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = InferenceExecutor(max_workers=settings.MAX_CONCURRENT_JOBS)
+        return _executor
+
+
+def shutdown_inference_executor():
+    """Prozessweiten Executor beim Herunterfahren beenden"""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+            _executor = None
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Job Progress & Previews
+===========================================================
+
+Schrittgenauer Fortschritt und Zwischenbilder laufender Diffusion-Jobs:
+- die Step-Callbacks der Pipelines melden jeden Denoising-Schritt an den
+  JobProgressReporter des Jobs (ContextVar, wie das CancellationToken)
+- der Fortschritt wird aus den erwarteten Schritten aller Stufen berechnet
+  und in die Job-Queue geschrieben
+- alle PREVIEW_EVERY_N_STEPS Schritte wird aus den Latents eine
+  Vorschau erzeugt: lineare Näherung Latent -> RGB statt VAE-Decode
+  (Latent-Auflösung, ~0,1 ms), hochskaliert auf PREVIEW_SIZE
+- Vorschauen liegen als JSON im PreviewStore (Dateisystem), damit die API
+  sie auch aus separaten Worker-Prozessen per SSE ausliefern kann
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import asyncio
+import base64
+import json
+import os
+import threading
+import time
+from contextvars import ContextVar
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+import structlog
+
+logger = structlog.get_logger()
+
+# Lineare Abbildung der 4 SD-1.x-Latent-Kanäle auf RGB (Bereich ca. -1..1)
+LATENT_RGB_FACTORS = np.array([
+    [0.3512, 0.2297, 0.3227],
+    [0.3250, 0.4974, 0.2350],
+    [-0.2829, 0.1762, 0.2721],
+    [-0.2120, -0.2616, -0.7177]
+], dtype=np.float32)
+
+PREVIEW_JPEG_QUALITY = 70
+
+_current_reporter: ContextVar[Optional["JobProgressReporter"]] = ContextVar("progress_reporter", default=None)
+
+
+def latents_to_preview(latents: Any, size: int = 256) -> Image.Image:
+    """
+    Latents eines Samples als RGB-Vorschau (ohne VAE)
+
+    Args:
+        latents: Tensor (4, H/8, W/8) bzw. (1, 4, H/8, W/8) oder ndarray
+        size: Längste Seite der Vorschau
+    """
+    if hasattr(latents, "detach"):
+        latents = latents.detach().float().cpu().numpy()
+    latents = np.asarray(latents, dtype=np.float32).reshape(-1, *np.shape(latents)[-2:])[:4]
+
+    rgb = np.einsum("chw,cd->hwd", latents, LATENT_RGB_FACTORS)
+    pixels = np.clip((rgb + 1.0) * 127.5, 0, 255).astype(np.uint8)
+    preview = Image.fromarray(pixels)
+
+    scale = size / max(preview.size)
+    return preview.resize(
+        (max(1, round(preview.width * scale)), max(1, round(preview.height * scale))),
+        Image.BILINEAR
+    )
+
+
+class PreviewStore:
+    """
+    Letzte Vorschau pro Job als JSON-Datei (atomar ersetzt)
+    """
+
+    def __init__(self, preview_dir: str):
+        self.preview_dir = Path(preview_dir)
+        self.preview_dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, job_id: str) -> Path:
+        return self.preview_dir / f"{job_id}.json"
+
+    def write(self, job_id: str, event: Dict[str, Any]):
+        """Vorschau-Event schreiben (blockierend)"""
+        path = self._path(job_id)
+        part_path = path.with_suffix(".part")
+        try:
+            part_path.write_text(json.dumps(event))
+            os.replace(part_path, path)
+        except OSError as e:
+            logger.warning(f"Failed to write preview for job {job_id}: {e}")
+            part_path.unlink(missing_ok=True)
+
+    def read(self, job_id: str, newer_than: float = 0.0) -> Optional[Tuple[float, Dict[str, Any]]]:
+        """
+        Vorschau lesen, falls seit newer_than (mtime) aktualisiert (blockierend)
+
+        Returns:
+            (mtime, Event) oder None
+        """
+        path = self._path(job_id)
+        try:
+            mtime = path.stat().st_mtime
+            if mtime <= newer_than:
+                return None
+            return mtime, json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None
+
+    def delete(self, job_id: str):
+        self._path(job_id).unlink(missing_ok=True)
+
+
+class JobProgressReporter:
+    """
+    Schrittfortschritt und Vorschauen eines Jobs
+
+    Wird aus Executor-Threads aufgerufen; Queue-Updates laufen über den
+    Event-Loop des Jobs.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        publish_progress: Optional[Callable[[int], Awaitable[None]]] = None,
+        preview_store: Optional[PreviewStore] = None,
+        preview_every: int = 5,
+        preview_size: int = 256,
+        progress_range: Tuple[int, int] = (30, 90)
+    ):
+        """
+        Initialisierung (im Event-Loop des Jobs)
+
+        Args:
+            job_id: ID des Jobs
+            publish_progress: Coroutine-Funktion, die den Fortschritt speichert
+            preview_store: Ablage der Vorschauen (None = keine Vorschauen)
+            preview_every: Vorschau alle N Schritte (und am Ende jeder Stufe)
+            preview_size: Längste Seite der Vorschau
+            progress_range: Fortschrittsbereich (%) der Diffusionsstufen
+        """
+        self.job_id = job_id
+        self.publish_progress = publish_progress
+        self.preview_store = preview_store
+        self.preview_every = max(1, preview_every)
+        self.preview_size = preview_size
+        self.progress_range = progress_range
+
+        self._loop = asyncio.get_running_loop()
+        self._lock = threading.Lock()
+        self._stages: Dict[str, Tuple[int, int]] = {}  # Stufe -> (Schritte davor, Schritte)
+        self._total_steps = 0
+        self._progress = progress_range[0]
+        self._preview_failed = False
+
+    def set_stages(self, stages: Dict[str, int]):
+        """Erwartete Denoising-Schritte pro Stufe in Ausführungsreihenfolge"""
+        with self._lock:
+            offset = 0
+            self._stages = {}
+            for stage, steps in stages.items():
+                if steps > 0:
+                    self._stages[stage] = (offset, steps)
+                    offset += steps
+            self._total_steps = offset
+
+    def on_step(self, stage: str, step: int, latents: Any):
+        """
+        Denoising-Schritt melden (aus dem Step-Callback, blockierend)
+
+        Args:
+            stage: Stufe aus set_stages
+            step: Index des Schritts innerhalb der Stufe (0-basiert)
+            latents: Latents des Samples dieses Jobs
+        """
+        with self._lock:
+            if stage not in self._stages:
+                return
+            offset, steps = self._stages[stage]
+            done = min(step + 1, steps)
+
+            low, high = self.progress_range
+            progress = low + (high - low) * (offset + done) // self._total_steps
+            publish = progress > self._progress
+            if publish:
+                self._progress = progress
+
+        if publish and self.publish_progress:
+            asyncio.run_coroutine_threadsafe(self.publish_progress(progress), self._loop)
+
+        if self.preview_store and (done % self.preview_every == 0 or done == steps):
+            self._write_preview(stage, done, steps, progress, latents)
+
+    def _write_preview(self, stage: str, step: int, steps: int, progress: int, latents: Any):
+        """Vorschau erzeugen und ablegen; Fehler brechen den Job nicht ab"""
+        try:
+            buffer = BytesIO()
+            latents_to_preview(latents, self.preview_size).save(buffer, "JPEG", quality=PREVIEW_JPEG_QUALITY)
+            self.preview_store.write(self.job_id, {
+                "job_id": self.job_id,
+                "stage": stage,
+                "step": step,
+                "steps": steps,
+                "progress": progress,
+                "image": "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode(),
+                "created_at": time.time()
+            })
+        except Exception as e:
+            if not self._preview_failed:
+                logger.warning(f"Preview generation failed for job {self.job_id}: {e}")
+                self._preview_failed = True
+
+    def close(self):
+        """Vorschau nach Jobende entfernen (das Ergebnis ersetzt sie)"""
+        if self.preview_store:
+            self.preview_store.delete(self.job_id)
+
+
+def current_reporter() -> Optional[JobProgressReporter]:
+    """Reporter des Jobs, in dessen Kontext gerade gearbeitet wird"""
+    return _current_reporter.get()
+
+
+def bind_reporter(reporter: Optional[JobProgressReporter]):
+    """Reporter an den aktuellen Kontext binden (Rückgabe für unbind_reporter)"""
+    return _current_reporter.set(reporter)
+
+
+def unbind_reporter(binding: Any):
+    _current_reporter.reset(binding)
@@ -0,0 +1,709 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Job Queue
+=============================================
+
+Persistente Job-Queue auf SQLite-Basis (kein Redis nötig).
+
+Features:
+- Jobs überleben Neustarts der API
+- Prioritäten pro User und pro Batch, faire Verteilung zwischen Usern
+- At-least-once-Zustellung über Leases mit Visibility-Timeout
+- Harte Laufzeitgrenze über JOB_TIMEOUT_SECONDS (pro Versuch, ab dem Lease)
+- Mehrere Worker-Prozesse können dieselbe Datenbank konsumieren
+- Abbruch wartender und laufender Jobs (Worker fragen cancelled ab)
+- Statistiken separater Worker-Prozesse (worker_stats) für die API
+
+Ablauf:
+    queued -> processing (Lease) -> completed | failed | cancelled
+    Abgelaufene Leases gehen zurück nach queued, bis JOB_MAX_ATTEMPTS
+    erreicht ist.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import asyncio
+import json
+import math
+import sqlite3
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import structlog
+
+from config.settings import Settings
+
+logger = structlog.get_logger()
+
+JOB_TYPE_IMAGE = "image_processing"
+JOB_TYPE_CONTENT = "content_generation"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    job_type TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    user_id TEXT,
+    batch_id TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL,
+    progress INTEGER NOT NULL DEFAULT 0,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    available_at REAL NOT NULL,
+    deadline_at REAL,
+    result TEXT,
+    error_message TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_dispatch ON jobs (status, priority, available_at, created_at);
+CREATE INDEX IF NOT EXISTS idx_jobs_batch ON jobs (batch_id);
+CREATE TABLE IF NOT EXISTS batches (
+    id TEXT PRIMARY KEY,
+    user_id TEXT,
+    priority INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS worker_stats (
+    worker_id TEXT NOT NULL,
+    name TEXT NOT NULL,
+    stats TEXT NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (worker_id, name)
+);
+"""
+
+# Nächster Job: höchste Priorität, dann User mit den wenigsten laufenden Jobs
+DISPATCH_QUERY = """
+SELECT j.id FROM jobs j
+WHERE j.status = 'queued' AND j.available_at <= ?
+ORDER BY
+    j.priority DESC,
+    (SELECT COUNT(*) FROM jobs p WHERE p.status = 'processing' AND p.user_id IS j.user_id) ASC,
+    j.created_at ASC
+LIMIT 1
+"""
+
+
+class JobQueueFullError(Exception):
+    """Zu viele wartende Jobs - Client soll später erneut anfragen"""
+
+    def __init__(self, retry_after: int):
+        self.retry_after = retry_after
+        super().__init__(f"Job queue full, retry after {retry_after}s")
+
+
+class JobQueue:
+    """
+    SQLite-basierte Job-Queue mit Leases und Prioritäten
+    """
+
+    def __init__(self, settings: Settings):
+        """
+        Initialisierung der Job Queue
+
+        Args:
+            settings: Anwendungseinstellungen
+        """
+        self.settings = settings
+        self.db_path = Path(settings.JOB_QUEUE_DB_PATH)
+        self.visibility_timeout = settings.JOB_VISIBILITY_TIMEOUT_SECONDS
+        self.job_timeout = settings.JOB_TIMEOUT_SECONDS
+        self.max_attempts = max(1, settings.JOB_MAX_ATTEMPTS)
+        self.max_pending = settings.JOB_QUEUE_MAX_PENDING
+
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._is_ready = False
+
+        logger.info(f"JobQueue initialized (db={self.db_path})")
+
+    # ================================================
+    # Lifecycle
+    # ================================================
+
+    async def initialize(self):
+        """Datenbank öffnen und Schema anlegen"""
+        await asyncio.to_thread(self._open)
+        self._is_ready = True
+        logger.info("✅ Job queue ready")
+
+    def _open(self):
+        """SQLite-Verbindung im WAL-Modus öffnen (blockierend)"""
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        # WAL erlaubt gleichzeitiges Lesen der API während Worker schreiben
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        self._conn = conn
+
+    def is_ready(self) -> bool:
+        """Prüfe ob die Queue bereit ist"""
+        return self._is_ready
+
+    async def cleanup(self):
+        """Verbindung schließen"""
+        self._is_ready = False
+        if self._conn:
+            with self._lock:
+                self._conn.close()
+                self._conn = None
+
+    # ================================================
+    # Datenbank-Helfer
+    # ================================================
+
+    async def _run(self, fn, *args):
+        """SQLite-Zugriff außerhalb des Event-Loops ausführen"""
+        return await asyncio.to_thread(self._locked, fn, *args)
+
+    def _locked(self, fn, *args):
+        """Funktion mit exklusivem Zugriff auf die Verbindung ausführen"""
+        with self._lock:
+            return fn(self._conn, *args)
+
+    @staticmethod
+    def _transaction(conn: sqlite3.Connection):
+        """Schreibtransaktion, die Worker-Prozesse gegenseitig ausschließt"""
+        conn.execute("BEGIN IMMEDIATE")
+
+    # ================================================
+    # Einreihen
+    # ================================================
+
+    async def create_batch_job(self, user_id: Optional[str] = None, priority: int = 0) -> str:
+        """
+        Batch anlegen
+
+        Returns:
+            Batch-ID
+        """
+        batch_id = str(uuid.uuid4())
+
+        def _insert(conn):
+            conn.execute(
+                "INSERT INTO batches (id, user_id, priority, created_at) VALUES (?, ?, ?, ?)",
+                (batch_id, user_id, priority, time.time())
+            )
+
+        await self._run(_insert)
+        return batch_id
+
+    async def enqueue_image_processing(
+        self,
+        file_path: str,
+        processing_options: Dict[str, Any],
+        user_id: Optional[str] = None,
+        batch_id: Optional[str] = None,
+        priority: int = 0
+    ) -> str:
+        """Bildverarbeitungs-Job einreihen"""
+        return await self.enqueue(
+            JOB_TYPE_IMAGE,
+            {"file_path": file_path, "processing_options": processing_options},
+            user_id=user_id,
+            batch_id=batch_id,
+            priority=priority
+        )
+
+    async def enqueue_content_generation(
+        self,
+        image_url: str,
+        generation_options: Dict[str, Any],
+        user_id: Optional[str] = None,
+        priority: int = 0
+    ) -> str:
+        """Content-Generierungs-Job einreihen"""
+        return await self.enqueue(
+            JOB_TYPE_CONTENT,
+            {"image_url": image_url, "generation_options": generation_options},
+            user_id=user_id,
+            priority=priority
+        )
+
+    async def enqueue(
+        self,
+        job_type: str,
+        payload: Dict[str, Any],
+        user_id: Optional[str] = None,
+        batch_id: Optional[str] = None,
+        priority: int = 0
+    ) -> str:
+        """
+        Job einreihen
+
+        Batch-Jobs erben die Priorität des Batches plus JOB_BATCH_PRIORITY_OFFSET,
+        damit einzelne Uploads nicht hinter großen Batches warten.
+
+        Raises:
+            JobQueueFullError: Wenn JOB_QUEUE_MAX_PENDING Jobs warten
+        """
+        job_id = str(uuid.uuid4())
+
+        def _insert(conn):
+            self._transaction(conn)
+            try:
+                pending = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+                if self.max_pending > 0 and pending >= self.max_pending:
+                    retry_after = self._estimate_retry_after(conn, pending - self.max_pending + 1)
+                    conn.execute("ROLLBACK")
+                    raise JobQueueFullError(retry_after)
+
+                job_priority = priority
+                if batch_id:
+                    row = conn.execute("SELECT priority FROM batches WHERE id = ?", (batch_id,)).fetchone()
+                    job_priority = (row["priority"] if row else priority) + self.settings.JOB_BATCH_PRIORITY_OFFSET
+
+                now = time.time()
+                conn.execute(
+                    """
+                    INSERT INTO jobs (id, job_type, payload, user_id, batch_id, priority, status,
+                                      max_attempts, available_at, created_at, updated_at)
+                    VALUES (?, ?, ?, ?, ?, ?, 'queued', ?, ?, ?, ?)
+                    """,
+                    (job_id, job_type, json.dumps(payload, default=str), user_id, batch_id,
+                     job_priority, self.max_attempts, now, now, now)
+                )
+                conn.execute("COMMIT")
+            except JobQueueFullError:
+                raise
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        await self._run(_insert)
+        logger.debug(f"Job {job_id} ({job_type}) enqueued")
+        return job_id
+
+    async def ensure_capacity(self, count: int = 1):
+        """
+        Prüfen, ob count weitere Jobs angenommen werden können (z.B. ganzer Batch)
+
+        Raises:
+            JobQueueFullError: Wenn die Jobs JOB_QUEUE_MAX_PENDING überschreiten würden
+        """
+        if self.max_pending <= 0:
+            return
+
+        def _check(conn):
+            pending = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            if pending + count > self.max_pending:
+                raise JobQueueFullError(self._estimate_retry_after(conn, pending + count - self.max_pending))
+
+        await self._run(_check)
+
+    def _estimate_retry_after(self, conn: sqlite3.Connection, overflow: int) -> int:
+        """Sekunden bis genug wartende Jobs abgearbeitet sind"""
+        minimum = self.settings.JOB_RETRY_AFTER_SECONDS
+        row = conn.execute(
+            """
+            SELECT AVG(finished_at - started_at) AS avg_seconds FROM (
+                SELECT finished_at, started_at FROM jobs
+                WHERE status = 'completed' AND started_at IS NOT NULL
+                ORDER BY finished_at DESC LIMIT 50
+            )
+            """
+        ).fetchone()
+        if not row or row["avg_seconds"] is None:
+            return minimum
+        running = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = 'processing'").fetchone()[0]
+        parallel = max(1, running)
+        return max(minimum, int(math.ceil(overflow / parallel * row["avg_seconds"])))
+
+    # ================================================
+    # Worker-Seite: Leases
+    # ================================================
+
+    async def lease(self, worker_id: str, job_types: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Nächsten Job für einen Worker reservieren
+
+        Der Job bleibt für JOB_VISIBILITY_TIMEOUT_SECONDS unsichtbar und muss
+        per heartbeat() verlängert werden, sonst wird er erneut ausgeliefert.
+
+        Returns:
+            Job-Dict mit payload, attempts und deadline_at oder None
+        """
+        def _lease(conn):
+            now = time.time()
+            self._transaction(conn)
+            try:
+                self._reap_expired(conn, now)
+
+                query = DISPATCH_QUERY
+                params: List[Any] = [now]
+                if job_types:
+                    placeholders = ",".join("?" for _ in job_types)
+                    query = query.replace(
+                        "AND j.available_at <= ?",
+                        f"AND j.available_at <= ? AND j.job_type IN ({placeholders})"
+                    )
+                    params.extend(job_types)
+
+                row = conn.execute(query, params).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+
+                job_id = row["id"]
+                lease_expires_at = now + self.visibility_timeout
+                conn.execute(
+                    """
+                    UPDATE jobs SET status = 'processing', lease_owner = ?, lease_expires_at = ?,
+                        attempts = attempts + 1, started_at = COALESCE(started_at, ?),
+                        deadline_at = ?, updated_at = ?
+                    WHERE id = ?
+                    """,
+                    (worker_id, lease_expires_at, now, now + self.job_timeout, now, job_id)
+                )
+                job = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                conn.execute("COMMIT")
+                return self._row_to_job(job)
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        return await self._run(_lease)
+
+    def _reap_expired(self, conn: sqlite3.Connection, now: float):
+        """Abgelaufene Leases und überschrittene Deadlines behandeln"""
+        # Harte Laufzeitgrenze (JOB_TIMEOUT_SECONDS); wartende Jobs haben keine Deadline
+        conn.execute(
+            """
+            UPDATE jobs SET status = 'failed', error_message = 'Job timed out',
+                lease_owner = NULL, lease_expires_at = NULL, finished_at = ?, updated_at = ?
+            WHERE status = 'processing' AND deadline_at IS NOT NULL AND deadline_at < ?
+            """,
+            (now, now, now)
+        )
+        # Verlorene Worker: erneut ausliefern oder endgültig scheitern
+        conn.execute(
+            """
+            UPDATE jobs SET status = 'failed', error_message = 'Lease expired after max attempts',
+                lease_owner = NULL, lease_expires_at = NULL, finished_at = ?, updated_at = ?
+            WHERE status = 'processing' AND lease_expires_at < ? AND attempts >= max_attempts
+            """,
+            (now, now, now)
+        )
+        expired = conn.execute(
+            """
+            UPDATE jobs SET status = 'queued', lease_owner = NULL, lease_expires_at = NULL,
+                deadline_at = NULL, available_at = ?, updated_at = ?
+            WHERE status = 'processing' AND lease_expires_at < ?
+            """,
+            (now, now, now)
+        ).rowcount
+        if expired:
+            logger.warning(f"Re-queued {expired} jobs with expired leases")
+
+    async def heartbeat(self, job_id: str, worker_id: str) -> bool:
+        """
+        Lease eines laufenden Jobs verlängern
+
+        Returns:
+            False wenn der Worker die Lease verloren hat
+        """
+        def _extend(conn):
+            now = time.time()
+            return conn.execute(
+                """
+                UPDATE jobs SET lease_expires_at = MIN(?, deadline_at), updated_at = ?
+                WHERE id = ? AND status = 'processing' AND lease_owner = ?
+                """,
+                (now + self.visibility_timeout, now, job_id, worker_id)
+            ).rowcount == 1
+
+        return await self._run(_extend)
+
+    async def complete(
+        self,
+        job_id: str,
+        result: Dict[str, Any],
+        worker_id: Optional[str] = None
+    ) -> bool:
+        """
+        Job als abgeschlossen markieren
+
+        Mit worker_id nur, solange der Worker die Lease hält.
+        """
+        def _complete(conn):
+            now = time.time()
+            query = """
+                UPDATE jobs SET status = 'completed', progress = 100, result = ?, error_message = NULL,
+                    lease_owner = NULL, lease_expires_at = NULL, finished_at = ?, updated_at = ?
+                WHERE id = ? AND status IN ('queued', 'processing')
+            """
+            params: List[Any] = [json.dumps(result, default=str), now, now, job_id]
+            if worker_id:
+                query += " AND lease_owner = ?"
+                params.append(worker_id)
+            return conn.execute(query, params).rowcount == 1
+
+        completed = await self._run(_complete)
+        if not completed:
+            logger.warning(f"Discarding result for job {job_id}: lease no longer held")
+        return completed
+
+    async def fail(
+        self,
+        job_id: str,
+        error_message: str,
+        worker_id: Optional[str] = None,
+        retry: bool = True
+    ) -> str:
+        """
+        Fehlgeschlagenen Job erneut einreihen oder endgültig scheitern lassen
+
+        Returns:
+            Neuer Status ("queued", "failed") oder der unveränderte Status
+        """
+        def _fail(conn):
+            now = time.time()
+            self._transaction(conn)
+            try:
+                job = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+                if job is None or job["status"] not in ("queued", "processing") or (
+                    worker_id and job["lease_owner"] != worker_id
+                ):
+                    conn.execute("COMMIT")
+                    return job["status"] if job else "unknown"
+
+                if retry and job["attempts"] < job["max_attempts"]:
+                    # Exponentielles Backoff vor dem nächsten Versuch
+                    backoff = min(300, 2 ** job["attempts"] * 5)
+                    status = "queued"
+                    conn.execute(
+                        """
+                        UPDATE jobs SET status = 'queued', error_message = ?, lease_owner = NULL,
+                            lease_expires_at = NULL, deadline_at = NULL, available_at = ?, updated_at = ?
+                        WHERE id = ?
+                        """,
+                        (error_message, now + backoff, now, job_id)
+                    )
+                else:
+                    status = "failed"
+                    conn.execute(
+                        """
+                        UPDATE jobs SET status = 'failed', error_message = ?, lease_owner = NULL,
+                            lease_expires_at = NULL, finished_at = ?, updated_at = ?
+                        WHERE id = ?
+                        """,
+                        (error_message, now, now, job_id)
+                    )
+                conn.execute("COMMIT")
+                return status
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        return await self._run(_fail)
+
+    async def release(self, job_id: str, worker_id: str) -> bool:
+        """
+        Laufenden Job ohne Fehlversuch zurückgeben (Worker fährt herunter)
+
+        Returns:
+            False wenn der Worker die Lease nicht mehr hält
+        """
+        def _release(conn):
+            now = time.time()
+            return conn.execute(
+                """
+                UPDATE jobs SET status = 'queued', attempts = MAX(0, attempts - 1), lease_owner = NULL,
+                    lease_expires_at = NULL, deadline_at = NULL, available_at = ?, updated_at = ?
+                WHERE id = ? AND status = 'processing' AND lease_owner = ?
+                """,
+                (now, now, job_id, worker_id)
+            ).rowcount == 1
+
+        return await self._run(_release)
+
+    async def cancel(self, job_id: str) -> Optional[str]:
+        """
+        Wartenden oder laufenden Job abbrechen
+
+        Laufende Jobs verlieren ihre Lease; der Worker stoppt sie über
+        get_cancelled() nach dem nächsten Denoising-Schritt.
+
+        Returns:
+            Status nach dem Aufruf ("cancelled" oder der bereits erreichte
+            Endzustand), None wenn der Job nicht existiert
+        """
+        def _cancel(conn):
+            now = time.time()
+            conn.execute(
+                """
+                UPDATE jobs SET status = 'cancelled', error_message = 'Cancelled by client',
+                    lease_owner = NULL, lease_expires_at = NULL, finished_at = ?, updated_at = ?
+                WHERE id = ? AND status IN ('queued', 'processing')
+                """,
+                (now, now, job_id)
+            )
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return row["status"] if row else None
+
+        status = await self._run(_cancel)
+        if status == "cancelled":
+            logger.info(f"Job {job_id} cancelled")
+        return status
+
+    async def get_cancelled(self, job_ids: List[str]) -> List[str]:
+        """IDs der übergebenen Jobs, die inzwischen abgebrochen wurden"""
+        if not job_ids:
+            return []
+
+        def _cancelled(conn):
+            placeholders = ",".join("?" for _ in job_ids)
+            rows = conn.execute(
+                f"SELECT id FROM jobs WHERE status = 'cancelled' AND id IN ({placeholders})",
+                job_ids
+            ).fetchall()
+            return [row["id"] for row in rows]
+
+        return await self._run(_cancelled)
+
+    async def update_progress(self, job_id: str, progress: int):
+        """Fortschritt (0-100) eines laufenden Jobs setzen"""
+        def _update(conn):
+            conn.execute(
+                "UPDATE jobs SET progress = ?, updated_at = ? WHERE id = ? AND status = 'processing'",
+                (max(0, min(100, int(progress))), time.time(), job_id)
+            )
+
+        await self._run(_update)
+
+    # ================================================
+    # Abfragen
+    # ================================================
+
+    async def get_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Vollständigen Job-Datensatz laden"""
+        def _get(conn):
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return self._row_to_job(row) if row else None
+
+        return await self._run(_get)
+
+    async def get_job_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job-Status im Format von JobStatusResponse"""
+        job = await self.get_job(job_id)
+        if not job:
+            return None
+
+        return {
+            "job_id": job["id"],
+            "status": job["status"],
+            "progress": job["progress"],
+            "result_url": f"/api/v1/job/{job['id']}/result" if job["status"] == "completed" else None,
+            "error_message": job["error_message"],
+            "created_at": self._isoformat(job["created_at"]),
+            "updated_at": self._isoformat(job["updated_at"])
+        }
+
+    async def get_job_result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Ergebnis eines abgeschlossenen Jobs"""
+        job = await self.get_job(job_id)
+        if not job or job["status"] != "completed":
+            return None
+
+        return {
+            "job_id": job["id"],
+            "job_type": job["job_type"],
+            "status": job["status"],
+            "result": job["result"],
+            "completed_at": self._isoformat(job["finished_at"])
+        }
+
+    async def get_queue_stats(self) -> Dict[str, Any]:
+        """Queue-Statistiken für das Admin-Dashboard"""
+        def _stats(conn):
+            now = time.time()
+            counts = {
+                row["status"]: row["count"]
+                for row in conn.execute("SELECT status, COUNT(*) AS count FROM jobs GROUP BY status")
+            }
+            oldest = conn.execute("SELECT MIN(created_at) FROM jobs WHERE status = 'queued'").fetchone()[0]
+            workers = conn.execute(
+                "SELECT COUNT(DISTINCT lease_owner) FROM jobs WHERE status = 'processing'"
+            ).fetchone()[0]
+            avg_duration = conn.execute(
+                """
+                SELECT AVG(finished_at - started_at) FROM jobs
+                WHERE status = 'completed' AND finished_at > ?
+                """,
+                (now - 3600,)
+            ).fetchone()[0]
+            return {
+                "jobs": counts,
+                "queued": counts.get("queued", 0),
+                "processing": counts.get("processing", 0),
+                "max_pending": self.max_pending,
+                "oldest_queued_seconds": round(now - oldest, 1) if oldest else 0.0,
+                "active_workers": workers,
+                "avg_job_seconds_1h": round(avg_duration, 1) if avg_duration else None
+            }
+
+        return await self._run(_stats)
+
+    async def publish_worker_stats(self, worker_id: str, name: str, stats: Dict[str, Any]):
+        """
+        Statistik eines Worker-Prozesses ablegen (ersetzt den letzten Stand)
+
+        Zähler sind kumulativ pro Worker-ID; neu gestartete Worker legen
+        eigene Zeilen an, sodass Summen über Neustarts erhalten bleiben.
+        """
+        def _publish(conn):
+            conn.execute(
+                """
+                INSERT OR REPLACE INTO worker_stats (worker_id, name, stats, updated_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (worker_id, name, json.dumps(stats, default=str), time.time())
+            )
+
+        await self._run(_publish)
+
+    async def get_worker_stats(self, name: str) -> List[Dict[str, Any]]:
+        """Zuletzt abgelegte Statistiken aller Worker zu einem Namen"""
+        def _get(conn):
+            rows = conn.execute(
+                "SELECT worker_id, stats, updated_at FROM worker_stats WHERE name = ? ORDER BY worker_id",
+                (name,)
+            ).fetchall()
+            return [
+                {"worker_id": row["worker_id"], "stats": json.loads(row["stats"]), "updated_at": row["updated_at"]}
+                for row in rows
+            ]
+
+        return await self._run(_get)
+
+    # ================================================
+    # Hilfsfunktionen
+    # ================================================
+
+    @staticmethod
+    def _row_to_job(row: sqlite3.Row) -> Dict[str, Any]:
+        """SQLite-Zeile in Job-Dict umwandeln"""
+        job = dict(row)
+        job["payload"] = json.loads(job["payload"])
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    @staticmethod
+    def _isoformat(timestamp: Optional[float]) -> Optional[str]:
+        """Unix-Timestamp als ISO-String"""
+        if timestamp is None:
+            return None
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
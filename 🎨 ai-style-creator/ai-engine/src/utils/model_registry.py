@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Model Registry
+==================================================
+
+Prozessweite Registry für geladene KI-Modelle.
+Jedes Modell wird pro Worker-Prozess nur einmal geladen und per
+Referenzzählung von mehreren Komponenten (AIStyleProcessor,
+ContentGenerator) gemeinsam genutzt.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import gc
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple
+
+import structlog
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class RegisteredModel:
+    """Eintrag für ein geladenes Modell"""
+    key: str
+    instance: Any
+    refcount: int = 0
+    load_time_seconds: float = 0.0
+    memory_bytes: int = 0
+    loaded_at: float = field(default_factory=time.time)
+    last_used: float = field(default_factory=time.time)
+
+
+class ModelRegistry:
+    """
+    Lädt Modelle einmalig pro Prozess und verleiht sie per Referenzzählung
+    """
+
+    def __init__(self):
+        """Initialisierung der Model Registry"""
+        self._models: Dict[str, RegisteredModel] = {}
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        logger.info("ModelRegistry initialized")
+
+    def acquire(self, key: str, loader: Callable[[], Any]) -> Any:
+        """
+        Modell ausleihen, bei Bedarf einmalig laden
+
+        Args:
+            key: Eindeutiger Schlüssel (Modellname, dtype, Device)
+            loader: Funktion, die das Modell lädt, falls es noch nicht existiert
+
+        Returns:
+            Die geteilte Modellinstanz
+        """
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        # Pro Schlüssel sperren, damit parallele Anfragen nicht doppelt laden
+        with key_lock:
+            with self._lock:
+                entry = self._models.get(key)
+                if entry is not None:
+                    entry.refcount += 1
+                    entry.last_used = time.time()
+                    logger.debug(f"Model {key} borrowed (refcount={entry.refcount})")
+                    return entry.instance
+
+            logger.info(f"Loading shared model {key}...")
+            start = time.perf_counter()
+            instance = loader()
+            load_time = time.perf_counter() - start
+
+            entry = RegisteredModel(
+                key=key,
+                instance=instance,
+                refcount=1,
+                load_time_seconds=load_time,
+                memory_bytes=estimate_memory_bytes(instance)
+            )
+            with self._lock:
+                self._models[key] = entry
+
+            logger.info(
+                f"Shared model {key} loaded in {load_time:.1f}s "
+                f"({entry.memory_bytes / 1024 ** 2:.1f} MB)"
+            )
+            return instance
+
+    def release(self, key: str) -> bool:
+        """
+        Ausgeliehenes Modell zurückgeben, bei Refcount 0 entladen
+
+        Returns:
+            bool: True wenn das Modell entladen wurde
+        """
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is None:
+                return False
+
+            entry.refcount -= 1
+            if entry.refcount > 0:
+                logger.debug(f"Model {key} released (refcount={entry.refcount})")
+                return False
+
+            del self._models[key]
+
+        logger.info(f"Unloading shared model {key}")
+        del entry
+        gc.collect()
+        _empty_device_cache()
+        return True
+
+    def is_loaded(self, key: str) -> bool:
+        """Prüfe ob ein Modell geladen ist"""
+        with self._lock:
+            return key in self._models
+
+    def get_model_info(self) -> Dict[str, Any]:
+        """Speicherbedarf, Ladezeit und Referenzen pro Modell"""
+        with self._lock:
+            entries = list(self._models.values())
+
+        models = {
+            entry.key: {
+                "refcount": entry.refcount,
+                "memory_mb": round(entry.memory_bytes / 1024 ** 2, 1),
+                "load_time_seconds": round(entry.load_time_seconds, 2),
+                "loaded_at": entry.loaded_at,
+                "last_used": entry.last_used
+            }
+            for entry in entries
+        }
+        return {
+            "models": models,
+            "total_memory_mb": round(sum(e.memory_bytes for e in entries) / 1024 ** 2, 1)
+        }
+
+
+def estimate_memory_bytes(instance: Any) -> int:
+    """
+    Residenten Speicher eines Modells anhand seiner Tensoren schätzen
+
+    Unterstützt einzelne torch-Module sowie Tupel/Listen/Dicts davon.
+    Geteilte Tensoren werden nur einmal gezählt.
+    """
+    seen = set()
+
+    def _module_bytes(obj: Any) -> int:
+        total = 0
+        if hasattr(obj, "parameters") and hasattr(obj, "buffers"):
+            for tensor in list(obj.parameters()) + list(obj.buffers()):
+                ptr = tensor.data_ptr()
+                if ptr in seen:
+                    continue
+                seen.add(ptr)
+                total += tensor.numel() * tensor.element_size()
+        elif isinstance(obj, dict):
+            total += sum(_module_bytes(v) for v in obj.values())
+        elif isinstance(obj, (list, tuple)):
+            total += sum(_module_bytes(v) for v in obj)
+        return total
+
+    try:
+        return _module_bytes(instance)
+    except Exception as e:
+        logger.warning(f"Memory estimation failed: {e}")
+        return 0
+
+
+def _empty_device_cache():
+    """GPU-Cache nach dem Entladen leeren"""
+    try:
+        import torch
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+    except ImportError:
+        pass
+
+
+@lru_cache()
+def get_model_registry() -> ModelRegistry:
+    """
+    Singleton Registry pro Prozess
+    """
+    return ModelRegistry()
+
+
+def normalize_device(device: Any) -> str:
+    """
+    Device-Angabe vereinheitlichen ("cuda" -> "cuda:0", torch.device -> str)
+
+    Komponenten ermitteln ihr Device unterschiedlich; ohne Normalisierung
+    würde dasselbe Modell unter zwei Schlüsseln doppelt geladen.
+    """
+    device = str(device)
+    if device == "cuda":
+        try:
+            import torch
+            if torch.cuda.is_available():
+                return f"cuda:{torch.cuda.current_device()}"
+        except ImportError:
+            pass
+        return "cuda:0"
+    return device
+
+
+def blip_registry_key(settings: Any, device: Any) -> str:
+    """Registry-Schlüssel für das BLIP-Modell"""
+    dtype = "float16" if settings.USE_HALF_PRECISION else "float32"
+    return f"blip:{settings.BLIP_MODEL_NAME}:{dtype}:{normalize_device(device)}"
+
+
+def acquire_blip(settings: Any, device: Any) -> Tuple[Any, Any]:
+    """
+    BLIP Processor und Modell aus der Registry ausleihen
+
+    Args:
+        settings: Anwendungseinstellungen
+        device: Ziel-Device des Modells
+
+    Returns:
+        Tuple aus (BlipProcessor, BlipForConditionalGeneration)
+    """
+    def _load_blip() -> Tuple[Any, Any]:
+        import torch
+        from transformers import BlipProcessor, BlipForConditionalGeneration
+
+        processor = BlipProcessor.from_pretrained(
+            settings.BLIP_MODEL_NAME,
+            cache_dir=settings.HF_CACHE_DIR
+        )
+        model = BlipForConditionalGeneration.from_pretrained(
+            settings.BLIP_MODEL_NAME,
+            torch_dtype=torch.float16 if settings.USE_HALF_PRECISION else torch.float32,
+            cache_dir=settings.HF_CACHE_DIR
+        )
+        return processor, model.to(normalize_device(device))
+
+    return get_model_registry().acquire(blip_registry_key(settings, device), _load_blip)
+
+
+def release_blip(settings: Any, device: Any) -> bool:
+    """BLIP-Modell an die Registry zurückgeben"""
+    return get_model_registry().release(blip_registry_key(settings, device))
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Palette Extraction
+======================================================
+
+Schnelle, deterministische Extraktion dominanter Farben ohne KMeans.
+
+Verfahren:
+1. Pixel in einen 3D-Farbwürfel quantisieren (bins³ Zellen) und per
+   np.bincount Anzahl und Farbsumme je Zelle bestimmen
+2. Startfarben per gewichteter Farthest-Point-Auswahl auf den Zellen
+3. Wenige gewichtete k-Means-Schritte auf den Zellmittelwerten
+
+Alle Schritte arbeiten auf höchstens bins³ Zellen statt auf allen Pixeln.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+
+def extract_palette(
+    pixels: np.ndarray,
+    num_colors: int = 5,
+    bins_per_channel: int = 16,
+    refine_iterations: int = 4
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Dominante Farben aus RGB-Pixeln bestimmen
+
+    Args:
+        pixels: uint8-Array der Form (N, 3) oder (H, W, 3)
+        num_colors: Anzahl gewünschter Farben
+        bins_per_channel: Quantisierungsstufen pro Kanal (Zweierpotenz ≤ 256)
+        refine_iterations: Anzahl Verfeinerungsschritte
+
+    Returns:
+        Tuple aus (Farben (K, 3) float, Anteile (K,) in 0-1), nach Anteil
+        absteigend sortiert. K kann kleiner als num_colors sein, wenn das
+        Bild weniger unterschiedliche Farbzellen enthält.
+    """
+    pixels = np.asarray(pixels, dtype=np.uint8).reshape(-1, 3)
+    if pixels.size == 0 or num_colors < 1:
+        return np.zeros((0, 3)), np.zeros(0)
+
+    # 1. Histogramm im Farbwürfel
+    shift = 8 - int(np.log2(bins_per_channel))
+    quantized = (pixels >> shift).astype(np.intp)
+    cell_index = (quantized[:, 0] * bins_per_channel + quantized[:, 1]) * bins_per_channel + quantized[:, 2]
+    num_cells = bins_per_channel ** 3
+
+    counts = np.bincount(cell_index, minlength=num_cells)
+    occupied = np.flatnonzero(counts)
+    weights = counts[occupied].astype(np.float64)
+    cell_means = np.stack([
+        np.bincount(cell_index, weights=pixels[:, channel], minlength=num_cells)[occupied]
+        for channel in range(3)
+    ], axis=1) / weights[:, None]
+
+    k = min(num_colors, len(occupied))
+
+    # 2. Deterministische Startfarben: häufigste Zelle, dann gewichtet am weitesten entfernt
+    centers = np.empty((k, 3))
+    centers[0] = cell_means[np.argmax(weights)]
+    min_dist = np.sum((cell_means - centers[0]) ** 2, axis=1)
+    for i in range(1, k):
+        centers[i] = cell_means[np.argmax(weights * min_dist)]
+        min_dist = np.minimum(min_dist, np.sum((cell_means - centers[i]) ** 2, axis=1))
+
+    # 3. Gewichtete k-Means-Verfeinerung auf den Zellen
+    for _ in range(refine_iterations):
+        labels = _nearest_center(cell_means, centers)
+        cluster_weights = np.bincount(labels, weights=weights, minlength=k)
+        non_empty = cluster_weights > 0
+        for channel in range(3):
+            sums = np.bincount(labels, weights=weights * cell_means[:, channel], minlength=k)
+            centers[non_empty, channel] = sums[non_empty] / cluster_weights[non_empty]
+
+    labels = _nearest_center(cell_means, centers)
+    shares = np.bincount(labels, weights=weights, minlength=k) / weights.sum()
+
+    order = np.argsort(-shares, kind="stable")
+    return centers[order], shares[order]
+
+
+def _nearest_center(points: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """Index des nächsten Zentrums für jeden Punkt"""
+    distances = (
+        np.sum(points ** 2, axis=1)[:, None]
+        - 2 * points @ centers.T
+        + np.sum(centers ** 2, axis=1)[None, :]
+    )
+    return np.argmin(distances, axis=1)
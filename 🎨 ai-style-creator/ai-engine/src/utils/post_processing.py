@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Post-Processing Engine
+==========================================================
+
+Post-Processing in zwei Abschnitten:
+- Farbverbesserung (Sättigung 1.15 + Helligkeit 1.05) und Unsharp Mask
+  laufen nacheinander mit PIL's C-Kerneln direkt auf dem PIL-Bild
+- erst danach wird das Bild höchstens einmal nach numpy konvertiert und
+  einmal zurück nach PIL
+- Rauschreduzierung (gestuft und gekachelt, utils.denoise) und
+  CLAHE-Belichtungskorrektur schreiben in diesen einen uint8-Puffer
+  zurück statt neue Bilder zu erzeugen
+
+Die Reihenfolge entspricht der bisherigen PIL-Kette (Farben, Schärfe,
+Rauschen, Belichtung). PIL schneidet nach jeder Stufe ab statt zu runden;
+Nachbildungen (fusionierte Farbmatrix, float-Unsharp-Mask) wichen daher
+um einzelne Stufen ab, die CLAHE lokal auf über 40 Stufen verstärkte.
+Farben, Schärfe und Belichtung sind deshalb bitgleich zur bisherigen
+Kette; benchmarks/benchmark_post_processing.py prüft das.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+from typing import Any, Dict, Sequence, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image, ImageEnhance, ImageFilter
+
+from utils.denoise import TIER_AUTO, denoise_inplace as denoise_tiles_inplace
+
+# Operationen in Ausführungsreihenfolge (Name = Options-Schlüssel)
+OP_ENHANCE_COLORS = "enhance_colors"
+OP_SHARPEN = "sharpen"
+OP_DENOISE = "denoise"
+OP_AUTO_EXPOSURE = "auto_exposure"
+OPERATIONS = (OP_ENHANCE_COLORS, OP_SHARPEN, OP_DENOISE, OP_AUTO_EXPOSURE)
+# PIL-Stufen laufen in OPERATIONS-Reihenfolge vor den Puffer-Stufen
+IMAGE_OPERATIONS = (OP_ENHANCE_COLORS, OP_SHARPEN)
+PIXEL_OPERATIONS = (OP_DENOISE, OP_AUTO_EXPOSURE)
+
+# Parameter der bisherigen PIL/OpenCV-Kette
+COLOR_SATURATION = 1.15
+COLOR_BRIGHTNESS = 1.05
+UNSHARP_RADIUS = 2.0
+UNSHARP_PERCENT = 150
+UNSHARP_THRESHOLD = 3
+CLAHE_CLIP_LIMIT = 2.0
+CLAHE_TILE_GRID = (8, 8)
+
+
+def selected_operations(options: Dict[str, Any]) -> Tuple[str, ...]:
+    """Aktivierte Operationen in Ausführungsreihenfolge"""
+    return tuple(op for op in OPERATIONS if options.get(op, False))
+
+
+def enhance_colors(image: Image.Image) -> Image.Image:
+    """Sättigung und Helligkeit mit ImageEnhance.Color und .Brightness"""
+    saturated = ImageEnhance.Color(image).enhance(COLOR_SATURATION)
+    return ImageEnhance.Brightness(saturated).enhance(COLOR_BRIGHTNESS)
+
+
+def sharpen(image: Image.Image) -> Image.Image:
+    """Unsharp Mask (Radius 2, 150 %, Schwelle 3) mit ImageFilter.UnsharpMask"""
+    return image.filter(ImageFilter.UnsharpMask(
+        radius=UNSHARP_RADIUS, percent=UNSHARP_PERCENT, threshold=UNSHARP_THRESHOLD
+    ))
+
+
+def denoise_inplace(pixels: np.ndarray, tier: str = TIER_AUTO) -> None:
+    """Gekachelte Rauschreduzierung; Stufe siehe utils.denoise"""
+    denoise_tiles_inplace(pixels, tier)
+
+
+def auto_exposure_inplace(pixels: np.ndarray) -> None:
+    """CLAHE auf dem L-Kanal im LAB-Farbraum"""
+    lab = cv2.cvtColor(pixels, cv2.COLOR_RGB2LAB)
+    lightness = cv2.extractChannel(lab, 0)
+    clahe = cv2.createCLAHE(clipLimit=CLAHE_CLIP_LIMIT, tileGridSize=CLAHE_TILE_GRID)
+    clahe.apply(lightness, dst=lightness)
+    cv2.insertChannel(lightness, lab, 0)
+    cv2.cvtColor(lab, cv2.COLOR_LAB2RGB, dst=pixels)
+
+
+_IMAGE_KERNELS = {
+    OP_ENHANCE_COLORS: enhance_colors,
+    OP_SHARPEN: sharpen
+}
+
+
+def apply_operations(
+    pixels: np.ndarray,
+    operations: Sequence[str],
+    denoise_tier: str = TIER_AUTO
+) -> np.ndarray:
+    """
+    Puffer-Operationen in-place auf einen RGB-Puffer anwenden
+
+    Args:
+        pixels: Zusammenhängendes, beschreibbares uint8-Array (H, W, 3)
+        operations: Namen aus PIXEL_OPERATIONS (in dieser Reihenfolge ausgeführt)
+        denoise_tier: Stufe für OP_DENOISE ("auto" = nach noise_level)
+
+    Returns:
+        Derselbe Puffer
+
+    Raises:
+        ValueError: für PIL-Stufen (IMAGE_OPERATIONS), siehe post_process
+    """
+    image_ops = [op for op in operations if op in IMAGE_OPERATIONS]
+    if image_ops:
+        raise ValueError(f"{', '.join(image_ops)} run on the PIL image, use post_process()")
+
+    if OP_DENOISE in operations:
+        denoise_inplace(pixels, denoise_tier)
+    if OP_AUTO_EXPOSURE in operations:
+        auto_exposure_inplace(pixels)
+    return pixels
+
+
+def post_process(
+    image: Image.Image,
+    operations: Sequence[str],
+    denoise_tier: str = TIER_AUTO
+) -> Image.Image:
+    """
+    Bild nachbearbeiten: PIL-Stufen auf dem Bild, dann höchstens eine
+    PIL->numpy- und eine numpy->PIL-Konvertierung für die Puffer-Stufen
+
+    Args:
+        image: Eingabebild (wird nicht verändert)
+        operations: Operationsnamen, z. B. selected_operations(options)
+        denoise_tier: Stufe für OP_DENOISE ("auto" = nach noise_level)
+
+    Returns:
+        Neues, nachbearbeitetes Bild (Kopie, wenn keine Operation aktiv ist)
+    """
+    if not operations:
+        return image.copy()
+
+    alpha = image.getchannel("A") if image.mode in ("RGBA", "LA") else None
+    rgb = image if image.mode == "RGB" else image.convert("RGB")
+
+    result = rgb
+    for op in IMAGE_OPERATIONS:
+        if op in operations:
+            result = _IMAGE_KERNELS[op](result)
+
+    pixel_ops = [op for op in PIXEL_OPERATIONS if op in operations]
+    if pixel_ops:
+        # np.array kopiert in einen eigenen, zusammenhängenden Puffer
+        pixels = np.array(result, dtype=np.uint8)
+        apply_operations(pixels, pixel_ops, denoise_tier)
+        result = Image.fromarray(pixels)
+    elif result is image:
+        result = image.copy()
+
+    if alpha is not None:
+        result.putalpha(alpha)
+    return result
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Rendition Encoder
+=====================================================
+
+Erzeugt pro Ergebnisbild die in OUTPUT_RENDITIONS konfigurierten
+Ausgabedateien (volles JPEG, WebP, Web-Größe, Thumbnail):
+- jede Rendition ist eine eigene Aufgabe in einem Prozess-Pool
+- die Worker skalieren, encodieren und schreiben die Datei selbst
+  (atomar über eine .part-Datei); der Aufrufer erhält die Pfade, sobald
+  die jeweilige Rendition fertig ist
+- ohne Worker (RENDITION_WORKERS=0) wird im Thread-Pool encodiert
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from PIL import Image
+import structlog
+
+from utils.image_loading import decode_image
+
+logger = structlog.get_logger()
+
+# Web-Rendition (entspricht ImageProcessor.create_web_optimized)
+WEB_MAX_SIZE = 1200
+WEB_QUALITY = 85
+
+# Thumbnail-Rendition (entspricht ImageProcessor.create_thumbnail)
+THUMBNAIL_BOX = (256, 256)
+
+
+@dataclass(frozen=True)
+class RenditionSpec:
+    """Beschreibung einer Ausgabedatei"""
+    name: str
+    filename: str  # Muster mit {key}
+    format: str
+    max_size: Optional[Tuple[int, int]] = None
+    save_options: Dict[str, Any] = field(default_factory=dict)
+
+
+RENDITIONS: Dict[str, RenditionSpec] = {
+    "full": RenditionSpec(
+        "full", "{key}.jpg", "JPEG",
+        save_options={"quality": 95, "optimize": True}
+    ),
+    "webp": RenditionSpec(
+        "webp", "{key}.webp", "WEBP",
+        save_options={"quality": 90, "method": 4}
+    ),
+    "web": RenditionSpec(
+        "web", "{key}_web.jpg", "JPEG",
+        max_size=(WEB_MAX_SIZE, WEB_MAX_SIZE),
+        save_options={"quality": WEB_QUALITY, "optimize": True, "progressive": True}
+    ),
+    "thumbnail": RenditionSpec(
+        "thumbnail", "{key}_thumb.jpg", "JPEG",
+        max_size=THUMBNAIL_BOX,
+        save_options={"quality": WEB_QUALITY, "optimize": True}
+    )
+}
+
+
+def encode_rendition(image: Image.Image, spec: RenditionSpec, path: str) -> int:
+    """
+    Rendition skalieren, encodieren und atomar schreiben (läuft im Worker)
+
+    Returns:
+        Dateigröße in Bytes
+    """
+    rendition = decode_image(image, spec.max_size, mode="RGB")
+
+    part_path = f"{path}.part"
+    try:
+        rendition.save(part_path, spec.format, **spec.save_options)
+        os.replace(part_path, path)
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    return os.path.getsize(path)
+
+
+class RenditionEncoder:
+    """
+    Paralleles Encodieren aller Renditions eines Jobs
+    """
+
+    def __init__(self, rendition_names: List[str], workers: int):
+        """
+        Initialisierung (der Prozess-Pool startet beim ersten Job)
+
+        Args:
+            rendition_names: Namen aus RENDITIONS (Reihenfolge = Priorität)
+            workers: Prozesse im Pool (0 = Thread-Pool des Event Loops)
+        """
+        unknown = [name for name in rendition_names if name not in RENDITIONS]
+        if unknown:
+            logger.warning(f"Ignoring unknown renditions: {', '.join(unknown)}")
+
+        self.specs = [RENDITIONS[name] for name in rendition_names if name in RENDITIONS]
+        if not self.specs:
+            self.specs = [RENDITIONS["full"]]
+        self.workers = workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._files_written = 0
+        self._bytes_written = 0
+
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        """Prozess-Pool mit spawn (kein fork eines Prozesses mit Modell-Threads)"""
+        if self.workers <= 0:
+            return None
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._pool
+
+    @staticmethod
+    async def _run(
+        loop: asyncio.AbstractEventLoop,
+        pool: Optional[ProcessPoolExecutor],
+        key: str,
+        image: Image.Image,
+        spec: RenditionSpec,
+        path: str
+    ) -> Tuple[str, str, str, int]:
+        """Eine Rendition im Pool ausführen"""
+        size = await loop.run_in_executor(pool, encode_rendition, image, spec, path)
+        return key, spec.name, path, size
+
+    async def encode(self, images: Dict[str, Image.Image], output_dir: Path) -> Dict[str, Dict[str, str]]:
+        """
+        Alle Renditions aller Bilder parallel erzeugen
+
+        Args:
+            images: Ergebnisname -> Bild
+            output_dir: Zielverzeichnis (existiert bereits)
+
+        Returns:
+            Ergebnisname -> {Rendition -> Dateipfad}
+        """
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+
+        pending = []
+        for key, image in images.items():
+            for spec in self.specs:
+                path = str(output_dir / spec.filename.format(key=key))
+                pending.append(asyncio.ensure_future(self._run(loop, pool, key, image, spec, path)))
+
+        renditions: Dict[str, Dict[str, str]] = {key: {} for key in images}
+        try:
+            # Jede Datei wird vom Worker geschrieben, sobald sie encodiert ist
+            for finished in asyncio.as_completed(pending):
+                key, name, path, size = await finished
+                renditions[key][name] = path
+                self._files_written += 1
+                self._bytes_written += size
+                logger.debug(f"Rendition written: {path} ({size / 1024:.0f} KB)")
+        except BaseException:
+            # Noch laufende Renditions abbrechen (bereits gestartete Prozess-Tasks laufen zu Ende)
+            for task in pending:
+                task.cancel()
+            raise
+
+        # In konfigurierter Reihenfolge zurückgeben (erste Rendition = primäre Datei)
+        return {
+            key: {spec.name: files[spec.name] for spec in self.specs}
+            for key, files in renditions.items()
+        }
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistiken für Health-Checks"""
+        return {
+            "renditions": [spec.name for spec in self.specs],
+            "workers": self.workers,
+            "files_written": self._files_written,
+            "bytes_written": self._bytes_written
+        }
+
+    def shutdown(self):
+        """Prozess-Pool beenden"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Result Cache
+================================================
+
+Content-adressierter Disk-Cache für Ergebnisse von enhance_image.
+Die Generierung ist deterministisch (fester Seed), daher liefert dasselbe
+vorbereitete Bild mit identischem Style, Optionen und Modellversionen
+immer dasselbe Ergebnis.
+
+Schlüssel:
+- exakt: SHA-256 der Pixel des vorbereiteten Bildes
+- perzeptuell: 64-bit dHash plus grobe Farbsignatur, erkennt erneut
+  komprimierte Re-Uploads (z.B. Telegram vs. Dashboard). Der dHash allein
+  arbeitet auf Graustufen; ohne Farbsignatur teilten sich Farbvarianten
+  derselben Silhouette (rotes und blaues Kleid) einen Schlüssel.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image
+import structlog
+
+logger = structlog.get_logger()
+
+ENTRY_FILE = "entry.json"
+
+# Farbsignatur: mittlere Farbe pro Zelle eines 4x4-Rasters, 16 Stufen pro Kanal
+COLOR_GRID = 4
+COLOR_LEVEL_SHIFT = 4
+
+
+def compute_image_hashes(image: Image.Image) -> Tuple[str, str]:
+    """
+    Exakten und perzeptuellen Hash eines Bildes berechnen
+
+    Returns:
+        Tuple aus (sha256 hex, "dHash-Farbsignatur" hex)
+    """
+    exact = hashlib.sha256()
+    exact.update(f"{image.mode}:{image.size[0]}x{image.size[1]}".encode())
+    exact.update(image.tobytes())
+
+    # dHash: Helligkeitsgradienten auf 9x8 Graustufen
+    small = image.convert("L").resize((9, 8), Image.BILINEAR)
+    pixels = list(small.getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            bits = (bits << 1) | (1 if left > right else 0)
+
+    # Grobe Farbsignatur: unterscheidet Farbvarianten, toleriert JPEG-Rauschen
+    cells = image.convert("RGB").resize((COLOR_GRID, COLOR_GRID), Image.BOX)
+    color = "".join(
+        f"{channel >> COLOR_LEVEL_SHIFT:x}"
+        for pixel in cells.getdata()
+        for channel in pixel
+    )
+
+    return exact.hexdigest(), f"{bits:016x}-{color}"
+
+
+class ResultCache:
+    """
+    Größenbegrenzter LRU-Disk-Cache für verarbeitete Bilder und Metadaten
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_entries: int = 1000,
+        max_bytes: int = 2 * 1024 ** 3,
+        ttl_seconds: int = 3600,
+        jpeg_quality: int = 95
+    ):
+        """
+        Initialisierung des Result Caches
+
+        Args:
+            cache_dir: Verzeichnis für Cache-Einträge
+            max_entries: Maximale Anzahl Einträge (CACHE_MAX_SIZE)
+            max_bytes: Maximale Gesamtgröße auf Disk
+            ttl_seconds: Lebensdauer eines Eintrags (CACHE_TTL_SECONDS)
+            jpeg_quality: JPEG-Qualität der gespeicherten Bilder
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.jpeg_quality = jpeg_quality
+
+        # exact_key -> {"perceptual_key", "size", "created_at", "last_access"}
+        self._index: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._perceptual_index: Dict[str, str] = {}
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._perceptual_hits = 0
+        self._misses = 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._load_index()
+        logger.info(f"ResultCache initialized with {len(self._index)} entries at {self.cache_dir}")
+
+    # ================================================
+    # Schlüssel
+    # ================================================
+
+    @staticmethod
+    def make_keys(
+        image: Image.Image,
+        style: str,
+        options: Dict[str, Any],
+        model_versions: Dict[str, Any]
+    ) -> Tuple[str, str]:
+        """
+        Cache-Schlüssel für ein vorbereitetes Eingabebild
+
+        Returns:
+            Tuple aus (exakter Schlüssel, perzeptueller Schlüssel)
+        """
+        params = json.dumps(
+            {"style": style, "options": options, "models": model_versions},
+            sort_keys=True,
+            default=str
+        )
+        params_digest = hashlib.sha256(params.encode()).hexdigest()
+        exact_hash, perceptual_hash = compute_image_hashes(image)
+
+        exact_key = hashlib.sha256(f"{exact_hash}:{params_digest}".encode()).hexdigest()[:40]
+        perceptual_key = f"{perceptual_hash}-{params_digest[:24]}"
+        return exact_key, perceptual_key
+
+    # ================================================
+    # Lesen & Schreiben
+    # ================================================
+
+    def get(self, exact_key: str, perceptual_key: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Gecachte Ergebnisse laden
+
+        Returns:
+            Results-Dict wie von enhance_image oder None
+        """
+        with self._lock:
+            key = exact_key if exact_key in self._index else None
+            perceptual = False
+            if key is None and perceptual_key:
+                key = self._perceptual_index.get(perceptual_key)
+                perceptual = key is not None
+
+            if key is None:
+                self._misses += 1
+                return None
+
+            entry = self._index[key]
+            if self.ttl_seconds > 0 and time.time() - entry["created_at"] > self.ttl_seconds:
+                self._remove_locked(key)
+                self._misses += 1
+                return None
+
+            entry["last_access"] = time.time()
+            self._index.move_to_end(key)
+
+        try:
+            results = self._read_entry(self.cache_dir / key)
+        except Exception as e:
+            logger.warning(f"Dropping unreadable cache entry {key}: {e}")
+            with self._lock:
+                self._remove_locked(key)
+                self._misses += 1
+            return None
+
+        # mtime dient beim Neustart als LRU-Reihenfolge
+        try:
+            os.utime(self.cache_dir / key)
+        except OSError:
+            pass
+
+        with self._lock:
+            self._hits += 1
+            if perceptual:
+                self._perceptual_hits += 1
+
+        results.setdefault("metadata", {})["cache"] = {
+            "hit": True,
+            "match": "perceptual" if perceptual else "exact",
+            "key": key
+        }
+        return results
+
+    def put(self, exact_key: str, perceptual_key: str, results: Dict[str, Any]):
+        """Ergebnisse von enhance_image speichern"""
+        tmp_dir = self.cache_dir / f".tmp-{uuid.uuid4().hex}"
+        tmp_dir.mkdir(parents=True)
+
+        try:
+            files: Dict[str, Any] = {}
+            for name, value in results.items():
+                if isinstance(value, Image.Image):
+                    files[name] = self._write_image(tmp_dir, name, value)
+                elif isinstance(value, list) and value and all(isinstance(v, Image.Image) for v in value):
+                    files[name] = [
+                        self._write_image(tmp_dir, f"{name}_{i}", image)
+                        for i, image in enumerate(value)
+                    ]
+
+            now = time.time()
+            entry_data = {
+                "exact_key": exact_key,
+                "perceptual_key": perceptual_key,
+                "created_at": now,
+                "files": files,
+                "metadata": results.get("metadata", {})
+            }
+            with open(tmp_dir / ENTRY_FILE, "w") as f:
+                json.dump(entry_data, f, default=str)
+
+            size = sum(p.stat().st_size for p in tmp_dir.iterdir())
+            target = self.cache_dir / exact_key
+
+            with self._lock:
+                if exact_key in self._index:
+                    self._remove_locked(exact_key)
+                os.replace(tmp_dir, target)
+                self._index[exact_key] = {
+                    "perceptual_key": perceptual_key,
+                    "size": size,
+                    "created_at": now,
+                    "last_access": now
+                }
+                self._perceptual_index[perceptual_key] = exact_key
+                self._total_bytes += size
+                self._evict_locked()
+
+        except Exception as e:
+            logger.error(f"Failed to write result cache entry: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    def _write_image(self, directory: Path, name: str, image: Image.Image) -> str:
+        """Einzelnes Ergebnisbild als JPEG schreiben"""
+        filename = f"{name}.jpg"
+        image.convert("RGB").save(directory / filename, "JPEG", quality=self.jpeg_quality)
+        return filename
+
+    def _read_entry(self, directory: Path) -> Dict[str, Any]:
+        """Cache-Eintrag von Disk laden"""
+        with open(directory / ENTRY_FILE) as f:
+            entry_data = json.load(f)
+
+        def _load(filename: str) -> Image.Image:
+            with Image.open(directory / filename) as image:
+                image.load()
+                return image.convert("RGB")
+
+        results: Dict[str, Any] = {}
+        for name, value in entry_data["files"].items():
+            results[name] = [_load(f) for f in value] if isinstance(value, list) else _load(value)
+        results["metadata"] = dict(entry_data.get("metadata", {}))
+        return results
+
+    # ================================================
+    # Index & Eviction
+    # ================================================
+
+    def _load_index(self):
+        """Index beim Start aus den Einträgen auf Disk aufbauen"""
+        entries = []
+        for directory in self.cache_dir.iterdir():
+            if not directory.is_dir():
+                continue
+            if directory.name.startswith(".tmp-"):
+                shutil.rmtree(directory, ignore_errors=True)
+                continue
+            try:
+                with open(directory / ENTRY_FILE) as f:
+                    entry_data = json.load(f)
+                size = sum(p.stat().st_size for p in directory.iterdir())
+                entries.append((directory.stat().st_mtime, directory.name, entry_data, size))
+            except Exception:
+                shutil.rmtree(directory, ignore_errors=True)
+
+        # Älteste zuerst, damit die LRU-Reihenfolge erhalten bleibt
+        for mtime, key, entry_data, size in sorted(entries):
+            self._index[key] = {
+                "perceptual_key": entry_data.get("perceptual_key"),
+                "size": size,
+                "created_at": entry_data.get("created_at", mtime),
+                "last_access": mtime
+            }
+            if entry_data.get("perceptual_key"):
+                self._perceptual_index[entry_data["perceptual_key"]] = key
+            self._total_bytes += size
+
+        with self._lock:
+            self._evict_locked()
+
+    def _remove_locked(self, key: str):
+        """Eintrag entfernen (Lock muss gehalten werden)"""
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return
+        if self._perceptual_index.get(entry["perceptual_key"]) == key:
+            del self._perceptual_index[entry["perceptual_key"]]
+        self._total_bytes -= entry["size"]
+        shutil.rmtree(self.cache_dir / key, ignore_errors=True)
+
+    def _evict_locked(self):
+        """Abgelaufene und am längsten ungenutzte Einträge verdrängen"""
+        if self.ttl_seconds > 0:
+            cutoff = time.time() - self.ttl_seconds
+            for key in [k for k, e in self._index.items() if e["created_at"] < cutoff]:
+                self._remove_locked(key)
+
+        while self._index and (len(self._index) > self.max_entries or self._total_bytes > self.max_bytes):
+            oldest = next(iter(self._index))
+            self._remove_locked(oldest)
+
+    def clear(self):
+        """Gesamten Cache leeren"""
+        with self._lock:
+            for key in list(self._index):
+                self._remove_locked(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Cache-Statistiken für Monitoring"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "entries": len(self._index),
+                "max_entries": self.max_entries,
+                "size_mb": round(self._total_bytes / 1024 ** 2, 1),
+                "max_size_mb": round(self.max_bytes / 1024 ** 2, 1),
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._hits,
+                "perceptual_hits": self._perceptual_hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 3) if lookups else 0.0
+            }
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Upload Ingest
+=================================================
+
+Annahme von Bild-Uploads:
+- RequestBodyLimitMiddleware begrenzt den Request-Body, während er
+  empfangen wird (Content-Length bzw. mitgezählte Chunks)
+- liest den Upload in Chunks auf Disk und hasht dabei (SHA-256)
+- lehnt Dateien über MAX_FILE_SIZE_MB ab
+- erkennt das Format an den Magic Bytes statt am Content-Type
+- prüft vor dem Decodieren nur die Header-Dimensionen (Decompression Bombs)
+
+Einschränkung: FastAPI übergibt ein UploadFile erst, nachdem Starlette den
+gesamten Multipart-Body empfangen und gespoolt hat (ab 1 MB auf Disk).
+Größen- und Formatprüfung in UploadIngestor laufen daher nach dem
+Empfang; früh abgebrochen wird nur über die Middleware (und ein
+Body-Limit am Proxy, z. B. nginx client_max_body_size). Der Speicherbedarf
+pro Upload bleibt unabhängig von der Dateigröße.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import asyncio
+import hashlib
+import os
+import uuid
+import warnings
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, Tuple
+
+from PIL import Image
+from starlette.exceptions import HTTPException
+import structlog
+
+from config.settings import Settings
+
+logger = structlog.get_logger()
+
+# Formatname -> Dateiendung
+FORMAT_EXTENSIONS = {
+    "jpeg": "jpg",
+    "png": "png",
+    "webp": "webp"
+}
+
+# Alias-Namen aus SUPPORTED_FORMATS
+FORMAT_ALIASES = {
+    "jpg": "jpeg",
+    "jpeg": "jpeg",
+    "png": "png",
+    "webp": "webp"
+}
+
+# Bytes, die für die Formaterkennung benötigt werden
+SNIFF_BYTES = 12
+
+
+class UploadRejectedError(Exception):
+    """Upload abgelehnt - enthält den passenden HTTP-Statuscode"""
+
+    def __init__(self, status_code: int, detail: str):
+        self.status_code = status_code
+        self.detail = detail
+        super().__init__(detail)
+
+
+@dataclass
+class IngestedUpload:
+    """Gespeicherter und geprüfter Upload"""
+    path: str
+    filename: str
+    format: str
+    size_bytes: int
+    sha256: str
+    width: int
+    height: int
+
+
+def sniff_image_format(header: bytes) -> Optional[str]:
+    """
+    Bildformat anhand der Magic Bytes bestimmen
+
+    Returns:
+        "jpeg", "png", "webp" oder None
+    """
+    if header.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if len(header) >= 12 and header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def read_image_dimensions(path: str) -> Tuple[str, int, int]:
+    """
+    Format und Dimensionen nur aus dem Bild-Header lesen (ohne Decodieren)
+
+    Returns:
+        Tuple aus (PIL-Format, Breite, Höhe)
+    """
+    with warnings.catch_warnings():
+        # DecompressionBombWarning wird über MAX_IMAGE_PIXELS selbst geprüft
+        warnings.simplefilter("ignore", Image.DecompressionBombWarning)
+        with Image.open(path) as image:
+            return image.format, image.width, image.height
+
+
+class RequestBodyLimitMiddleware:
+    """
+    ASGI-Middleware, die zu große Request-Bodies beim Empfang abweist
+
+    Ein zu großer Content-Length-Header wird sofort mit 413 beantwortet;
+    bei Chunked-Uploads bricht das Mitzählen der empfangenen Bytes das
+    Parsen des Bodys mit 413 ab, bevor er vollständig gespoolt ist.
+    """
+
+    def __init__(self, app: Any, max_bytes: int):
+        """
+        Initialisierung
+
+        Args:
+            app: Innere ASGI-App
+            max_bytes: Größter erlaubter Request-Body
+        """
+        self.app = app
+        self.max_bytes = max_bytes
+
+    async def __call__(self, scope: dict, receive: Any, send: Any):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        declared = dict(scope["headers"]).get(b"content-length", b"")
+        if declared.isdigit() and int(declared) > self.max_bytes:
+            await self._reject(send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_bytes:
+                    # FastAPI reicht HTTPExceptions aus dem Body-Parsing unverändert durch
+                    raise HTTPException(status_code=413, detail=self._detail())
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+    def _detail(self) -> str:
+        return f"Request body exceeds {self.max_bytes // (1024 * 1024)} MB limit"
+
+    async def _reject(self, send: Any):
+        body = f'{{"detail": "{self._detail()}"}}'.encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+class UploadIngestor:
+    """
+    Streamt UploadFiles auf Disk und validiert sie
+    """
+
+    def __init__(self, settings: Settings):
+        """
+        Initialisierung des Ingestors
+
+        Args:
+            settings: Anwendungseinstellungen
+        """
+        self.upload_dir = Path(settings.UPLOAD_DIR)
+        self.max_bytes = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+        self.max_pixels = settings.MAX_IMAGE_PIXELS
+        self.chunk_size = settings.UPLOAD_CHUNK_SIZE_KB * 1024
+        self.allowed_formats = {
+            FORMAT_ALIASES[f.lower()] for f in settings.SUPPORTED_FORMATS if f.lower() in FORMAT_ALIASES
+        }
+        self.upload_dir.mkdir(parents=True, exist_ok=True)
+
+    async def ingest(self, upload: Any) -> IngestedUpload:
+        """
+        Upload in Chunks speichern und prüfen
+
+        Das UploadFile ist zu diesem Zeitpunkt bereits vollständig empfangen
+        (siehe Modul-Docstring); die Grenze beim Empfang setzt
+        RequestBodyLimitMiddleware.
+
+        Args:
+            upload: FastAPI UploadFile (oder Objekt mit async read(size))
+
+        Returns:
+            IngestedUpload mit Pfad, Format, Hash und Dimensionen
+
+        Raises:
+            UploadRejectedError: 413 (zu groß), 415 (Format), 400 (defekt)
+        """
+        # Frühzeitig ablehnen, wenn die Größe bereits bekannt ist
+        declared_size = getattr(upload, "size", None)
+        if declared_size is not None and declared_size > self.max_bytes:
+            raise UploadRejectedError(413, f"File exceeds {self.max_bytes // (1024 * 1024)} MB limit")
+
+        file_id = uuid.uuid4().hex
+        part_path = self.upload_dir / f".{file_id}.part"
+        digest = hashlib.sha256()
+        size = 0
+        image_format: Optional[str] = None
+
+        try:
+            with open(part_path, "wb") as out:
+                header = b""
+                while True:
+                    chunk = await upload.read(self.chunk_size)
+                    if not chunk:
+                        break
+
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise UploadRejectedError(
+                            413,
+                            f"File exceeds {self.max_bytes // (1024 * 1024)} MB limit"
+                        )
+
+                    # Format so früh wie möglich aus den ersten Bytes bestimmen
+                    if image_format is None:
+                        header += chunk[:SNIFF_BYTES]
+                        if len(header) >= SNIFF_BYTES:
+                            image_format = self._check_format(header)
+
+                    digest.update(chunk)
+                    await asyncio.to_thread(out.write, chunk)
+
+            if size == 0:
+                raise UploadRejectedError(400, "Empty upload")
+            if image_format is None:
+                image_format = self._check_format(header)
+
+            pil_format, width, height = await asyncio.to_thread(self._check_dimensions, part_path)
+            if FORMAT_ALIASES.get(pil_format.lower()) != image_format:
+                raise UploadRejectedError(415, "File content does not match its image signature")
+
+            final_path = self.upload_dir / f"{file_id}.{FORMAT_EXTENSIONS[image_format]}"
+            os.replace(part_path, final_path)
+
+        except BaseException:
+            part_path.unlink(missing_ok=True)
+            raise
+
+        logger.info(
+            f"Upload ingested: {final_path.name} ({image_format}, {width}x{height}, {size / 1024:.0f} KB)"
+        )
+        return IngestedUpload(
+            path=str(final_path),
+            filename=getattr(upload, "filename", None) or final_path.name,
+            format=image_format,
+            size_bytes=size,
+            sha256=digest.hexdigest(),
+            width=width,
+            height=height
+        )
+
+    def _check_format(self, header: bytes) -> str:
+        """Format per Magic Bytes gegen SUPPORTED_FORMATS prüfen"""
+        image_format = sniff_image_format(header)
+        if image_format is None or image_format not in self.allowed_formats:
+            raise UploadRejectedError(
+                415,
+                f"Unsupported image format. Allowed: {', '.join(sorted(self.allowed_formats))}"
+            )
+        return image_format
+
+    def _check_dimensions(self, path: Path) -> Tuple[str, int, int]:
+        """Header-Dimensionen gegen MAX_IMAGE_PIXELS prüfen (blockierend)"""
+        try:
+            pil_format, width, height = read_image_dimensions(str(path))
+        except Image.DecompressionBombError:
+            raise UploadRejectedError(413, "Image dimensions exceed the pixel limit")
+        except Exception as e:
+            logger.warning(f"Unreadable upload header: {e}")
+            raise UploadRejectedError(400, "Corrupt or unreadable image")
+
+        if width * height > self.max_pixels:
+            raise UploadRejectedError(
+                413,
+                f"Image dimensions {width}x{height} exceed the limit of {self.max_pixels} pixels"
+            )
+        return pil_format, width, height
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Upscaling
+=============================================
+
+Zweite Stufe der zweistufigen Generierung: Diffusion läuft in reduzierter
+Auflösung (TWO_STAGE_RESOLUTION), danach wird die volle Auflösung günstig
+wiederhergestellt:
+- "detail_transfer": Lanczos-Hochskalierung plus die Hochfrequenzen des
+  Originalfotos, die in der Diffusionsauflösung fehlen. Übertragen wird
+  nur dort, wo das Ergebnis strukturell noch zum Original passt, damit
+  ersetzte Hintergründe keine Geisterkanten erhalten.
+- "onnx": Super-Resolution-Modell (z. B. Real-ESRGAN als ONNX) auf der CPU,
+  gekachelt mit Überlappung; Eingang (1, 3, H, W) in 0-1, Ausgang
+  (1, 3, s*H, s*W). Ohne onnxruntime oder Modell wird auf
+  detail_transfer zurückgefallen.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+from PIL import Image
+import structlog
+
+from config.settings import Settings
+
+try:
+    import onnxruntime as ort
+except ImportError:  # Optionale Abhängigkeit; es bleibt detail_transfer
+    ort = None
+
+logger = structlog.get_logger()
+
+UPSCALER_DETAIL_TRANSFER = "detail_transfer"
+UPSCALER_ONNX = "onnx"
+UPSCALERS = (UPSCALER_DETAIL_TRANSFER, UPSCALER_ONNX)
+
+# Toleranz (Graustufen) für strukturelle Übereinstimmung mit dem Original
+DETAIL_MATCH_SIGMA = 12.0
+
+# Überlappung der Super-Resolution-Kacheln in Eingabepixeln
+SUPERRES_TILE_OVERLAP = 16
+
+
+def detail_transfer_upscale(image: Image.Image, reference: Image.Image, strength: float = 1.0) -> Image.Image:
+    """
+    Auf die Größe des Originals hochskalieren und dessen Details übertragen
+
+    Args:
+        image: Diffusionsergebnis in reduzierter Auflösung
+        reference: Originalbild in Zielauflösung
+        strength: Anteil der übertragenen Hochfrequenzen (0 = nur Lanczos)
+
+    Returns:
+        RGB-Bild in der Größe von reference
+    """
+    target = reference.size
+    small = np.asarray(image.convert("RGB"))
+    upscaled = cv2.resize(small, target, interpolation=cv2.INTER_LANCZOS4).astype(np.float32)
+    if strength <= 0:
+        return Image.fromarray(np.clip(upscaled, 0, 255).astype(np.uint8))
+
+    # Was in der Diffusionsauflösung nicht darstellbar war: Original minus
+    # dessen Hin- und Rückskalierung über dieselbe Auflösung
+    original = np.asarray(reference.convert("RGB"))
+    low = cv2.resize(
+        cv2.resize(original, image.size, interpolation=cv2.INTER_AREA),
+        target,
+        interpolation=cv2.INTER_LANCZOS4
+    ).astype(np.float32)
+    detail = original.astype(np.float32) - low
+
+    # Gewicht aus der Übereinstimmung von Ergebnis und Original (Graustufen, geglättet)
+    difference = cv2.cvtColor(np.abs(upscaled - low), cv2.COLOR_RGB2GRAY)
+    difference = cv2.GaussianBlur(difference, (0, 0), 2.0)
+    weight = np.exp(-(difference * difference) / (2 * DETAIL_MATCH_SIGMA ** 2)) * strength
+
+    upscaled += detail * weight[..., None]
+    return Image.fromarray(np.clip(upscaled + 0.5, 0, 255).astype(np.uint8))
+
+
+class SuperResolutionUpscaler:
+    """
+    Gekachelte Super-Resolution mit ONNX Runtime (CPU)
+    """
+
+    def __init__(self, settings: Settings):
+        """
+        Initialisierung (die Session wird erst beim ersten Aufruf erzeugt)
+
+        Args:
+            settings: Anwendungseinstellungen
+        """
+        self.model_path = Path(settings.SUPERRES_MODEL_PATH)
+        self.tile_size = max(32, settings.SUPERRES_TILE_SIZE)
+        self.intra_op_threads = settings.SUPERRES_INTRA_OP_THREADS
+
+        self._session: Optional["ort.InferenceSession"] = None
+        self._lock = threading.Lock()
+
+    def is_available(self) -> bool:
+        """True, wenn onnxruntime installiert und das Modell vorhanden ist"""
+        return ort is not None and self.model_path.is_file()
+
+    def _get_session(self) -> "ort.InferenceSession":
+        """CPU-Session erzeugen (unter self._lock)"""
+        if self._session is None:
+            options = ort.SessionOptions()
+            options.intra_op_num_threads = self.intra_op_threads
+            options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+            self._session = ort.InferenceSession(
+                str(self.model_path),
+                sess_options=options,
+                providers=["CPUExecutionProvider"]
+            )
+
+            # Modelle mit fester Eingangsgröße bestimmen die Kachelgröße
+            height, width = self._session.get_inputs()[0].shape[2:]
+            if isinstance(height, int) and isinstance(width, int):
+                self.tile_size = min(height, width)
+
+            logger.info(f"Super-resolution session created ({self.model_path.name})")
+        return self._session
+
+    def upscale(self, image: Image.Image, size: Tuple[int, int]) -> Image.Image:
+        """
+        Bild per Modell hochskalieren und auf die Zielgröße bringen
+
+        Kacheln werden mit Rand (SUPERRES_TILE_OVERLAP) gerechnet, übernommen
+        wird nur ihr Kern - so entstehen keine Nähte.
+        """
+        pixels = np.asarray(image.convert("RGB"), dtype=np.float32) / 255.0
+        height, width = pixels.shape[:2]
+
+        # Eine Session rechnet mit allen intra-op Threads; Aufrufe werden serialisiert
+        with self._lock:
+            session = self._get_session()
+            input_name = session.get_inputs()[0].name
+            halo = SUPERRES_TILE_OVERLAP
+            core = self.tile_size - 2 * halo
+            if core <= 0:
+                raise ValueError(f"SUPERRES_TILE_SIZE must exceed {2 * halo}")
+
+            padded = np.pad(pixels, ((halo, halo + core), (halo, halo + core), (0, 0)), mode="edge")
+            output: Optional[np.ndarray] = None
+            scale = 1
+
+            for top in range(0, height, core):
+                for left in range(0, width, core):
+                    tile = padded[top:top + self.tile_size, left:left + self.tile_size]
+                    batch = tile.transpose(2, 0, 1)[None]
+                    result = session.run(None, {input_name: np.ascontiguousarray(batch)})[0][0]
+
+                    if output is None:
+                        scale = result.shape[1] // self.tile_size
+                        output = np.empty((3, height * scale, width * scale), dtype=np.float32)
+
+                    rows = min(core, height - top)
+                    cols = min(core, width - left)
+                    output[:, top * scale:(top + rows) * scale, left * scale:(left + cols) * scale] = result[
+                        :, halo * scale:(halo + rows) * scale, halo * scale:(halo + cols) * scale
+                    ]
+
+        upscaled = (np.clip(output.transpose(1, 2, 0), 0.0, 1.0) * 255.0 + 0.5).astype(np.uint8)
+        interpolation = cv2.INTER_AREA if upscaled.shape[1] > size[0] else cv2.INTER_LANCZOS4
+        return Image.fromarray(cv2.resize(upscaled, size, interpolation=interpolation))
+
+
+class Upscaler:
+    """
+    Wiederherstellung der vollen Auflösung nach der Diffusion
+    """
+
+    def __init__(self, settings: Settings):
+        """
+        Initialisierung
+
+        Args:
+            settings: Anwendungseinstellungen
+        """
+        self.default_method = settings.UPSCALER if settings.UPSCALER in UPSCALERS else UPSCALER_DETAIL_TRANSFER
+        self.detail_strength = settings.DETAIL_TRANSFER_STRENGTH
+        self.super_resolution = SuperResolutionUpscaler(settings)
+
+        self._lock = threading.Lock()
+        self._calls: Dict[str, int] = {method: 0 for method in UPSCALERS}
+        self._seconds: Dict[str, float] = {method: 0.0 for method in UPSCALERS}
+
+    def resolve_method(self, method: Optional[str] = None) -> str:
+        """Verfahren für einen Job (Super-Resolution nur, wenn verfügbar)"""
+        method = method or self.default_method
+        if method == UPSCALER_ONNX and not self.super_resolution.is_available():
+            return UPSCALER_DETAIL_TRANSFER
+        return method if method in UPSCALERS else self.default_method
+
+    def upscale(self, image: Image.Image, reference: Image.Image, method: str) -> Image.Image:
+        """
+        Ergebnis auf die Größe des Originals bringen (blockierend)
+
+        Args:
+            image: Diffusionsergebnis in reduzierter Auflösung
+            reference: Originalbild in Zielauflösung
+            method: Ergebnis von resolve_method
+        """
+        start = time.perf_counter()
+        if method == UPSCALER_ONNX:
+            upscaled = self.super_resolution.upscale(image, reference.size)
+        else:
+            upscaled = detail_transfer_upscale(image, reference, self.detail_strength)
+
+        with self._lock:
+            self._calls[method] += 1
+            self._seconds[method] += time.perf_counter() - start
+        return upscaled
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Statistiken für Monitoring"""
+        with self._lock:
+            return {
+                "default_method": self.default_method,
+                "super_resolution_available": self.super_resolution.is_available(),
+                "calls": dict(self._calls),
+                "avg_ms": {
+                    method: round(self._seconds[method] / calls * 1000, 1)
+                    for method, calls in self._calls.items() if calls
+                }
+            }
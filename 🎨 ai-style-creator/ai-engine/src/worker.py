@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Job Worker
+==============================================
+
+Konsumiert Jobs aus der persistenten JobQueue und führt sie mit den
+KI-Modellen aus. Läuft entweder eingebettet im API-Prozess
+(EMBEDDED_WORKER=true) oder als eigener Prozess auf GPU-Nodes:
+
+    python worker.py
+
+Jeder Job wird per Lease reserviert und per Heartbeat verlängert.
+Stürzt der Worker ab, liefert die Queue den Job nach Ablauf des
+Visibility-Timeouts an einen anderen Worker aus (at-least-once).
+
+Abbruch (DELETE /api/v1/job/{id}), Deadline (JOB_TIMEOUT_SECONDS) und
+Herunterfahren laufen kooperativ über ein CancellationToken pro Job: die
+Diffusion stoppt nach dem laufenden Denoising-Schritt und gibt den Slot
+frei. Beim Herunterfahren werden laufende Jobs bis
+WORKER_DRAIN_TIMEOUT_SECONDS fertiggestellt, übrige neu eingereiht.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import asyncio
+import os
+import signal
+import socket
+import time
+import uuid
+from typing import Any, Dict, Optional, Set
+
+import structlog
+
+from config.settings import Settings, get_settings
+from models.ai_processor import AIStyleProcessor
+from models.content_generator import ContentGenerator
+from utils.cancellation import (
+    CancellationToken, JobCancelled, bind_token,
+    REASON_CANCELLED, REASON_DEADLINE, REASON_LEASE_LOST, REASON_SHUTDOWN
+)
+from utils.aspect_buckets import BUCKET_STATS_NAME
+from utils.inference_executor import shutdown_inference_executor
+from utils.job_queue import JobQueue, JOB_TYPE_IMAGE, JOB_TYPE_CONTENT
+
+logger = structlog.get_logger()
+
+
+class JobWorker:
+    """
+    Worker, der Jobs aus der JobQueue least und ausführt
+    """
+
+    def __init__(
+        self,
+        settings: Settings,
+        job_queue: JobQueue,
+        ai_processor: AIStyleProcessor,
+        content_generator: Optional[ContentGenerator] = None
+    ):
+        """
+        Initialisierung des Workers
+
+        Args:
+            settings: Anwendungseinstellungen
+            job_queue: Initialisierte JobQueue
+            ai_processor: Initialisierter AIStyleProcessor
+            content_generator: Optionaler ContentGenerator für Content-Jobs
+        """
+        self.settings = settings
+        self.job_queue = job_queue
+        self.ai_processor = ai_processor
+        self.content_generator = content_generator
+
+        self.worker_id = f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.concurrency = max(1, settings.MAX_CONCURRENT_JOBS)
+        self.poll_interval = settings.JOB_POLL_INTERVAL_MS / 1000
+        self.heartbeat_interval = max(1.0, settings.JOB_VISIBILITY_TIMEOUT_SECONDS / 3)
+        self.cancel_poll_interval = max(0.1, settings.JOB_CANCEL_POLL_INTERVAL_MS / 1000)
+        self.cancel_grace = max(1.0, settings.JOB_CANCEL_GRACE_SECONDS)
+        self.drain_timeout = max(0.0, settings.WORKER_DRAIN_TIMEOUT_SECONDS)
+
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._tasks: Set[asyncio.Task] = set()
+        self._tokens: Dict[str, CancellationToken] = {}
+        self._stopping = asyncio.Event()
+        self._jobs_completed = 0
+        self._jobs_failed = 0
+        self._jobs_cancelled = 0
+
+        job_types = [JOB_TYPE_IMAGE]
+        if content_generator:
+            job_types.append(JOB_TYPE_CONTENT)
+        self.job_types = job_types
+
+    async def run(self):
+        """Jobs leasen und ausführen, bis stop() aufgerufen wird"""
+        logger.info(f"👷 Worker {self.worker_id} started (concurrency={self.concurrency}, types={self.job_types})")
+        cancellation_watch = asyncio.create_task(self._cancellation_loop())
+
+        while not self._stopping.is_set():
+            await self._slots.acquire()
+            try:
+                job = await self.job_queue.lease(self.worker_id, self.job_types)
+            except Exception as e:
+                logger.error(f"Failed to lease job: {e}")
+                job = None
+
+            if job is None:
+                self._slots.release()
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), timeout=self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            task = asyncio.create_task(self._execute(job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        await self._drain()
+        cancellation_watch.cancel()
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    async def _drain(self):
+        """Laufende Jobs zu Ende bringen, nach dem Drain-Timeout abbrechen"""
+        if not self._tasks:
+            return
+
+        _, pending = await asyncio.wait(set(self._tasks), timeout=self.drain_timeout)
+        if pending:
+            logger.warning(f"Worker {self.worker_id} cancelling {len(pending)} jobs after drain timeout")
+            for job_id in list(self._tokens):
+                self.cancel(job_id, REASON_SHUTDOWN)
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def stop(self):
+        """Keine neuen Jobs mehr annehmen"""
+        self._stopping.set()
+
+    def cancel(self, job_id: str, reason: str = REASON_CANCELLED) -> bool:
+        """
+        Laufenden Job dieses Workers abbrechen
+
+        Returns:
+            False, wenn der Job hier nicht (mehr) läuft
+        """
+        token = self._tokens.get(job_id)
+        return token.cancel(reason) if token else False
+
+    async def _execute(self, job: Dict[str, Any]):
+        """Einzelnen Job mit Heartbeat, Abbruch und Deadline ausführen"""
+        job_id = job["id"]
+        token = CancellationToken(job_id)
+        self._tokens[job_id] = token
+        # Gilt für diese Task und alle daraus erzeugten (Processor, Scheduler)
+        bind_token(token)
+
+        remaining = max(1.0, job["deadline_at"] - time.time())
+        deadline = asyncio.get_running_loop().call_later(remaining, token.cancel, REASON_DEADLINE)
+        heartbeat = asyncio.create_task(self._heartbeat_loop(job_id))
+        try:
+            logger.info(f"Worker {self.worker_id} processing job {job_id} (attempt {job['attempts']})")
+            # Harte Grenze nur für Stufen, die den Abbruch nicht prüfen
+            result = await asyncio.wait_for(self._dispatch(job), timeout=remaining + self.cancel_grace)
+            if await self.job_queue.complete(job_id, result, worker_id=self.worker_id):
+                self._jobs_completed += 1
+            if job["job_type"] == JOB_TYPE_IMAGE:
+                await self._publish_stats()
+
+        except JobCancelled as e:
+            await self._handle_cancelled(job_id, e.reason)
+
+        except asyncio.TimeoutError:
+            logger.error(f"Job {job_id} exceeded JOB_TIMEOUT_SECONDS")
+            await self.job_queue.fail(job_id, "Job timed out", worker_id=self.worker_id, retry=False)
+            self._jobs_failed += 1
+
+        except Exception as e:
+            logger.error(f"Job {job_id} failed: {e}")
+            status = await self.job_queue.fail(job_id, str(e), worker_id=self.worker_id)
+            if status == "failed":
+                self._jobs_failed += 1
+
+        finally:
+            deadline.cancel()
+            heartbeat.cancel()
+            self._tokens.pop(job_id, None)
+            self._slots.release()
+
+    async def _handle_cancelled(self, job_id: str, reason: str):
+        """Abgebrochenen Job je nach Grund abschließen"""
+        logger.info(f"Job {job_id} stopped ({reason})")
+        if reason == REASON_DEADLINE:
+            await self.job_queue.fail(job_id, "Job timed out", worker_id=self.worker_id, retry=False)
+            self._jobs_failed += 1
+        elif reason == REASON_SHUTDOWN:
+            # Ein anderer Worker übernimmt ohne verbrauchten Versuch
+            await self.job_queue.release(job_id, self.worker_id)
+        elif reason == REASON_CANCELLED:
+            self._jobs_cancelled += 1
+        # REASON_LEASE_LOST: die Queue hat den Job bereits neu vergeben
+
+    async def _dispatch(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Job an den passenden Processor weiterreichen"""
+        payload = job["payload"]
+
+        if job["job_type"] == JOB_TYPE_IMAGE:
+            return await self.ai_processor.run_image_job(
+                job["id"],
+                payload["file_path"],
+                payload.get("processing_options", {})
+            )
+
+        if job["job_type"] == JOB_TYPE_CONTENT and self.content_generator:
+            return await self.content_generator.run_content_job(
+                job["id"],
+                payload["image_url"],
+                payload.get("generation_options", {})
+            )
+
+        raise ValueError(f"Unsupported job type: {job['job_type']}")
+
+    async def _publish_stats(self):
+        """Bucket-Statistik für die API ablegen (die Zähler leben nur in diesem Prozess)"""
+        try:
+            await self.job_queue.publish_worker_stats(
+                self.worker_id, BUCKET_STATS_NAME, self.ai_processor.aspect_bucketer.get_stats()
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish worker stats: {e}")
+
+    async def _heartbeat_loop(self, job_id: str):
+        """Lease regelmäßig verlängern"""
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                if not await self.job_queue.heartbeat(job_id, self.worker_id):
+                    logger.warning(f"Worker {self.worker_id} lost lease on job {job_id}")
+                    self.cancel(job_id, REASON_LEASE_LOST)
+                    return
+            except Exception as e:
+                logger.error(f"Heartbeat failed for job {job_id}: {e}")
+
+    async def _cancellation_loop(self):
+        """Über die Queue abgebrochene Jobs (auch aus anderen Prozessen) stoppen"""
+        while True:
+            await asyncio.sleep(self.cancel_poll_interval)
+            if not self._tokens:
+                continue
+            try:
+                for job_id in await self.job_queue.get_cancelled(list(self._tokens)):
+                    self.cancel(job_id, REASON_CANCELLED)
+            except Exception as e:
+                logger.error(f"Cancellation poll failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Worker-Statistiken für Monitoring"""
+        return {
+            "worker_id": self.worker_id,
+            "concurrency": self.concurrency,
+            "running": len(self._tasks),
+            "completed": self._jobs_completed,
+            "failed": self._jobs_failed,
+            "cancelled": self._jobs_cancelled
+        }
+
+
+async def main():
+    """Eigenständiger Worker-Prozess"""
+    settings = get_settings()
+
+    job_queue = JobQueue(settings)
+    await job_queue.initialize()
+
+    ai_processor = AIStyleProcessor(settings)
+    ai_processor.job_queue = job_queue
+    await ai_processor.initialize()
+
+    content_generator = ContentGenerator(settings)
+    content_generator.job_queue = job_queue
+    await content_generator.initialize()
+
+    worker = JobWorker(settings, job_queue, ai_processor, content_generator)
+
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await ai_processor.cleanup()
+        await content_generator.cleanup()
+        await job_queue.cleanup()
+        shutdown_inference_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Test-Fixtures
+=================================================
+
+Gemeinsame Fixtures der Tests:
+- src liegt im Importpfad (wie beim Start aus src/)
+- ist config.settings nicht importierbar (pydantic 2 ohne BaseSettings),
+  ersetzen TEST_SETTINGS die Einstellungen
+- API-Tests importieren main ohne KI-Modelle: Module, die in der
+  Testumgebung fehlen (torch, diffusers, Monitoring, ...), werden durch
+  leere Stub-Module ersetzt; der Lifespan (Modelle laden) läuft nie
+- FakeJobQueue bildet die von den Handlern genutzte JobQueue ohne SQLite
+  nach
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import importlib
+import sys
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from typing import Any, Dict, List, Optional
+from unittest.mock import MagicMock
+
+import pytest
+
+SRC_DIR = Path(__file__).resolve().parent.parent / "src"
+sys.path.insert(0, str(SRC_DIR))
+
+# Werte, die main beim Import und in den getesteten Handlern liest, falls
+# config.settings in der Testumgebung nicht importierbar ist
+TEST_SETTINGS = dict(
+    DEBUG=False,
+    ALLOWED_ORIGINS=["*"],
+    ALLOWED_HOSTS=["*"],
+    SECRET_KEY="test",
+    MAX_FILE_SIZE_MB=10,
+    MAX_BATCH_SIZE=10,
+    MAX_IMAGE_SIZE=1024,
+    TWO_STAGE_DIFFUSION=False,
+    TWO_STAGE_RESOLUTION=768,
+    ESTIMATE_SECONDS_PER_MEGAPIXEL_STEP=0.05,
+    ESTIMATE_OVERHEAD_SECONDS=2.0,
+    EMBEDDED_WORKER=False,
+    ENABLE_STEP_PREVIEWS=False,
+    PREVIEW_STREAM_INTERVAL_MS=50
+)
+
+
+class StubModule(ModuleType):
+    """Modul, dessen Attribute beliebige MagicMocks sind"""
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = MagicMock(name=f"{self.__name__}.{name}")
+        setattr(self, name, value)
+        return value
+
+
+def _install_stub(name: str, module: Optional[ModuleType] = None):
+    """Stub unter name registrieren und am Elternmodul einhängen"""
+    module = module or StubModule(name)
+    sys.modules[name] = module
+    parent_name, _, child = name.rpartition(".")
+    if parent_name:
+        parent = sys.modules.get(parent_name) or importlib.import_module(parent_name)
+        setattr(parent, child, module)
+
+
+def _stub_settings():
+    """config.settings ersetzen (z. B. pydantic 2 ohne BaseSettings)"""
+    module = StubModule("config.settings")
+    settings = SimpleNamespace(**TEST_SETTINGS)
+    module.Settings = SimpleNamespace
+    module.get_settings = lambda: settings
+    _install_stub("config.settings", module)
+
+
+try:
+    import config.settings  # noqa: F401
+except ImportError:
+    _stub_settings()
+
+
+def import_with_stubs(module_name: str, max_stubs: int = 100) -> ModuleType:
+    """
+    Modul importieren und dabei fehlende Abhängigkeiten durch Stubs ersetzen
+
+    Nur Module, die sich nicht importieren lassen, werden ersetzt; in einer
+    vollständigen Umgebung läuft der Import unverändert.
+    """
+    for _ in range(max_stubs):
+        try:
+            return importlib.import_module(module_name)
+        except ModuleNotFoundError as e:
+            if not e.name or e.name in sys.modules:
+                raise
+            _install_stub(e.name)
+    raise ImportError(f"Too many missing dependencies while importing {module_name}")
+
+
+class FakeJobQueue:
+    """JobQueue der API-Handler ohne SQLite"""
+
+    def __init__(self):
+        self.jobs: Dict[str, Dict[str, Any]] = {}
+        self.enqueued: List[Dict[str, Any]] = []
+        self.cancelled: List[str] = []
+
+    def add_job(self, job_id: str, user_id: str, status: str = "queued") -> Dict[str, Any]:
+        self.jobs[job_id] = {"id": job_id, "user_id": user_id, "status": status, "progress": 0}
+        return self.jobs[job_id]
+
+    async def ensure_capacity(self, count: int):
+        return None
+
+    async def create_batch_job(self, user_id=None, priority=0):
+        return "batch-1"
+
+    async def enqueue_image_processing(self, file_path, processing_options, user_id=None, priority=0, batch_id=None):
+        self.enqueued.append(processing_options)
+        job_id = f"job-{len(self.enqueued)}"
+        self.add_job(job_id, user_id)
+        return job_id
+
+    async def get_job(self, job_id):
+        return self.jobs.get(job_id)
+
+    async def get_job_status(self, job_id):
+        job = self.jobs.get(job_id)
+        if not job:
+            return None
+        return {
+            "job_id": job_id,
+            "status": job["status"],
+            "progress": job["progress"],
+            "created_at": "2024-01-01T00:00:00+00:00",
+            "updated_at": "2024-01-01T00:00:00+00:00"
+        }
+
+    async def cancel(self, job_id):
+        job = self.jobs.get(job_id)
+        if not job:
+            return None
+        if job["status"] in ("queued", "processing"):
+            job["status"] = "cancelled"
+            self.cancelled.append(job_id)
+        return job["status"]
+
+
+class FakeIngestor:
+    """UploadIngestor ohne Dateisystem"""
+
+    async def ingest(self, file):
+        return SimpleNamespace(path=f"/tmp/{file.filename}")
+
+
+@pytest.fixture
+def queue_settings(tmp_path):
+    """Einstellungen einer JobQueue in tmp_path"""
+    return SimpleNamespace(
+        JOB_QUEUE_DB_PATH=str(tmp_path / "jobs.db"),
+        JOB_VISIBILITY_TIMEOUT_SECONDS=60,
+        JOB_TIMEOUT_SECONDS=600,
+        JOB_MAX_ATTEMPTS=3,
+        JOB_QUEUE_MAX_PENDING=100,
+        JOB_BATCH_PRIORITY_OFFSET=-1,
+        JOB_RETRY_AFTER_SECONDS=30
+    )
+
+
+@pytest.fixture(scope="session")
+def main_module():
+    return import_with_stubs("main")
+
+
+@pytest.fixture
+def api(main_module, monkeypatch):
+    """
+    TestClient der API mit FakeJobQueue
+
+    Returns:
+        Namespace mit http (TestClient), queue, main und login(user)
+    """
+    from fastapi.testclient import TestClient
+
+    queue = FakeJobQueue()
+    monkeypatch.setattr(main_module, "job_queue", queue)
+    monkeypatch.setattr(main_module, "upload_ingestor", FakeIngestor())
+    monkeypatch.setattr(main_module, "job_worker", None)
+    monkeypatch.setattr(main_module, "preview_store", None)
+    monkeypatch.setattr(main_module, "metrics", SimpleNamespace(increment_counter=lambda *args, **kwargs: None))
+
+    def login(user: Dict[str, Any]):
+        main_module.app.dependency_overrides[main_module.get_current_user] = lambda: user
+
+    login({"user_id": "seller-1"})
+    try:
+        # Ohne Kontextmanager: der Lifespan (Modelle laden) läuft nicht
+        yield SimpleNamespace(http=TestClient(main_module.app), queue=queue, main=main_module, login=login)
+    finally:
+        main_module.app.dependency_overrides.clear()
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Tests: Aspect Buckets
+=========================================================
+
+Bucket-Raster, Wahl des Buckets (nie größer als das Eingabebild),
+Einpassen und Umkehren sowie die zusammengeführte Statistik.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from utils.aspect_buckets import (
+    FIT_CROP,
+    FIT_PAD,
+    AspectBucket,
+    AspectBucketer,
+    build_buckets,
+    fit_to_bucket,
+    merge_bucket_stats,
+    nearest_bucket,
+    resize_to_fit,
+)
+
+
+def gradient(width: int, height: int) -> Image.Image:
+    x = np.linspace(0, 255, width, dtype=np.uint8)[None, :].repeat(height, axis=0)
+    y = np.linspace(0, 255, height, dtype=np.uint8)[:, None].repeat(width, axis=1)
+    return Image.fromarray(np.stack([x, y, np.full_like(x, 128)], axis=2))
+
+
+def test_buckets_stay_on_the_grid_within_max_ratio():
+    buckets = build_buckets(1000, step=64, max_ratio=2.0)
+
+    assert max(max(bucket.size) for bucket in buckets) == 960
+    for bucket in buckets:
+        assert bucket.width % 64 == 0 and bucket.height % 64 == 0
+        assert max(bucket.size) / min(bucket.size) <= 2.0
+    assert [bucket.aspect for bucket in buckets] == sorted(bucket.aspect for bucket in buckets)
+    assert any(bucket.width == bucket.height for bucket in buckets)
+
+
+def test_nearest_bucket_matches_the_aspect():
+    bucket = nearest_bucket((3000, 2000), 1024)
+
+    assert bucket.width == 1024
+    assert abs(bucket.aspect - 1.5) <= abs(1024 / 640 - 1.5)
+
+
+@pytest.mark.parametrize("size", [(300, 200), (640, 640), (500, 900)])
+def test_nearest_bucket_never_upscales(size):
+    bucket = nearest_bucket(size, 1024)
+
+    assert bucket.width <= size[0] or bucket.height <= size[1]
+    assert max(bucket.size) <= max(size)
+
+
+@pytest.mark.parametrize("mode", [FIT_PAD, FIT_CROP])
+def test_fit_and_restore_keep_the_input_size(mode):
+    image = gradient(700, 450)
+    bucket = nearest_bucket(image.size, 512)
+
+    fit = fit_to_bucket(image, bucket, mode)
+    restored = fit.restore(fit.image, image)
+
+    assert fit.image.size == bucket.size
+    assert restored.size == image.size
+    assert np.abs(np.asarray(restored, dtype=int) - np.asarray(image, dtype=int)).mean() < 4
+
+
+def test_pad_continues_edge_pixels():
+    image = Image.new("RGB", (400, 200), (200, 10, 10))
+
+    fit = fit_to_bucket(image, AspectBucket(512, 512), FIT_PAD)
+
+    assert fit.scaled_size == (512, 256)
+    assert fit.padding_ratio == 0.5
+    assert set(fit.image.getdata()) == {(200, 10, 10)}
+
+
+def test_resize_to_fit_only_shrinks_to_multiples():
+    fit = resize_to_fit(gradient(1001, 500), 512)
+    small = resize_to_fit(gradient(100, 60), 512)
+
+    assert fit.image.size == (512, 256)
+    assert small.image.size == (96, 64)
+    assert fit.restore(fit.image, gradient(1001, 500)).size == (1001, 500)
+
+
+def test_merge_bucket_stats_weights_padding_by_fits():
+    first = AspectBucketer()
+    second = AspectBucketer()
+    first.fit(gradient(512, 512), 512)
+    second.fit(gradient(512, 512), 512)
+    second.fit(gradient(600, 300), 512)
+
+    merged = merge_bucket_stats([first.get_stats(), second.get_stats()])
+
+    assert merged["sources"] == 2
+    assert merged["fits"] == 3
+    assert merged["exact_hits"] == 2
+    assert merged["bucket_hits"]["512x512"] == 2
+    assert merged["mode"] == FIT_PAD
+    assert merge_bucket_stats([])["fits"] == 0
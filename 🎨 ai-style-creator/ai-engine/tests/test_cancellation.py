@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Tests: Cancellation
+=======================================================
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import contextvars
+
+import pytest
+
+from utils.cancellation import (
+    REASON_CANCELLED,
+    REASON_DEADLINE,
+    CancellationToken,
+    JobCancelled,
+    bind_token,
+    current_token,
+    raise_if_cancelled,
+    step_callback,
+)
+
+
+def test_first_reason_wins():
+    token = CancellationToken("job-1")
+
+    assert token.cancel(REASON_DEADLINE)
+    assert not token.cancel(REASON_CANCELLED)
+    assert token.reason == REASON_DEADLINE
+    with pytest.raises(JobCancelled) as excinfo:
+        token.raise_if_cancelled()
+    assert (excinfo.value.job_id, excinfo.value.reason) == ("job-1", REASON_DEADLINE)
+
+
+def test_callbacks_run_once_and_immediately_after_cancel():
+    token = CancellationToken("job-1")
+    calls = []
+    token.add_callback(lambda: calls.append("early"))
+    removed = lambda: calls.append("removed")  # noqa: E731
+    token.add_callback(removed)
+    token.remove_callback(removed)
+
+    token.cancel()
+    token.cancel()
+    token.add_callback(lambda: calls.append("late"))
+
+    assert calls == ["early", "late"]
+
+
+def test_failing_callback_does_not_stop_cancellation():
+    token = CancellationToken("job-1")
+    calls = []
+    token.add_callback(lambda: 1 / 0)
+    token.add_callback(lambda: calls.append("second"))
+
+    assert token.cancel()
+    assert calls == ["second"]
+    assert token.is_cancelled()
+
+
+def test_bound_token_is_visible_in_the_context():
+    token = CancellationToken("job-1")
+
+    def job():
+        bind_token(token)
+        assert current_token() is token
+        raise_if_cancelled()
+        token.cancel()
+        with pytest.raises(JobCancelled):
+            raise_if_cancelled()
+
+    contextvars.copy_context().run(job)
+    assert current_token() is None
+    raise_if_cancelled()
+
+
+def test_step_callback_stops_only_when_all_jobs_are_cancelled():
+    first, second = CancellationToken("job-1"), CancellationToken("job-2")
+    callback = step_callback([first, second])
+    kwargs = {"latents": object()}
+
+    first.cancel()
+    assert callback(None, 0, None, kwargs) is kwargs
+
+    second.cancel()
+    with pytest.raises(JobCancelled) as excinfo:
+        callback(None, 1, None, kwargs)
+    assert excinfo.value.job_id == "job-1"
+
+
+def test_step_callback_requires_cancellable_jobs():
+    assert step_callback([]) is None
+    assert step_callback([CancellationToken("job-1"), None]) is None
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Tests: Denoise
+==================================================
+
+Stufenwahl und Kachelung: gekachelt (mit Halo) muss das gleiche Ergebnis
+liefern wie ein Durchlauf über das ganze Bild.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import numpy as np
+import pytest
+
+from utils import denoise
+from utils.denoise import (
+    TIER_FAST,
+    TIER_NONE,
+    TIER_STANDARD,
+    TIER_STRONG,
+    _FILTERS,
+    _tile_grid,
+    denoise_inplace,
+    select_tier,
+)
+
+
+def noisy(height: int = 96, width: int = 128) -> np.ndarray:
+    rng = np.random.default_rng(1)
+    base = np.linspace(40, 200, width)[None, :, None].repeat(height, axis=0).repeat(3, axis=2)
+    return np.clip(base + rng.normal(0, 25, base.shape), 0, 255).astype(np.uint8)
+
+
+def test_tile_grid_covers_the_image_once():
+    coverage = np.zeros((100, 130), dtype=int)
+
+    for y0, y1, x0, x1 in _tile_grid(100, 130, 32):
+        coverage[y0:y1, x0:x1] += 1
+
+    assert np.all(coverage == 1)
+    assert len(_tile_grid(100, 130, 384)) == 1
+
+
+@pytest.mark.parametrize("noise_level, tier", [
+    (0.0, TIER_NONE),
+    (0.1, TIER_FAST),
+    (0.29, TIER_FAST),
+    (0.3, TIER_STANDARD),
+    (0.5, TIER_STRONG),
+    (1.0, TIER_STRONG)
+])
+def test_select_tier_thresholds(noise_level, tier):
+    assert select_tier(noise_level) == tier
+
+
+@pytest.mark.parametrize("tier", [TIER_FAST, TIER_STANDARD])
+def test_tiled_result_matches_single_pass(tier, monkeypatch):
+    monkeypatch.setattr(denoise.os, "cpu_count", lambda: 4)
+    pixels = noisy()
+    expected = _FILTERS[tier][0](pixels.copy())
+
+    assert denoise_inplace(pixels, tier, tile_size=40) == tier
+    np.testing.assert_array_equal(pixels, expected)
+
+
+def test_none_tier_leaves_pixels_unchanged():
+    pixels = noisy()
+    original = pixels.copy()
+
+    assert denoise_inplace(pixels, TIER_NONE) == TIER_NONE
+    np.testing.assert_array_equal(pixels, original)
+
+
+def test_unknown_tier_is_rejected():
+    with pytest.raises(ValueError):
+        denoise_inplace(noisy(), "extreme")
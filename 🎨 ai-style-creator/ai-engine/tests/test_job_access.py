@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Tests: Zugriff auf Jobs
+===========================================================
+
+Abbrechen (DELETE /api/v1/job/{id}), Event-Stream und Vorschau eines Jobs
+sind nur für den Eigentümer und für Admins erlaubt.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import pytest
+
+
+@pytest.fixture
+def queued_job(api):
+    return api.queue.add_job("job-1", user_id="seller-1")
+
+
+def test_owner_can_cancel_own_job(api, queued_job):
+    response = api.http.delete("/api/v1/job/job-1")
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "cancelled"
+    assert api.queue.cancelled == ["job-1"]
+
+
+def test_other_user_cannot_cancel_job(api, queued_job):
+    api.login({"user_id": "seller-2"})
+
+    assert api.http.delete("/api/v1/job/job-1").status_code == 403
+    assert api.queue.cancelled == []
+
+
+def test_admin_can_cancel_any_job(api, queued_job):
+    api.login({"user_id": "ops", "is_admin": True})
+
+    assert api.http.delete("/api/v1/job/job-1").status_code == 200
+    assert api.queue.cancelled == ["job-1"]
+
+
+def test_cancelling_finished_job_conflicts(api, queued_job):
+    queued_job["status"] = "completed"
+
+    assert api.http.delete("/api/v1/job/job-1").status_code == 409
+
+
+def test_unknown_job_is_not_found(api):
+    assert api.http.delete("/api/v1/job/missing").status_code == 404
+    assert api.http.get("/api/v1/job/missing/events").status_code == 404
+    assert api.http.get("/api/v1/job/missing/preview").status_code == 404
+
+
+@pytest.mark.parametrize("path", ["/api/v1/job/job-1/events", "/api/v1/job/job-1/preview"])
+def test_other_user_cannot_watch_job(api, queued_job, path):
+    api.login({"user_id": "seller-2"})
+
+    assert api.http.get(path).status_code == 403
+
+
+def test_owner_streams_events_until_terminal_status(api, queued_job):
+    queued_job["status"] = "completed"
+
+    response = api.http.get("/api/v1/job/job-1/events")
+
+    assert response.status_code == 200
+    assert "event: status" in response.text
+    assert '"status": "completed"' in response.text
+
+
+def test_owner_without_preview_gets_not_found(api, queued_job):
+    assert api.http.get("/api/v1/job/job-1/preview").status_code == 404
@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Tests: JobQueue
+===================================================
+
+Leases, Wiederholungen, Fairness und Abbruch der SQLite-Queue. Die Uhr
+der Queue ist ersetzt, damit Leases und Deadlines ohne Warten ablaufen.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from utils import job_queue as job_queue_module
+from utils.job_queue import JobQueue, JobQueueFullError
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class Clock:
+    """Manuell vorgestellte Uhr"""
+
+    def __init__(self, now: float = 1_000_000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(job_queue_module, "time", SimpleNamespace(time=clock.time))
+    return clock
+
+
+@pytest.fixture
+def queue(queue_settings, clock):
+    queue = JobQueue(queue_settings)
+    run(queue.initialize())
+    yield queue
+    run(queue.cleanup())
+
+
+def enqueue(queue, user_id="seller-1", **kwargs):
+    return run(queue.enqueue_image_processing("/tmp/a.jpg", {"style": "studio"}, user_id=user_id, **kwargs))
+
+
+def test_lease_and_complete(queue, clock):
+    job_id = enqueue(queue)
+
+    job = run(queue.lease("worker-1"))
+
+    assert job["id"] == job_id
+    assert job["status"] == "processing"
+    assert job["attempts"] == 1
+    assert job["payload"]["processing_options"] == {"style": "studio"}
+    assert job["deadline_at"] == clock.now + queue.job_timeout
+    assert run(queue.complete(job_id, {"ok": True}, worker_id="worker-1"))
+    assert run(queue.get_job(job_id))["result"] == {"ok": True}
+    assert run(queue.get_job_status(job_id))["result_url"] == f"/api/v1/job/{job_id}/result"
+
+
+def test_leased_job_is_invisible_to_other_workers(queue):
+    enqueue(queue)
+
+    assert run(queue.lease("worker-1")) is not None
+    assert run(queue.lease("worker-2")) is None
+
+
+def test_lease_filters_job_types(queue):
+    enqueue(queue)
+
+    assert run(queue.lease("worker-1", job_types=[job_queue_module.JOB_TYPE_CONTENT])) is None
+    assert run(queue.lease("worker-1", job_types=[job_queue_module.JOB_TYPE_IMAGE])) is not None
+
+
+def test_result_of_lost_lease_is_discarded(queue, clock):
+    job_id = enqueue(queue)
+    run(queue.lease("worker-1"))
+    clock.advance(queue.visibility_timeout + 1)
+    run(queue.lease("worker-2"))
+
+    assert not run(queue.complete(job_id, {"ok": True}, worker_id="worker-1"))
+    assert not run(queue.heartbeat(job_id, "worker-1"))
+    assert run(queue.heartbeat(job_id, "worker-2"))
+
+
+def test_fail_requeues_with_backoff_and_clears_deadline(queue, clock):
+    job_id = enqueue(queue)
+    run(queue.lease("worker-1"))
+
+    assert run(queue.fail(job_id, "CUDA out of memory", worker_id="worker-1")) == "queued"
+
+    job = run(queue.get_job(job_id))
+    assert job["deadline_at"] is None
+    assert job["lease_owner"] is None
+    assert job["available_at"] == clock.now + 10
+    assert run(queue.lease("worker-1")) is None
+
+    clock.advance(10)
+    assert run(queue.lease("worker-1"))["attempts"] == 2
+
+
+def test_fail_after_max_attempts_is_final(queue, clock):
+    job_id = enqueue(queue)
+    for _ in range(queue.max_attempts - 1):
+        run(queue.lease("worker-1"))
+        assert run(queue.fail(job_id, "error", worker_id="worker-1")) == "queued"
+        clock.advance(300)
+
+    run(queue.lease("worker-1"))
+
+    assert run(queue.fail(job_id, "error", worker_id="worker-1")) == "failed"
+    assert run(queue.get_job(job_id))["error_message"] == "error"
+
+
+def test_fail_without_retry_is_final(queue):
+    job_id = enqueue(queue)
+    run(queue.lease("worker-1"))
+
+    assert run(queue.fail(job_id, "bad input", worker_id="worker-1", retry=False)) == "failed"
+
+
+def test_release_returns_the_attempt(queue):
+    job_id = enqueue(queue)
+    run(queue.lease("worker-1"))
+
+    assert run(queue.release(job_id, "worker-1"))
+
+    job = run(queue.get_job(job_id))
+    assert job["status"] == "queued"
+    assert job["attempts"] == 0
+    assert job["deadline_at"] is None
+
+
+def test_expired_lease_is_requeued_with_a_fresh_deadline(queue, clock):
+    job_id = enqueue(queue)
+    run(queue.lease("worker-1"))
+    clock.advance(queue.visibility_timeout + 1)
+
+    job = run(queue.lease("worker-2"))
+
+    assert job["id"] == job_id
+    assert job["attempts"] == 2
+    assert job["deadline_at"] == clock.now + queue.job_timeout
+
+
+def test_expired_lease_after_max_attempts_fails(queue, clock):
+    job_id = enqueue(queue)
+    for _ in range(queue.max_attempts):
+        run(queue.lease("worker-1"))
+        clock.advance(queue.visibility_timeout + 1)
+
+    assert run(queue.lease("worker-2")) is None
+    assert run(queue.get_job(job_id))["status"] == "failed"
+
+
+def test_deadline_fails_running_job(queue, clock):
+    job_id = enqueue(queue)
+    deadline = run(queue.lease("worker-1"))["deadline_at"]
+    # Heartbeats verlängern die Lease höchstens bis zur Deadline
+    while clock.now <= deadline:
+        clock.advance(queue.visibility_timeout / 2)
+        run(queue.heartbeat(job_id, "worker-1"))
+
+    assert run(queue.lease("worker-2")) is None
+
+    job = run(queue.get_job(job_id))
+    assert job["status"] == "failed"
+    assert job["error_message"] == "Job timed out"
+
+
+def test_requeued_job_is_not_timed_out_while_waiting(queue, clock):
+    job_id = enqueue(queue)
+    run(queue.lease("worker-1"))
+    run(queue.fail(job_id, "error", worker_id="worker-1"))
+    clock.advance(queue.job_timeout + 1)
+
+    job = run(queue.lease("worker-1"))
+
+    assert job["id"] == job_id
+    assert job["status"] == "processing"
+
+
+def test_priority_wins_over_age(queue, clock):
+    enqueue(queue, priority=0)
+    clock.advance(1)
+    urgent = enqueue(queue, priority=5)
+
+    assert run(queue.lease("worker-1"))["id"] == urgent
+
+
+def test_batch_jobs_yield_to_single_uploads(queue, clock):
+    batch_id = run(queue.create_batch_job(user_id="seller-1"))
+    enqueue(queue, batch_id=batch_id)
+    clock.advance(1)
+    single = enqueue(queue, user_id="seller-2")
+
+    assert run(queue.get_job(single))["priority"] == 0
+    assert run(queue.lease("worker-1"))["id"] == single
+
+
+def test_user_with_fewer_running_jobs_goes_first(queue, clock):
+    enqueue(queue, user_id="seller-1")
+    clock.advance(1)
+    enqueue(queue, user_id="seller-1")
+    clock.advance(1)
+    other = enqueue(queue, user_id="seller-2")
+
+    assert run(queue.lease("worker-1"))["user_id"] == "seller-1"
+    assert run(queue.lease("worker-2"))["id"] == other
+
+
+def test_cancel_queued_and_running_jobs(queue, clock):
+    running = enqueue(queue)
+    clock.advance(1)
+    queued = enqueue(queue)
+    assert run(queue.lease("worker-1"))["id"] == running
+
+    assert run(queue.cancel(queued)) == "cancelled"
+    assert run(queue.cancel(running)) == "cancelled"
+    assert sorted(run(queue.get_cancelled([queued, running]))) == sorted([queued, running])
+    assert run(queue.lease("worker-2")) is None
+
+
+def test_cancelled_job_cannot_be_completed(queue):
+    job_id = enqueue(queue)
+    run(queue.lease("worker-1"))
+    run(queue.cancel(job_id))
+
+    assert not run(queue.complete(job_id, {"ok": True}, worker_id="worker-1"))
+    assert run(queue.fail(job_id, "error", worker_id="worker-1")) == "cancelled"
+
+
+def test_cancel_keeps_final_status(queue):
+    job_id = enqueue(queue)
+    run(queue.lease("worker-1"))
+    run(queue.complete(job_id, {}, worker_id="worker-1"))
+
+    assert run(queue.cancel(job_id)) == "completed"
+    assert run(queue.cancel("missing")) is None
+    assert run(queue.get_cancelled([])) == []
+
+
+def test_full_queue_rejects_new_jobs(queue_settings, clock):
+    queue_settings.JOB_QUEUE_MAX_PENDING = 2
+    queue = JobQueue(queue_settings)
+    run(queue.initialize())
+    enqueue(queue)
+    enqueue(queue)
+
+    with pytest.raises(JobQueueFullError) as excinfo:
+        enqueue(queue)
+    assert excinfo.value.retry_after == queue_settings.JOB_RETRY_AFTER_SECONDS
+
+    with pytest.raises(JobQueueFullError):
+        run(queue.ensure_capacity(1))
+    run(queue.lease("worker-1"))
+    run(queue.ensure_capacity(1))
+    run(queue.cleanup())
+
+
+def test_worker_stats_replace_the_last_snapshot(queue):
+    run(queue.publish_worker_stats("worker-1", "aspect_buckets", {"fits": 1}))
+    run(queue.publish_worker_stats("worker-1", "aspect_buckets", {"fits": 3}))
+    run(queue.publish_worker_stats("worker-2", "aspect_buckets", {"fits": 2}))
+
+    stats = run(queue.get_worker_stats("aspect_buckets"))
+
+    assert [(entry["worker_id"], entry["stats"]["fits"]) for entry in stats] == [("worker-1", 3), ("worker-2", 2)]
+    assert run(queue.get_worker_stats("other")) == []
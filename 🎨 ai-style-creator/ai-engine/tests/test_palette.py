@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Tests: Farbpalette
+======================================================
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import numpy as np
+
+from utils.palette import extract_palette
+
+
+def two_colors() -> np.ndarray:
+    pixels = np.zeros((100, 100, 3), dtype=np.uint8)
+    pixels[:, :75] = (200, 30, 40)
+    pixels[:, 75:] = (20, 40, 180)
+    return pixels
+
+
+def test_palette_finds_colors_and_shares():
+    colors, shares = extract_palette(two_colors(), num_colors=5)
+
+    assert len(colors) == 2
+    np.testing.assert_allclose(colors, [(200, 30, 40), (20, 40, 180)])
+    np.testing.assert_allclose(shares, [0.75, 0.25])
+
+
+def test_palette_is_deterministic_and_sorted():
+    rng = np.random.default_rng(0)
+    pixels = rng.integers(0, 256, (64, 64, 3), dtype=np.uint8)
+
+    colors, shares = extract_palette(pixels, num_colors=4)
+    again, again_shares = extract_palette(pixels, num_colors=4)
+
+    assert len(colors) == 4
+    np.testing.assert_array_equal(colors, again)
+    np.testing.assert_array_equal(shares, again_shares)
+    assert np.all(np.diff(shares) <= 0)
+    assert abs(shares.sum() - 1.0) < 1e-9
+
+
+def test_empty_input_has_no_palette():
+    colors, shares = extract_palette(np.zeros((0, 3), dtype=np.uint8))
+
+    assert colors.shape == (0, 3)
+    assert shares.shape == (0,)
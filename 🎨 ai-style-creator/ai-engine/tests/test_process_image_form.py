@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Tests: Multipart-Optionen
+=============================================================
+
+Verarbeitungsoptionen kommen als Formularfelder neben dem Upload (Telegram-
+Bot, Dashboard) und müssen im Job landen - u. a. die Qualitätsstufe des
+Quick Process.
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+JPEG = b"\xff\xd8\xff"
+
+
+def test_quick_process_form_fields_reach_the_job(api):
+    response = api.http.post(
+        "/api/v1/process/image",
+        files={"file": ("dress.jpg", JPEG, "image/jpeg")},
+        data={"style": "studio", "quality": "standard", "enhance_colors": "true", "generate_variants": "false"}
+    )
+
+    assert response.status_code == 200
+    options = api.queue.enqueued[0]
+    assert options["quality"] == "standard"
+    assert options["generate_variants"] is False
+    assert response.json()["estimated_time"] == api.main._estimate_processing_time(options)
+
+
+def test_missing_form_fields_use_high_tier_defaults(api):
+    standard = api.http.post(
+        "/api/v1/process/image",
+        files={"file": ("a.jpg", JPEG, "image/jpeg")},
+        data={"quality": "standard", "generate_variants": "false"}
+    )
+    default = api.http.post("/api/v1/process/image", files={"file": ("b.jpg", JPEG, "image/jpeg")})
+
+    assert api.queue.enqueued[1]["quality"] == "high"
+    assert api.queue.enqueued[1]["style"] == "studio"
+    assert standard.json()["estimated_time"] < default.json()["estimated_time"]
+
+
+def test_jobs_belong_to_the_uploading_user(api):
+    api.http.post("/api/v1/process/image", files={"file": ("a.jpg", JPEG, "image/jpeg")})
+
+    assert api.queue.jobs["job-1"]["user_id"] == "seller-1"
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Tests: Qualitätsstufen
+==========================================================
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+from models.quality_tiers import (
+    QUALITY_HIGH,
+    QUALITY_STANDARD,
+    QUALITY_TIERS,
+    QUALITY_ULTRA,
+    SCHEDULER_DPMPP_2M,
+    resolve_execution_plan,
+)
+from utils.post_processing import OP_DENOISE, OP_ENHANCE_COLORS, OP_SHARPEN
+
+
+def test_unknown_or_missing_tier_uses_high():
+    assert resolve_execution_plan("best").tier == QUALITY_HIGH
+    assert resolve_execution_plan(None).tier == QUALITY_HIGH
+    assert resolve_execution_plan("ULTRA").tier == QUALITY_ULTRA
+
+
+def test_options_can_only_disable_plan_stages():
+    full = resolve_execution_plan(QUALITY_ULTRA, {"generate_variants": True})
+    without_structure = resolve_execution_plan(QUALITY_HIGH, {"preserve_structure": False})
+    standard = resolve_execution_plan(QUALITY_STANDARD, {"preserve_structure": True, "generate_variants": True})
+
+    assert full.run_controlnet and full.num_variants == 4
+    assert full.scheduler == SCHEDULER_DPMPP_2M
+    assert not without_structure.run_controlnet
+    assert without_structure.num_variants == 0
+    assert not standard.run_controlnet and standard.num_variants == 0
+
+
+def test_diffusion_size_is_capped_by_tier_resolution():
+    assert QUALITY_TIERS[QUALITY_STANDARD].diffusion_size(1024) == 768
+    assert QUALITY_TIERS[QUALITY_STANDARD].diffusion_size(512) == 512
+    assert QUALITY_TIERS[QUALITY_HIGH].diffusion_size(1024) == 1024
+
+
+def test_standard_tier_disables_expensive_post_processing():
+    options = {OP_ENHANCE_COLORS: True, OP_SHARPEN: True, OP_DENOISE: True}
+
+    standard = QUALITY_TIERS[QUALITY_STANDARD].post_processing_options(options)
+    high = QUALITY_TIERS[QUALITY_HIGH].post_processing_options(options)
+
+    assert standard == {OP_ENHANCE_COLORS: True, OP_SHARPEN: True, OP_DENOISE: False, "auto_exposure": False}
+    assert high == options
+
+
+def test_estimates_grow_with_the_tier():
+    estimates = [
+        resolve_execution_plan(tier, {"generate_variants": True}).estimate_seconds(0.75, 1024, 0.05, 2.0)
+        for tier in (QUALITY_STANDARD, QUALITY_HIGH, QUALITY_ULTRA)
+    ]
+
+    assert estimates == sorted(estimates)
+    assert estimates[0] < estimates[2]
+    assert resolve_execution_plan(QUALITY_STANDARD).estimate_seconds(0.75, 1024, 0.0, 2.0) == 2
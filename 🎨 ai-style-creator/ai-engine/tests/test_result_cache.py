@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+DressForPleasure AI Style Creator - Tests: Result Cache
+=======================================================
+
+Author: DressForPleasure Dev Team
+Version: 1.0.0
+"""
+
+import time
+
+from PIL import Image
+
+from utils.result_cache import ResultCache, compute_image_hashes
+
+
+def results(color=(200, 30, 40)):
+    return {
+        "enhanced_image": Image.new("RGB", (64, 64), color),
+        "variants": [Image.new("RGB", (64, 64), color)] * 2,
+        "metadata": {"style": "studio"}
+    }
+
+
+def keys(image, style="studio"):
+    return ResultCache.make_keys(image, style, {"quality": "high"}, {"sd": "1.5"})
+
+
+def test_perceptual_hash_separates_color_variants():
+    red = Image.new("RGB", (64, 64), (200, 30, 40))
+    blue = Image.new("RGB", (64, 64), (20, 40, 180))
+
+    exact_red, perceptual_red = compute_image_hashes(red)
+    exact_blue, perceptual_blue = compute_image_hashes(blue)
+
+    assert exact_red != exact_blue
+    assert perceptual_red.split("-")[0] == perceptual_blue.split("-")[0]
+    assert perceptual_red != perceptual_blue
+
+
+def test_parameters_are_part_of_the_keys():
+    image = Image.new("RGB", (64, 64), (200, 30, 40))
+
+    assert keys(image, "studio")[0] != keys(image, "lifestyle")[0]
+    assert keys(image, "studio")[1] != keys(image, "lifestyle")[1]
+
+
+def test_exact_and_perceptual_hits(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    image = Image.new("RGB", (64, 64), (200, 30, 40))
+    exact, perceptual = keys(image)
+    cache.put(exact, perceptual, results())
+
+    hit = cache.get(exact, perceptual)
+    similar = cache.get("other", perceptual)
+
+    assert hit["enhanced_image"].size == (64, 64)
+    assert len(hit["variants"]) == 2
+    assert hit["metadata"]["style"] == "studio"
+    assert hit["metadata"]["cache"]["match"] == "exact"
+    assert similar["metadata"]["cache"]["match"] == "perceptual"
+    assert cache.get("other", "missing") is None
+
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["perceptual_hits"], stats["misses"]) == (2, 1, 1)
+
+
+def test_index_survives_restart(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put("a", "pa", results())
+
+    assert ResultCache(str(tmp_path)).get("a") is not None
+
+
+def test_expired_entries_miss(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path), ttl_seconds=60)
+    cache.put("a", "pa", results())
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 61)
+
+    assert cache.get("a", "pa") is None
+    assert cache.get_stats()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = ResultCache(str(tmp_path), max_entries=2)
+    cache.put("a", "pa", results())
+    cache.put("b", "pb", results())
+    cache.get("a")
+    cache.put("c", "pc", results())
+
+    assert cache.get("b", "pb") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert not (tmp_path / "b").exists()
+
+
+def test_clear_removes_all_entries(tmp_path):
+    cache = ResultCache(str(tmp_path))
+    cache.put("a", "pa", results())
+
+    cache.clear()
+
+    assert cache.get_stats()["entries"] == 0
+    assert not (tmp_path / "a").exists()
@@ -19,6 +19,7 @@ import logging
 from typing import Dict, List, Optional, Any
 from datetime import datetime
 import json
+import base64
 import requests
 from io import BytesIO
 
@@ -598,6 +599,12 @@ Senden Sie einfach ein Bild, um mit der KI-Verarbeitung zu beginnen! 🚀
             elif callback_data.startswith('reject_'):
                 await self._handle_reject_callback(query, callback_data)
             
+            # Job Callbacks (Fortschritt mit Zwischenbild, Abbruch)
+            elif callback_data.startswith('check_job_'):
+                await self._handle_check_job_callback(query, callback_data)
+            elif callback_data.startswith('cancel_job_'):
+                await self._handle_cancel_job_callback(query, callback_data)
+            
             # Refresh Callbacks
             elif callback_data == 'refresh_status':
                 await self._handle_refresh_status(query)
@@ -629,6 +636,11 @@ Senden Sie einfach ein Bild, um mit der KI-Verarbeitung zu beginnen! 🚀
             style = parts[1]
             file_id = '_'.join(parts[2:])
             
+            # Quick Process: Studio-Stil in der schnellen Qualitätsstufe ohne Varianten
+            quick = style == 'quick'
+            if quick:
+                style = 'studio'
+            
             # Upload-Info abrufen
             upload_info = self.active_uploads.get(file_id)
             if not upload_info:
@@ -637,7 +649,7 @@ Senden Sie einfach ein Bild, um mit der KI-Verarbeitung zu beginnen! 🚀
             
             # Processing starten
             await query.edit_message_text(
-                f"⚡ **Processing gestartet**\n\n🎨 Stil: {style.title()}\n📄 Datei: {upload_info['filename']}\n\n⏳ Geschätzte Zeit: 2-3 Minuten...",
+                f"⚡ **Processing gestartet**\n\n🎨 Stil: {style.title()}{' (Quick)' if quick else ''}\n📄 Datei: {upload_info['filename']}\n\n⏳ Geschätzte Zeit: {'unter 1 Minute' if quick else '2-3 Minuten'}...",
                 parse_mode='Markdown'
             )
             
@@ -653,9 +665,9 @@ Senden Sie einfach ein Bild, um mit der KI-Verarbeitung zu beginnen! 🚀
             
             data = {
                 'style': style,
-                'quality': 'high',
+                'quality': 'standard' if quick else 'high',
                 'enhance_colors': 'true',
-                'generate_variants': 'true'
+                'generate_variants': 'false' if quick else 'true'
             }
             
             headers = {
@@ -676,7 +688,10 @@ Senden Sie einfach ein Bild, um mit der KI-Verarbeitung zu beginnen! 🚀
                 
                 # Job-Status Message mit Tracking
                 keyboard = [
-                    [InlineKeyboardButton("📊 Status prüfen", callback_data=f"check_job_{job_id}")]
+                    [
+                        InlineKeyboardButton("📊 Status prüfen", callback_data=f"check_job_{job_id}"),
+                        InlineKeyboardButton("🛑 Abbrechen", callback_data=f"cancel_job_{job_id}")
+                    ]
                 ]
                 reply_markup = InlineKeyboardMarkup(keyboard)
                 
@@ -742,6 +757,84 @@ Senden Sie einfach ein Bild, um mit der KI-Verarbeitung zu beginnen! 🚀
             logger.error(f"Error in reject callback: {e}")
             await query.edit_message_text("❌ Fehler bei der Ablehnung.")
 
+    async def _handle_check_job_callback(self, query, callback_data: str):
+        """Job-Fortschritt anzeigen, während der Diffusion mit Zwischenbild"""
+        try:
+            job_id = callback_data[len('check_job_'):]
+            headers = {'X-API-Key': AI_ENGINE_API_KEY}
+            
+            response = requests.get(f'{AI_ENGINE_URL}/api/v1/job/{job_id}/status', headers=headers, timeout=10)
+            if response.status_code != 200:
+                await query.edit_message_text("❌ Job nicht gefunden.")
+                return
+            
+            job = response.json()
+            status = job.get('status', 'unknown')
+            progress = job.get('progress', 0)
+            progress_bar = "█" * (progress // 10) + "░" * (10 - progress // 10)
+            message = f"📊 **Job-Status**\n\n🆔 Job-ID: {job_id}\n📌 Status: {status}\n{progress_bar} {progress}%"
+            
+            if status in ('completed', 'failed', 'cancelled'):
+                await self._edit_job_message(query, message)
+                return
+            
+            keyboard = [
+                [
+                    InlineKeyboardButton("🔄 Aktualisieren", callback_data=f"check_job_{job_id}"),
+                    InlineKeyboardButton("🛑 Abbrechen", callback_data=f"cancel_job_{job_id}")
+                ]
+            ]
+            reply_markup = InlineKeyboardMarkup(keyboard)
+            
+            # Zwischenbild der laufenden Diffusion: falsche Richtung früh erkennen
+            preview = requests.get(f'{AI_ENGINE_URL}/api/v1/job/{job_id}/preview', headers=headers, timeout=10)
+            if preview.status_code == 200:
+                event = preview.json()
+                image_bytes = base64.b64decode(event['image'].split(',', 1)[1])
+                await query.message.reply_photo(
+                    photo=BytesIO(image_bytes),
+                    caption=f"{message}\n🖼️ Vorschau: {event['stage']}, Schritt {event['step']}/{event['steps']}",
+                    parse_mode='Markdown',
+                    reply_markup=reply_markup
+                )
+            else:
+                await self._edit_job_message(query, message, reply_markup)
+                
+        except Exception as e:
+            logger.error(f"Error in check job callback: {e}")
+            await self._edit_job_message(query, "❌ Fehler beim Abrufen des Job-Status.")
+
+    async def _handle_cancel_job_callback(self, query, callback_data: str):
+        """Laufenden oder wartenden Job abbrechen"""
+        try:
+            job_id = callback_data[len('cancel_job_'):]
+            
+            response = requests.delete(
+                f'{AI_ENGINE_URL}/api/v1/job/{job_id}',
+                headers={'X-API-Key': AI_ENGINE_API_KEY},
+                timeout=10
+            )
+            
+            if response.status_code == 200:
+                text = f"🛑 **Job abgebrochen**\n\n🆔 Job-ID: {job_id}"
+            elif response.status_code == 409:
+                text = f"ℹ️ Job {job_id} ist bereits abgeschlossen."
+            else:
+                text = "❌ Abbruch fehlgeschlagen."
+            
+            await self._edit_job_message(query, text)
+                
+        except Exception as e:
+            logger.error(f"Error in cancel job callback: {e}")
+            await self._edit_job_message(query, "❌ Fehler beim Abbrechen des Jobs.")
+
+    async def _edit_job_message(self, query, text: str, reply_markup: Optional[InlineKeyboardMarkup] = None):
+        """Job-Nachricht bearbeiten (Vorschaubilder haben eine Caption statt Text)"""
+        if query.message.photo:
+            await query.edit_message_caption(text, parse_mode='Markdown', reply_markup=reply_markup)
+        else:
+            await query.edit_message_text(text, parse_mode='Markdown', reply_markup=reply_markup)
+
     # ============================================================================
     # Refresh Handlers
     # ============================================================================